@@ -0,0 +1,77 @@
+"""
+Pre-build the compiled model cache for the whole asset tree, so that no simulator process pays the glTF parsing cost.
+Enable the cache in the simulator with the config `compiled_asset_cache=<cache dir>`.
+
+Usage: python -m metaurban.build_asset_cache --cache-dir ~/.cache/metaurban/compiled_models
+"""
+import argparse
+import os
+import time
+
+from panda3d.core import Filename
+
+from metaurban.engine.asset_loader import AssetLoader
+from metaurban.engine.logger import get_logger
+
+
+def get_loader():
+    """
+    A loader which can import glTF files without opening a window
+    """
+    import gltf
+    from direct.showbase.Loader import Loader
+    loader = Loader(None)
+    gltf.patch_loader(loader)
+    return loader
+
+
+def build_asset_cache(cache_dir, asset_dir=None, update=False):
+    """
+    Compile all .gltf/.glb models under asset_dir to .bam files in cache_dir
+    :param cache_dir: cache directory, the one given to the config compiled_asset_cache
+    :param asset_dir: root of the models to compile, default to the asset folder
+    :param update: compile the models again even if they are cached
+    :return: number of compiled models
+    """
+    logger = get_logger()
+    asset_dir = str(asset_dir or AssetLoader.asset_path)
+    cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+    loader = get_loader()
+    num_compiled, num_cached, num_failed = 0, 0, 0
+    start = time.time()
+    for root, _, files in os.walk(asset_dir):
+        for file_name in sorted(files):
+            if not file_name.lower().endswith(AssetLoader.COMPILED_EXTENSIONS):
+                continue
+            file_path = Filename.fromOsSpecific(os.path.join(root, file_name)).getFullpath()
+            compiled_path = AssetLoader.get_compiled_path(file_path, cache_dir)
+            if os.path.isfile(compiled_path) and not update:
+                num_cached += 1
+                continue
+            try:
+                model = loader.loadModel(file_path, noCache=True)
+            except Exception as e:
+                logger.warning("Fail to load {}: {}".format(file_path, e))
+                num_failed += 1
+                continue
+            if AssetLoader.write_compiled_model(model, compiled_path):
+                num_compiled += 1
+            else:
+                num_failed += 1
+            model.removeNode()
+    logger.info(
+        "Compiled {} models to {} in {:.1f}s. Already cached: {}, failed: {}".format(
+            num_compiled, cache_dir,
+            time.time() - start, num_cached, num_failed
+        )
+    )
+    return num_compiled
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cache-dir", required=True, help="Directory of the compiled models")
+    parser.add_argument("--asset-dir", default=None, help="Root of the models to compile, default to the asset folder")
+    parser.add_argument("--update", action="store_true", help="Compile models even if they are cached")
+    args = parser.parse_args()
+    build_asset_cache(args.cache_dir, args.asset_dir, args.update)
@@ -1932,6 +1932,7 @@ from metaurban.constants import CamMask
 from metaurban.constants import MetaUrbanType, CollisionGroup
 from metaurban.constants import Semantics
 # from metaurban.engine.asset_loader import AssetLoader
+from metaurban.engine.actor_pool import ActorPool
 from metaurban.engine.engine_utils import get_engine, engine_initialized
 from metaurban.engine.logger import get_logger
 # from metaurban.engine.physics_node import BaseRigidBodyNode
@@ -2523,13 +2524,13 @@ class BasePedestrian(BaseObject, BasePedestrianState):
         self.cur_state = random.choice(self.STATES)
         self.cur_state_transit_time = time.time()
         if self.render:
-            self.actor = Actor(self.ACTOR_PATH)
-
             motion_path = deepcopy(self.MOTION_PATH)
             rotation = 180 if 'rotation' not in motion_path else motion_path.pop('rotation')
             self.loop_start = 0 if 'loop_start' not in motion_path else motion_path.pop('loop_start')
 
-            self.actor.loadAnims(motion_path)
+            # loading the skinned mesh and animations is slow, so reuse the actors of destroyed pedestrians
+            self._actor_key = self.get_actor_key(self.ACTOR_PATH, motion_path)
+            self.actor = ActorPool.acquire(*self._actor_key)
             self.actor.loop(self.cur_state, fromFrame=self.loop_start)
 
             self.actor.setHpr(self.actor.getH() + rotation, self.actor.getP() + 0, self.actor.getR() + 0)
@@ -2539,6 +2540,14 @@ class BasePedestrian(BaseObject, BasePedestrianState):
             self._instance = self.actor.instanceTo(self.origin)
             self.show_coordinates()
 
+    @staticmethod
+    def get_actor_key(actor_path, motion_path):
+        """
+        The model and animations of the actor in ActorPool, where motion_path is MOTION_PATH or an actor config of
+        AssetPaths.Pedestrian. The rotation and loop_start options are not animations, so they are excluded
+        """
+        return actor_path, {name: path for name, path in motion_path.items() if name not in ("rotation", "loop_start")}
+
     def add_navigation(self):
         if self.navigation is not None or self.config["navigation_module"] is None or self.engine.current_map is None:
             return
@@ -2661,6 +2670,13 @@ class BasePedestrian(BaseObject, BasePedestrianState):
         self.contact_results.update(contacts)
 
     def destroy(self):
+        if getattr(self, "_actor_key", None) is not None:
+            self._instance.removeNode()
+            ActorPool.release(
+                self.actor, *self._actor_key, max_actors_per_model=self.engine.global_config["max_pooled_actors"]
+            )
+            self._actor_key = None
+            self.actor = None
         super(BasePedestrian, self).destroy()
         if self.navigation is not None:
             self.navigation.destroy()
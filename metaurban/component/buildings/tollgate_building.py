@@ -26,8 +26,8 @@ class TollGateBuilding(BaseBuilding):
         self.set_heading_theta(heading_theta)
 
         if self.render:
-            building_model = self.loader.loadModel(AssetLoader.file_path("models", "tollgate", "booth.gltf"))
-            gate_model = self.loader.loadModel(AssetLoader.file_path("models", "tollgate", "gate.gltf"))
+            building_model = AssetLoader.load_model(AssetLoader.file_path("models", "tollgate", "booth.gltf"))
+            gate_model = AssetLoader.load_model(AssetLoader.file_path("models", "tollgate", "gate.gltf"))
             building_model.setH(90)
             building_model.reparentTo(self.origin)
             gate_model.reparentTo(self.origin)
@@ -569,7 +569,7 @@ class BaseDeliveryRobot(BaseObject, BaseDeliveryRobotState):
         if self.render:
             [path, scale, offset, HPR] = self.path
             if path not in BaseDeliveryRobot.model_collection:
-                car_model = self.loader.loadModel(AssetLoader.file_path("models", path))
+                car_model = AssetLoader.load_model(AssetLoader.file_path("models", path))
                 car_model.setTwoSided(False)
                 BaseDeliveryRobot.model_collection[path] = car_model
                 scale = 0.5
@@ -1315,7 +1315,7 @@ class EgoDeliveryRobot(BaseObject, BaseDeliveryRobotState):
         if self.light is None:
             self._light_models = []
             for y in [-1, 1]:
-                light_model = self.loader.loadModel(AssetLoader.file_path("models", "sphere.egg"))
+                light_model = AssetLoader.load_model(AssetLoader.file_path("models", "sphere.egg"))
                 light_model.reparentTo(self.origin)
                 light_model.setPos(self.LIGHT_POSITION[0] * y, self.LIGHT_POSITION[1], self.LIGHT_POSITION[2])
                 light_model.setScale(0.13, 0.05, 0.13)
@@ -1564,7 +1564,7 @@ class EgoDeliveryRobot(BaseObject, BaseDeliveryRobotState):
         if self.render:
             [path, scale, offset, HPR] = self.path
             if path not in EgoDeliveryRobot.model_collection:
-                car_model = self.loader.loadModel(AssetLoader.file_path("models", path))
+                car_model = AssetLoader.load_model(AssetLoader.file_path("models", path))
                 car_model.setTwoSided(False)
                 EgoDeliveryRobot.model_collection[path] = car_model
                 # scale = 0.15 # for white one
@@ -1,4 +1,7 @@
 import copy
+import math
+
+import cv2
 from metaurban.component.algorithm.blocks_prob_dist import PGBlockDistConfig
 from metaurban.type import MetaUrbanType
 from metaurban.constants import PGLineType, PGLineColor
@@ -45,11 +48,54 @@ class MapGenerateMethod:
 
 
 class PGMap(BaseMap):
+    # Pedestrian regions, the walkable region masks cover the bounding box of all of them
+    WALKABLE_REGIONS = (
+        "sidewalks", "crosswalks", "sidewalks_near_road_buffer", "sidewalks_near_road", "sidewalks_farfrom_road",
+        "sidewalks_farfrom_road_buffer", "valid_region"
+    )
+
+    def get_walkable_regions_mask(self, walkable=WALKABLE_REGIONS, blocked=(), mask_delta=2, flip=True):
+        """
+        Rasterize the pedestrian regions into a (H, W, 3) uint8 mask, where the polygons of the `walkable` regions are
+        filled with 255 and then the ones of the `blocked` regions are cleared. The mask is flipped vertically for
+        ORCA by default. It is computed once per map and set of arguments, and returned read-only, so copy it before
+        drawing on it.
+        :return: mask, mask_translate mapping map coordinates to mask coordinates (before the flip)
+        """
+        key = (tuple(walkable), tuple(blocked), mask_delta, flip)
+        if key in self._walkable_regions_masks:
+            return self._walkable_regions_masks[key]
+
+        regions = {
+            name: [polygon["polygon"] for polygon in getattr(self, name, {}).values()]
+            for name in self.WALKABLE_REGIONS
+        }
+        points = np.array([point for name in self.WALKABLE_REGIONS for polygon in regions[name] for point in polygon])
+        min_x, min_y = np.min(points, axis=0)
+        max_x, max_y = np.max(points, axis=0)
+        rows = math.ceil(max_y - min_y) + 2 * mask_delta
+        columns = math.ceil(max_x - min_x) + 2 * mask_delta
+        mask_translate = np.array([-min_x + mask_delta, -min_y + mask_delta])
+
+        mask = np.zeros((rows, columns, 3), np.uint8)
+        for names, color in ((walkable, [255, 255, 255]), (blocked, [0, 0, 0])):
+            for name in names:
+                # polygons are filled one by one, a batched fillPoly would leave their overlaps empty
+                for polygon in regions[name]:
+                    polygon_array = np.floor(np.array(polygon) + mask_translate).astype(int).reshape((-1, 1, 2))
+                    cv2.fillPoly(mask, [polygon_array], color)
+        if flip:
+            mask = cv2.flip(mask, 0)
+        mask.flags.writeable = False
+        self._walkable_regions_masks[key] = (mask, mask_translate)
+        return mask, mask_translate
+
     def _generate(self):
         """
         We can override this function to introduce other methods!
         """
         parent_node_path, physics_world = self.engine.worldNP, self.engine.physics_world
+        self._walkable_regions_masks = {}
         generate_type = self._config[self.GENERATE_TYPE]
         self.sidewalk_type_all = [
             'Narrow Sidewalk', 'Narrow Sidewalk with Trees', 'Ribbon Sidewalk', 'Neighborhood 1', 'Neighborhood 2',
@@ -69,6 +69,8 @@ class ORCATrajectoryNavigation(BaseNavigation):
         self.sidewalks = {}
         self.crosswalks = {}
         self.walkable_regions_mask = None
+        self._position_list = []
+        self._reference_trajectory = None
         if show_dest_mark or show_line_to_dest:
             get_logger().warning("show_dest_mark and show_line_to_dest are not supported in ORCATrajectoryNavigation")
         super(ORCATrajectoryNavigation, self).__init__(
@@ -211,14 +213,14 @@ class ORCATrajectoryNavigation(BaseNavigation):
             )
             
             time_length, points, speed, early_stop_points = get_planning(
-                [self.start_points], [self.start_end_sampling_mask], [self.end_points], [len(self.start_points)], 1
+                [self.start_points], [self.start_end_sampling_mask], [self.end_points], [len(self.start_points)],
+                1,
+                map_seeds=[self.engine.global_seed]
             )
 
             positions = points[0]
             speeds = speed[0]
-            self.position_list = []
-            for p in positions:
-                self.position_list.append(self._to_block_coordinate(p[0]))
+            self.position_list = [self._to_block_coordinate(p[0]) for p in positions]
             self.engine.ref_time_length = time_length[0][0]
             self.init_speed = speeds[0][0]
             self.init_position = self._to_block_coordinate(positions[0][0])
@@ -235,14 +237,22 @@ class ORCATrajectoryNavigation(BaseNavigation):
             self.set_route()
 
     @property
-    def reference_trajectory(self):
+    def position_list(self):
+        return self._position_list
 
-        if not hasattr(self, 'position_list'):
-            self.position_list = []
-        elif len(self.position_list) > 0:
-            return self.get_idm_route(self.position_list)
+    @position_list.setter
+    def position_list(self, position_list):
+        self._position_list = position_list
+        self._reference_trajectory = None
 
-        return self.get_idm_route(self.position_list)
+    @property
+    def reference_trajectory(self):
+        """
+        The route following position_list. It is built once and reused until a new position_list is set
+        """
+        if self._reference_trajectory is None:
+            self._reference_trajectory = self.get_idm_route(self.position_list)
+        return self._reference_trajectory
 
     def _to_block_coordinate(self, point_in_mask: object) -> object:
         point_in_block = point_in_mask - self.mask_translate
@@ -300,58 +310,7 @@ class ORCATrajectoryNavigation(BaseNavigation):
         return starts, goals
 
     def _random_points_new(self, map_mask, num, min_dis=5, generated_position=None):
-        import matplotlib.pyplot as plt
-        from scipy.signal import convolve2d
-        import random
-        from skimage import measure
-        h, _ = map_mask.shape
-        import metaurban.policy.orca_planner_utils as orca_planner_utils
-        mylist, h, w = orca_planner_utils.mask_to_2d_list(map_mask)
-        contours = measure.find_contours(mylist, 0.5, positive_orientation='high')
-        flipped_contours = []
-        for contour in contours:
-            contour = orca_planner_utils.find_tuning_point(contour, h)
-            flipped_contours.append(contour)
-        int_points = []
-        for p in flipped_contours:
-            for m in p:
-                int_points.append((int(m[1]), int(m[0])))
-
-        def find_walkable_area(map_mask):
-            # kernel = np.array([[1,1,1,1,1],[1,1,1,1,1],[1,1,0,1,1],[1,1,1,1,1],[1,1,1,1,1]], dtype=np.uint8)
-            kernel = np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]], dtype=np.uint8)
-            conv_result = convolve2d(map_mask / 255, kernel, mode='same')
-            ct_pts = np.where(conv_result == 8)  #8, 24
-            ct_pts = list(zip(ct_pts[1], ct_pts[0]))
-            # print('Len Before:', len(ct_pts))
-            ct_pts = [c for c in ct_pts if c not in int_points]
-            # print('Len After:', len(ct_pts))
-            # plt.imshow(map_mask, cmap='gray'); plt.scatter([pt[0] for pt in ct_pts], [pt[1] for pt in ct_pts], color='red')
-            # plt.grid(True); plt.show()
-            return ct_pts
-
-        selected_pts = []
-        walkable_pts = find_walkable_area(map_mask)
-        if generated_position is not None:
-            dis_to_start = np.linalg.norm(
-                np.array([(x[0], h - 1 - x[1]) for x in walkable_pts]) - generated_position, axis=1
-            )
-            # print(dis_to_start[np.argsort(dis_to_start)[::-1]])
-            walkable_pts = np.array(walkable_pts)[np.argsort(dis_to_start)[::-1]][:int(len(walkable_pts) / 10)].tolist()
-        random.shuffle(walkable_pts)
-        if len(walkable_pts) < num:
-            raise ValueError(" Walkable points are less than spawn number! ")
-        try_time = 0
-        while len(selected_pts) < num:
-            # print(try_time)
-            if try_time > 10000:
-                raise ValueError("Try too many time to get valid humanoid points!")
-            cur_pt = random.choice(walkable_pts)
-            if all(math.dist(cur_pt, selected_pt) >= min_dis for selected_pt in selected_pts):
-                selected_pts.append(cur_pt)
-            try_time += 1
-        selected_pts = [(x[0], h - 1 - x[1]) for x in selected_pts]
-        return selected_pts
+        return orca_planner_utils.sample_walkable_points(map_mask, num, min_dis, generated_position)
 
     def _get_walkable_regions(self, current_map):
         self.crosswalks = current_map.crosswalks
@@ -362,257 +321,35 @@ class ORCATrajectoryNavigation(BaseNavigation):
         self.sidewalks_farfrom_road_buffer = current_map.sidewalks_farfrom_road_buffer
         self.valid_region = current_map.valid_region
 
-        polygons = []
-        for sidewalk in self.sidewalks.keys():
-            # if "SDW_I_" in sidewalk: continue
-            polygon = self.sidewalks[sidewalk]['polygon']
-            polygons += polygon
-        for crosswalk in self.crosswalks.keys():
-            # if "CRS_I_" in crosswalk: continue
-            polygon = self.crosswalks[crosswalk]['polygon']
-            polygons += polygon
-
-        for sidewalk in self.sidewalks_near_road_buffer.keys():
-            polygon = self.sidewalks_near_road_buffer[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.sidewalks_near_road.keys():
-            polygon = self.sidewalks_near_road[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.sidewalks_farfrom_road.keys():
-            polygon = self.sidewalks_farfrom_road[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.sidewalks_farfrom_road_buffer.keys():
-            polygon = self.sidewalks_farfrom_road_buffer[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.valid_region.keys():
-            polygon = self.valid_region[sidewalk]['polygon']
-            polygons += polygon
-
-        polygon_array = np.array(polygons)
-        min_x = np.min(polygon_array[:, 0])
-        max_x = np.max(polygon_array[:, 0])
-        min_y = np.min(polygon_array[:, 1])
-        max_y = np.max(polygon_array[:, 1])
-
-        rows = math.ceil(max_y - min_y) + 2 * self.mask_delta
-        columns = math.ceil(max_x - min_x) + 2 * self.mask_delta
-
-        self.mask_translate = np.array([-min_x + self.mask_delta, -min_y + self.mask_delta])
         if 'walk_on_all_regions' not in self.engine.global_config:
             # logger.warning("Not set var:walk_on_all_regions, so that agents can walk on all regions")
             self.engine.global_config['walk_on_all_regions'] = True
         if self.engine.global_config['walk_on_all_regions']:
             # logger.info("Agents can walk on all regions")
+            walkable_regions_mask, self.mask_translate = current_map.get_walkable_regions_mask(
+                mask_delta=self.mask_delta
+            )
             if hasattr(self.engine, 'walkable_regions_mask'):
                 return self.engine.walkable_regions_mask.copy(), self.engine.walkable_regions_mask
-
-            self.crosswalks = current_map.crosswalks
-            self.sidewalks = current_map.sidewalks
-            self.sidewalks_near_road = current_map.sidewalks_near_road
-            self.sidewalks_farfrom_road = current_map.sidewalks_farfrom_road
-            self.sidewalks_near_road_buffer = current_map.sidewalks_near_road_buffer
-            self.sidewalks_farfrom_road_buffer = current_map.sidewalks_farfrom_road_buffer
-
-            polygons = []
-            for sidewalk in self.sidewalks.keys():
-                # if "SDW_I_" in sidewalk: continue
-                polygon = self.sidewalks[sidewalk]['polygon']
-                polygons += polygon
-            for crosswalk in self.crosswalks.keys():
-                # if "CRS_I_" in crosswalk: continue
-                polygon = self.crosswalks[crosswalk]['polygon']
-                polygons += polygon
-
-            for sidewalk in self.sidewalks_near_road_buffer.keys():
-                polygon = self.sidewalks_near_road_buffer[sidewalk]['polygon']
-                polygons += polygon
-            for sidewalk in self.sidewalks_near_road.keys():
-                polygon = self.sidewalks_near_road[sidewalk]['polygon']
-                polygons += polygon
-            for sidewalk in self.sidewalks_farfrom_road.keys():
-                polygon = self.sidewalks_farfrom_road[sidewalk]['polygon']
-                polygons += polygon
-            for sidewalk in self.sidewalks_farfrom_road_buffer.keys():
-                polygon = self.sidewalks_farfrom_road_buffer[sidewalk]['polygon']
-                polygons += polygon
-            for sidewalk in self.valid_region.keys():
-                polygon = self.valid_region[sidewalk]['polygon']
-                polygons += polygon
-
-            polygon_array = np.array(polygons)
-            min_x = np.min(polygon_array[:, 0])
-            max_x = np.max(polygon_array[:, 0])
-            min_y = np.min(polygon_array[:, 1])
-            max_y = np.max(polygon_array[:, 1])
-
-            rows = math.ceil(max_y - min_y) + 2 * self.mask_delta
-            columns = math.ceil(max_x - min_x) + 2 * self.mask_delta
-
-            self.mask_translate = np.array([-min_x + self.mask_delta, -min_y + self.mask_delta])
-            walkable_regions_mask = np.zeros((rows, columns, 3), np.uint8)
-
-            for sidewalk in self.sidewalks.keys():
-                # if "SDW_I_" in sidewalk: continue
-                polygon_array = np.array(self.sidewalks[sidewalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-
-            for crosswalk in self.crosswalks.keys():
-                # if "CRS_I_" in crosswalk: continue
-                polygon_array = np.array(self.crosswalks[crosswalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-
-            for sidewalk in self.sidewalks_near_road_buffer.keys():
-                # if "SDW_I_" in sidewalk: continue
-                polygon_array = np.array(self.sidewalks_near_road_buffer[sidewalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-            for sidewalk in self.sidewalks_near_road.keys():
-                # if "SDW_I_" in sidewalk: continue
-                polygon_array = np.array(self.sidewalks_near_road[sidewalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-            for sidewalk in self.sidewalks_farfrom_road.keys():
-                # if "SDW_I_" in sidewalk: continue
-                polygon_array = np.array(self.sidewalks_farfrom_road[sidewalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-            for sidewalk in self.sidewalks_farfrom_road_buffer.keys():
-                # if "SDW_I_" in sidewalk: continue
-                polygon_array = np.array(self.sidewalks_farfrom_road_buffer[sidewalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-            for sidewalk in self.valid_region.keys():
-                polygon_array = np.array(self.valid_region[sidewalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-                
-            walkable_regions_mask = cv2.flip(walkable_regions_mask, 0)  ### flip for orca   ######
             start_end_regions_mask = walkable_regions_mask.copy()
         else:
             # logger.info("Agents are expected to walk on main sidewalks and crosswalks, not all regions")
-            self.crosswalks = current_map.crosswalks
-            self.sidewalks = current_map.sidewalks
-            self.sidewalks_near_road = current_map.sidewalks_near_road
-            self.sidewalks_farfrom_road = current_map.sidewalks_farfrom_road
-            self.sidewalks_near_road_buffer = current_map.sidewalks_near_road_buffer
-            self.sidewalks_farfrom_road_buffer = current_map.sidewalks_farfrom_road_buffer
-
-            polygons = []
-            for sidewalk in self.sidewalks.keys():
-                # if "SDW_I_" in sidewalk: continue
-                polygon = self.sidewalks[sidewalk]['polygon']
-                polygons += polygon
-            for crosswalk in self.crosswalks.keys():
-                # if "CRS_I_" in crosswalk: continue
-                polygon = self.crosswalks[crosswalk]['polygon']
-                polygons += polygon
-
-            for sidewalk in self.sidewalks_near_road_buffer.keys():
-                polygon = self.sidewalks_near_road_buffer[sidewalk]['polygon']
-                polygons += polygon
-            for sidewalk in self.sidewalks_near_road.keys():
-                polygon = self.sidewalks_near_road[sidewalk]['polygon']
-                polygons += polygon
-            for sidewalk in self.sidewalks_farfrom_road.keys():
-                polygon = self.sidewalks_farfrom_road[sidewalk]['polygon']
-                polygons += polygon
-            for sidewalk in self.sidewalks_farfrom_road_buffer.keys():
-                polygon = self.sidewalks_farfrom_road_buffer[sidewalk]['polygon']
-                polygons += polygon
-            for sidewalk in self.valid_region.keys():
-                polygon = self.valid_region[sidewalk]['polygon']
-                polygons += polygon
-
-            polygon_array = np.array(polygons)
-            min_x = np.min(polygon_array[:, 0])
-            max_x = np.max(polygon_array[:, 0])
-            min_y = np.min(polygon_array[:, 1])
-            max_y = np.max(polygon_array[:, 1])
-
-            rows = math.ceil(max_y - min_y) + 2 * self.mask_delta
-            columns = math.ceil(max_x - min_x) + 2 * self.mask_delta
-
-            self.mask_translate = np.array([-min_x + self.mask_delta, -min_y + self.mask_delta])
-            walkable_regions_mask = np.zeros((rows, columns, 3), np.uint8)
-            start_end_regions_mask = np.zeros((rows, columns, 3), np.uint8)
-
-            for sidewalk in self.sidewalks.keys():
-                # if "SDW_I_" in sidewalk: continue
-                polygon_array = np.array(self.sidewalks[sidewalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-                cv2.fillPoly(start_end_regions_mask, [polygon_array], [255, 255, 255])
-
-            for crosswalk in self.crosswalks.keys():
-                # if "CRS_I_" in crosswalk: continue
-                polygon_array = np.array(self.crosswalks[crosswalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-                cv2.fillPoly(start_end_regions_mask, [polygon_array], [255, 255, 255])
-
-            for sidewalk in self.sidewalks_near_road_buffer.keys():
-                # if "SDW_I_" in sidewalk: continue
-                polygon_array = np.array(self.sidewalks_near_road_buffer[sidewalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-            for sidewalk in self.sidewalks_near_road.keys():
-                # if "SDW_I_" in sidewalk: continue
-                polygon_array = np.array(self.sidewalks_near_road[sidewalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-            for sidewalk in self.sidewalks_farfrom_road.keys():
-                # if "SDW_I_" in sidewalk: continue
-                polygon_array = np.array(self.sidewalks_farfrom_road[sidewalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [0, 0, 0])
-            for sidewalk in self.sidewalks_farfrom_road_buffer.keys():
-                # if "SDW_I_" in sidewalk: continue
-                polygon_array = np.array(self.sidewalks_farfrom_road_buffer[sidewalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [0, 0, 0])
-            for sidewalk in self.valid_region.keys():
-                polygon_array = np.array(self.valid_region[sidewalk]['polygon'])
-                polygon_array += self.mask_translate
-                polygon_array = np.floor(polygon_array).astype(int)
-                polygon_array = polygon_array.reshape((-1, 1, 2))
-                cv2.fillPoly(walkable_regions_mask, [polygon_array], [0, 0, 0])    
+            regions = current_map.WALKABLE_REGIONS
+            walkable_regions_mask, self.mask_translate = current_map.get_walkable_regions_mask(
+                walkable=regions[:4], blocked=regions[4:], mask_delta=self.mask_delta, flip=False
+            )
+            start_end_regions_mask, _ = current_map.get_walkable_regions_mask(
+                walkable=regions[:2], mask_delta=self.mask_delta
+            )
+            walkable_regions_mask = walkable_regions_mask.copy()
             for polygon in self.engine.asset_manager.all_object_polygons:
                 polygon_array = np.array(polygon)
                 polygon_array += self.mask_translate
                 polygon_array = np.floor(polygon_array).astype(int)
                 polygon_array = polygon_array.reshape((-1, 1, 2))
                 cv2.fillPoly(walkable_regions_mask, [polygon_array], [0, 0, 0])
-            
+
             walkable_regions_mask = cv2.flip(walkable_regions_mask, 0)
-            start_end_regions_mask = cv2.flip(start_end_regions_mask, 0)
         return start_end_regions_mask, walkable_regions_mask
 
     def get_map_mask(self):
@@ -754,7 +491,7 @@ class ORCATrajectoryNavigation(BaseNavigation):
         self.next_ref_lanes = None
         self.final_lane = None
         self._current_lane = None
-        # self.reference_trajectory = None
+        self._reference_trajectory = None
         super(ORCATrajectoryNavigation, self).destroy()
 
     def before_reset(self):
@@ -1,9 +1,12 @@
 import copy
+import math
 from metaurban.scenario.scenario_description import ScenarioDescription as SD
 import logging
 from typing import List, Tuple, Dict
 
 from metaurban.component.lane.abs_lane import AbstractLane
+from metaurban.component.lane.circular_lane import CircularLane
+from metaurban.component.lane.straight_lane import StraightLane
 from metaurban.component.road_network.base_road_network import BaseRoadNetwork
 from metaurban.component.road_network.road import Road
 from metaurban.constants import Decoration
@@ -17,11 +20,142 @@ Route = List[LaneIndex]
 
 
 class GraphLookupTable:
+    """
+    Find the lanes closest to a position. The lanes whose distance to a position is bounded by the distance to their
+    bounding box (straight and circular lanes) are registered in a uniform grid, so finding the closest lane only
+    evaluates the lanes around the position instead of all lanes in the graph.
+    """
+    # side length of the grid cells in [m]
+    CELL_SIZE = 20
+    # absorb the rounding error between lane.distance and the bounding box distance
+    TOLERANCE = 1e-6
+
     def __init__(self, graph, debug):
         self.graph = graph
         self.debug = debug
+        self._build_index()
+
+    def _build_index(self):
+        # (lane, lane index, tie-break key) of each lane returned by get(). The tie-break key reproduces the order of
+        # lanes with the same distance in the full search: roads in the order of the distance of their first lane and
+        # then the order in graph, lanes in the order in road, and decoration lanes at last.
+        self._entries = []
+        self._unbounded = []
+        self._cells = {}
+        boxes = []
+        road_count = 0
+        for _from, to_dict in self.graph.items():
+            if _from == "decoration":
+                continue
+            for lanes_id, lanes in to_dict.items():
+                road_count += 1
+                if lanes_id == Decoration.start:
+                    continue
+                for lane_id, lane in enumerate(lanes):
+                    self._entries.append((lane, (_from, lanes_id, lane_id), (0, lanes[0], road_count, lane_id)))
+        if self.graph.get(Decoration.start, False):
+            for id, lane in enumerate(self.graph[Decoration.start][Decoration.end]):
+                self._entries.append((lane, (Decoration.start, Decoration.end, id), (1, None, id, 0)))
+
+        for entry_id, (lane, _, _) in enumerate(self._entries):
+            box = self._get_lane_bounding_box(lane)
+            if box is None:
+                self._unbounded.append(entry_id)
+            boxes.append(box)
+        self._boxes = boxes
+        bounded = [box for box in boxes if box is not None]
+        if len(bounded) == 0:
+            self._origin = (0., 0.)
+            self._grid_size = (0, 0)
+            return
+        self._origin = (min(box[0] for box in bounded), min(box[1] for box in bounded))
+        self._grid_size = (
+            self._to_cell(max(box[2] for box in bounded), 0) + 1, self._to_cell(max(box[3] for box in bounded), 1) + 1
+        )
+        for entry_id, box in enumerate(boxes):
+            if box is None:
+                continue
+            for i in range(self._to_cell(box[0], 0), self._to_cell(box[2], 0) + 1):
+                for j in range(self._to_cell(box[1], 1), self._to_cell(box[3], 1) + 1):
+                    self._cells.setdefault((i, j), []).append(entry_id)
+
+    def _to_cell(self, value, axis):
+        return int(math.floor((value - self._origin[axis]) / self.CELL_SIZE))
+
+    @staticmethod
+    def _get_lane_bounding_box(lane):
+        """
+        Return (x_min, y_min, x_max, y_max) of the center line of the lane, or None if lane.distance() is not bounded
+        by the distance to the center line
+        """
+        if isinstance(lane, StraightLane):
+            points = [lane.start, lane.end]
+            margin = 0
+        elif isinstance(lane, CircularLane):
+            num = int(lane.length) + 2
+            points = [lane.position(lane.length * k / (num - 1), 0) for k in range(num)]
+            # the arc bulges out of the chord between two samples by at most the sagitta
+            margin = lane.radius * (1 - math.cos(lane.length / (num - 1) / lane.radius / 2))
+        else:
+            return None
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        return min(xs) - margin, min(ys) - margin, max(xs) + margin, max(ys) + margin
 
     def get(self, position, return_all):
+        if return_all or len(self._entries) == 0:
+            return self._get_all(position, return_all)
+
+        x, y = position[0], position[1]
+        best = math.inf
+        candidates = []
+        for entry_id in self._unbounded:
+            dist = self._entries[entry_id][0].distance(position)
+            candidates.append((dist, entry_id))
+            best = min(best, dist)
+
+        # visit the cells ring by ring around the position, until the lanes not visited are farther than the closest one
+        x_num, y_num = self._grid_size
+        i, j = self._to_cell(x, 0), self._to_cell(y, 1)
+        k = max(0, -i, i - x_num + 1, -j, j - y_num + 1)
+        visited = set()
+        while True:
+            columns = range(max(i - k, 0), min(i + k, x_num - 1) + 1)
+            rows = range(max(j - k + 1, 0), min(j + k - 1, y_num - 1) + 1)
+            ring = [(ii, jj) for ii in columns for jj in (j - k, j + k)]
+            ring += [(ii, jj) for jj in rows for ii in (i - k, i + k)]
+            for cell in ring:
+                for entry_id in self._cells.get(cell, ()):
+                    if entry_id in visited:
+                        continue
+                    visited.add(entry_id)
+                    x_min, y_min, x_max, y_max = self._boxes[entry_id]
+                    dx = max(x_min - x, 0, x - x_max)
+                    dy = max(y_min - y, 0, y - y_max)
+                    if math.sqrt(dx * dx + dy * dy) > best + self.TOLERANCE:
+                        continue
+                    dist = self._entries[entry_id][0].distance(position)
+                    candidates.append((dist, entry_id))
+                    best = min(best, dist)
+            if i - k <= 0 and i + k >= x_num - 1 and j - k <= 0 and j + k >= y_num - 1:
+                break
+            x_low, y_low = self._origin[0] + (i - k) * self.CELL_SIZE, self._origin[1] + (j - k) * self.CELL_SIZE
+            x_high, y_high = x_low + (2 * k + 1) * self.CELL_SIZE, y_low + (2 * k + 1) * self.CELL_SIZE
+            if min(x - x_low, x_high - x, y - y_low, y_high - y) > best + self.TOLERANCE:
+                break
+            k += 1
+
+        ties = [entry_id for dist, entry_id in candidates if dist == best]
+        if len(ties) > 1:
+            ties.sort(key=lambda entry_id: self._get_order(self._entries[entry_id][2], position))
+        return self._entries[ties[0]][1], best
+
+    @staticmethod
+    def _get_order(key, position):
+        group, first_lane, road_count, lane_id = key
+        return group, first_lane.distance(position) if group == 0 else 0, road_count, lane_id
+
+    def _get_all(self, position, return_all):
         log = dict()
         count = 0
         for _, (_from, to_dict) in enumerate(self.graph.items()):
@@ -574,7 +574,7 @@ class BaseRobotDog(BaseObject, BaseRobotDogState):
         if self.render:
             [path, scale, offset, HPR] = self.path
             if path not in BaseRobotDog.model_collection:
-                car_model = self.loader.loadModel(AssetLoader.file_path("models", path))
+                car_model = AssetLoader.load_model(AssetLoader.file_path("models", path))
                 car_model.setTwoSided(False)
                 BaseRobotDog.model_collection[path] = car_model
                 car_model.setScale(1.5)
@@ -1331,7 +1331,7 @@ class EgoRobotDog(BaseObject, BaseRobotDogState):
         if self.light is None:
             self._light_models = []
             for y in [-1, 1]:
-                light_model = self.loader.loadModel(AssetLoader.file_path("models", "sphere.egg"))
+                light_model = AssetLoader.load_model(AssetLoader.file_path("models", "sphere.egg"))
                 light_model.reparentTo(self.origin)
                 light_model.setPos(self.LIGHT_POSITION[0] * y, self.LIGHT_POSITION[1], self.LIGHT_POSITION[2])
                 light_model.setScale(0.13, 0.05, 0.13)
@@ -1532,7 +1532,7 @@ class EgoRobotDog(BaseObject, BaseRobotDogState):
         if self.render:
             [path, scale, offset, HPR] = self.path
             if path not in BaseRobotDog.model_collection:
-                car_model = self.loader.loadModel(AssetLoader.file_path("models", path))
+                car_model = AssetLoader.load_model(AssetLoader.file_path("models", path))
                 car_model.setTwoSided(False)
                 BaseRobotDog.model_collection[path] = car_model
                 car_model.setScale(0.3)
@@ -129,8 +129,47 @@ class BaseCamera(ImageBuffer, BaseSensor):
         self.cam.setPos(*position)
         self.cam.setHpr(*hpr)
 
+    def set_pose(self, new_parent_node: NodePath, position=None, hpr=None):
+        """
+        Mount the camera to new_parent_node with the relative position and hpr, see perceive()
+        Returns: the original (parent, position, hpr), which can be given to restore_pose()
+        """
+        if position is None:
+            position = constants.DEFAULT_SENSOR_OFFSET
+        if hpr is None:
+            hpr = constants.DEFAULT_SENSOR_HPR
+        original_pose = (self.cam.getParent(), self.cam.getPos(), self.cam.getHpr())
+
+        # reparent to new parent node
+        self.cam.reparentTo(new_parent_node)
+        # relative position
+        assert len(position) == 3, "The first parameter of camera.perceive() should be a BaseObject instance " \
+                                   "or a 3-dim vector representing the (x,y,z) position."
+        self.cam.setPos(Vec3(*position))
+        assert len(hpr) == 3, "The hpr parameter of camera.perceive() should be  a 3-dim vector representing " \
+                              "the heading/pitch/roll."
+        self.cam.setHpr(Vec3(*hpr))
+        return original_pose
+
+    def restore_pose(self, original_pose):
+        parent, position, hpr = original_pose
+        self.cam.reparentTo(parent)
+        self.cam.setHpr(hpr)
+        self.cam.setPos(position)
+
+    def render_once(self):
+        """
+        Render one frame for this camera only, see SensorScheduler.render()
+        """
+        self.engine.sensor_scheduler.render([self])
+
     def perceive(
-        self, to_float=True, new_parent_node: Union[NodePath, None] = None, position=None, hpr=None
+        self,
+        to_float=True,
+        new_parent_node: Union[NodePath, None] = None,
+        position=None,
+        hpr=None,
+        out=None
     ) -> np.ndarray:
         """
         When to_float is set to False, the image will be represented by unit8 with component value ranging from [0-255].
@@ -156,41 +195,23 @@ class BaseCamera(ImageBuffer, BaseSensor):
                 have to be set as well. The position and hpr are all 3-dim vector representing:
             position: the relative position to the reparent node
             hpr: the heading/pitch/roll of the sensor
+            out: a preallocated array to write the image into, which is returned. It avoids allocating a new array for
+                each image, e.g. the float64 array of to_float=True
 
         Return:
             Array representing the image.
         """
 
-        different_pos_hpr = False
         if new_parent_node:
-            if position is None:
-                position = constants.DEFAULT_SENSOR_OFFSET
-            if hpr is None:
-                hpr = constants.DEFAULT_SENSOR_HPR
-
-            # return camera to original state
-            original_object = self.cam.getParent()
-            original_hpr = self.cam.getHpr()
-            original_position = self.cam.getPos()
-
-            # reparent to new parent node
-            self.cam.reparentTo(new_parent_node)
-            # relative position
-            assert len(position) == 3, "The first parameter of camera.perceive() should be a BaseObject instance " \
-                                       "or a 3-dim vector representing the (x,y,z) position."
-            self.cam.setPos(Vec3(*position))
-            assert len(hpr) == 3, "The hpr parameter of camera.perceive() should be  a 3-dim vector representing " \
-                                  "the heading/pitch/roll."
-            self.cam.setHpr(Vec3(*hpr))
-
-            different_pos_hpr = (original_hpr != Vec3(*hpr)) or (original_position != Vec3(*position))
-
-            self.engine.taskMgr.step()
-
-        if different_pos_hpr:
-            # Step the engine to call a new "self.engine.graphicsEngine.renderFrame()"
-            # (not sure why need to step twice...
-            self.engine.taskMgr.step()
+            original_pose = self.set_pose(new_parent_node, position, hpr)
+            if self.enable_cuda:
+                # the cuda result is copied by the draw callback before the tasks post-processing the texture are
+                # called, so the engine is stepped twice to get the image of the new pose
+                self.engine.taskMgr.step()
+                if original_pose[1:] != (self.cam.getPos(), self.cam.getHpr()):
+                    self.engine.taskMgr.step()
+            else:
+                self.render_once()
 
         if self.enable_cuda:
             assert self.cuda_rendered_result is not None
@@ -200,9 +221,23 @@ class BaseCamera(ImageBuffer, BaseSensor):
 
         if new_parent_node:
             # return camera to original objects
-            self.cam.reparentTo(original_object)
-            self.cam.setHpr(original_hpr)
-            self.cam.setPos(original_position)
+            self.restore_pose(original_pose)
+        return self.format_image(ret, to_float, out)
+
+    def format_image(self, ret, to_float=True, out=None):
+        """
+        Format an image read from this camera, e.g. by get_rgb_array_cpu(), as perceive() does. The result doesn't share
+        memory with the render result, so it is not changed by the next rendering.
+        Args:
+            ret: the raw image
+            to_float: the same as in perceive()
+            out: the same as in perceive()
+
+        Return:
+            Array representing the image.
+        """
+        if out is not None:
+            return self._format_into(ret, to_float, out)
         return self._format(ret, to_float)
 
     def _format(self, ret, to_float):
@@ -214,6 +249,18 @@ class BaseCamera(ImageBuffer, BaseSensor):
         else:
             return ret / 255
 
+    def _format_into(self, ret, to_float, out):
+        """
+        Write the formatted image into out. 8-bit images are converted in place, others are formatted by _format()
+        """
+        if self.enable_cuda or ret.dtype != np.uint8:
+            out[...] = self._format(ret, to_float)
+        elif to_float:
+            np.divide(ret, 255, out=out, casting="unsafe")
+        else:
+            np.copyto(out, ret, casting="unsafe")
+        return out
+
     def destroy(self):
         if self.registered:
             self.unregister()
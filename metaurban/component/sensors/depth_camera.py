@@ -135,7 +135,7 @@ class DepthCamera(BaseCamera):
 
         """
         origin_img = self.depth_tex
-        img = np.frombuffer(origin_img.getRamImage().getData(), dtype=np.float32)
+        img = np.frombuffer(origin_img.getRamImage(), dtype=np.float32)
         img = img.reshape((origin_img.getYSize(), origin_img.getXSize(), -1))
         img = img[..., :self.num_channels]
         assert img.shape[-1] == 1
@@ -188,6 +188,9 @@ class DepthCamera(BaseCamera):
         # else
         if not to_float:
             ret = (ret * 255).astype(np.uint8)
+        elif not ret.flags.owndata:
+            # a view of the texture RAM, which is overwritten by the next render
+            ret = ret.copy()
         return ret
 
     def _make_cuda_texture(self):
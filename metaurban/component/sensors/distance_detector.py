@@ -8,7 +8,7 @@ from metaurban.constants import CamMask, CollisionGroup
 from metaurban.engine.asset_loader import AssetLoader
 from metaurban.engine.logger import get_logger
 from metaurban.utils.coordinates_shift import panda_vector
-from metaurban.utils.math import panda_vector, get_laser_end
+from metaurban.utils.math import panda_vector
 
 detect_result = namedtuple("detect_result", "cloud_points detected_objects")
 
@@ -29,33 +29,30 @@ def perceive(
     vehicle_position_y, num_lasers, height, physics_world, extra_filter_node, require_colors, ANGLE_FACTOR, MARK_COLOR0,
     MARK_COLOR1, MARK_COLOR2
 ):
+    """
+    Cast the lasers enabled by detector_mask and write the hit fraction of each laser to cloud_points. The end points of
+    all lasers are computed at once with NumPy, so only the ray tests themselves are done laser by laser.
+    """
     cloud_points.fill(1.0)
     detected_objects = []
-    colors = []
+    angles = lidar_range[:num_lasers] + heading_theta
+    end_x = (perceive_distance * np.cos(angles) + vehicle_position_x).tolist()
+    end_y = (perceive_distance * np.sin(angles) + vehicle_position_y).tolist()
+    if detector_mask is None:
+        laser_indices = range(num_lasers)
+    else:
+        laser_indices = np.flatnonzero(detector_mask[:num_lasers]).tolist()
     pg_start_position = panda_vector(vehicle_position_x, vehicle_position_y, height)
+    ray_test_closest = physics_world.rayTestClosest
 
-    for laser_index in range(num_lasers):
-        if (detector_mask is not None) and (not detector_mask[laser_index]):
-            # update vis
-            if require_colors:
-                point_x, point_y = get_laser_end(
-                    lidar_range, perceive_distance, laser_index, heading_theta, vehicle_position_x, vehicle_position_y
-                )
-                point_x, point_y, point_z = panda_vector(point_x, point_y, height)
-                colors.append(
-                    add_cloud_point_vis(
-                        point_x, point_y, height, num_lasers, laser_index, ANGLE_FACTOR, MARK_COLOR0, MARK_COLOR1,
-                        MARK_COLOR2
-                    )
-                )
-            continue
-
+    hit_indices = []
+    hit_fractions = []
+    # x, y of the lasers stopped by an object, for visualization
+    hit_positions = {}
+    for laser_index in laser_indices:
         # # coordinates problem here! take care
-        point_x, point_y = get_laser_end(
-            lidar_range, perceive_distance, laser_index, heading_theta, vehicle_position_x, vehicle_position_y
-        )
-        laser_end = panda_vector(point_x, point_y, height)
-        result = physics_world.rayTestClosest(pg_start_position, laser_end, mask)
+        laser_end = panda_vector(end_x[laser_index], end_y[laser_index], height)
+        result = ray_test_closest(pg_start_position, laser_end, mask)
         node = result.getNode()
         if node in extra_filter_node:
             # Fall back to all tests.
@@ -66,19 +63,29 @@ def perceive(
                 if result.getNode() in extra_filter_node:
                     continue
                 detected_objects.append(result)
-                cloud_points[laser_index] = result.getHitFraction()
-                laser_end = result.getHitPos()
+                hit_indices.append(laser_index)
+                hit_fractions.append(result.getHitFraction())
+                hit_positions[laser_index] = result.getHitPos()
                 break
         else:
-            cloud_points[laser_index] = result.getHitFraction()
+            hit_indices.append(laser_index)
+            hit_fractions.append(result.getHitFraction())
             if result.hasHit():
-                laser_end = result.getHitPos()
+                hit_positions[laser_index] = result.getHitPos()
             if node:
                 detected_objects.append(result)
-        if require_colors:
+    cloud_points[hit_indices] = hit_fractions
+
+    colors = []
+    if require_colors:
+        for laser_index in range(num_lasers):
+            if laser_index in hit_positions:
+                point = hit_positions[laser_index]
+            else:
+                point = panda_vector(end_x[laser_index], end_y[laser_index], height)
             colors.append(
                 add_cloud_point_vis(
-                    laser_end[0], laser_end[1], height, num_lasers, laser_index, ANGLE_FACTOR, MARK_COLOR0, MARK_COLOR1,
+                    point[0], point[1], height, num_lasers, laser_index, ANGLE_FACTOR, MARK_COLOR0, MARK_COLOR1,
                     MARK_COLOR2
                 )
             )
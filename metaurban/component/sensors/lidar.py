@@ -167,7 +167,13 @@ class Lidar(DistanceDetector):
 
         return mask, objs
 
-    def get_surrounding_objects(self, vehicle, radius=50):
+    def get_surrounding_objects(self, vehicle, radius=50, neighbor_index=None):
+        """
+        Objects whose collision shapes are within radius of the vehicle. With a NeighborIndex built in this step, the
+        objects are looked up in it instead of running a contact test against the physics world.
+        """
+        if neighbor_index is not None:
+            return neighbor_index.get_surrounding_objects(vehicle, self.BROAD_PHASE_EXTRA_DIST + int(radius))
         broad_detector = self.get_broad_phase_detector(int(radius))
         broad_detector.setPos(panda_vector(vehicle.position))
         physics_world = vehicle.engine.physics_world.dynamic_world
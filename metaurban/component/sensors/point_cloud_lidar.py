@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import numpy as np
 from panda3d.core import Point3
 from scipy.spatial.transform import Rotation as R
@@ -5,10 +7,27 @@ from scipy.spatial.transform import Rotation as R
 from metaurban.component.sensors.depth_camera import DepthCamera
 
 
+@lru_cache(maxsize=16)
+def _get_ray_directions(intrinsics, height, width):
+    """
+    Cached by PointCloudLidar.get_ray_directions(). The intrinsics is a tuple, so that it can be hashed
+    """
+    K_inv = np.linalg.inv(np.asarray(intrinsics, dtype=np.float64).reshape(3, 3))
+    # the channels are reordered from (x, y, z) of the image to (z, y, x)
+    K_inv = K_inv[[2, 1, 0]]
+    u, v = np.meshgrid(np.arange(height), np.arange(width), indexing="ij")
+    uv_coords = np.stack([u, v, np.ones_like(u)], axis=-1)
+    rays = (uv_coords @ K_inv.T).astype(np.float32)
+    rays.setflags(write=False)
+    return rays
+
+
 class PointCloudLidar(DepthCamera):
     """
     This can be viewed as a special camera sensor, whose RGB channel is (x, y ,z) world coordinate of the point cloud.
     Thus, it is compatible with all image related stuff. For example, you can use it with ImageObservation.
+    The ray direction of each pixel only depends on the resolution and the FOV, so it is computed once and each frame
+    costs a depth multiply and a rigid transform.
     """
     num_channels = 3  # x, y, z coordinates
 
@@ -21,75 +40,113 @@ class PointCloudLidar(DepthCamera):
         super(PointCloudLidar, self).__init__(width, height, engine, cuda=False)
         self.ego_centric = ego_centric
 
-    def get_rgb_array_cpu(self):
+    def get_intrinsics(self):
         """
-        The result of this function is now a 3D array of point cloud coord in shape (H, W, 3)
-        The lens parameters can be changed on the fly!
+        Camera intrinsics of the current lens. The lens parameters can be changed on the fly!
         """
-
-        lens = self.lens
-        fov = lens.getFov()
+        fov = self.lens.getFov()
         f_x = self.BUFFER_W / 2 / (np.tan(fov[0] / 2 / 180 * np.pi))
         f_y = self.BUFFER_H / 2 / (np.tan(fov[1] / 2 / 180 * np.pi))
-        intrinsics = np.asarray([[f_x, 0, (self.BUFFER_H - 1) / 2], [0, f_y, (self.BUFFER_W - 1) / 2], [0, 0, 1]])
-        f = lens.getFar()
-        n = lens.getNear()
+        return np.asarray([[f_x, 0, (self.BUFFER_H - 1) / 2], [0, f_y, (self.BUFFER_W - 1) / 2], [0, 0, 1]])
 
-        depth = super(PointCloudLidar, self).get_rgb_array_cpu()
+    def get_rgb_array_cpu(self):
+        """
+        The result of this function is now a 3D array of point cloud coord in shape (H, W, 3)
+        """
+        return self.get_point_cloud()
+
+    def get_point_cloud(self, stride=1, num_points=None, rng=None):
+        """
+        Compute the point cloud from the rendered depth. Only the sampled pixels are transformed, see
+        simulate_lidar_from_depth() for the arguments.
+        Returns: array of shape (H, W, 3), or (H / stride, W / stride, 3) or (num_points, 3) when subsampled
+        """
+        f = self.lens.getFar()
+        n = self.lens.getNear()
+        depth = super(PointCloudLidar, self).get_rgb_array_cpu()[..., 0]
         hpr = self.cam.getHpr(self.engine.render)
         hpr[0] += 90  # pand3d's y is the camera facing direction, so we need to rotate it 90 degree
         hpr[1] *= -1  # left right handed convert
-        rot = R.from_euler('ZYX', hpr, degrees=True)
-        rotation_matrix = rot.as_matrix()
-        translation = Point3(0, 0, 0)
+        rotation_matrix = R.from_euler('ZYX', hpr, degrees=True).as_matrix()
+        translation = np.zeros(3)
         if not self.ego_centric:
             translation = np.asarray(self.engine.render.get_relative_point(self.cam, Point3(0, 0, 0)))
+
+        height, width = depth.shape
+        index = self.sample_pixels(height, width, stride, num_points, rng)
+        # only the sampled pixels are converted to the eye depth and transformed
+        depth = depth[::-1, ::-1][index]
         z_eye = 2 * n * f / ((f + n) - (2 * depth - 1) * (f - n))
-        points = self.simulate_lidar_from_depth(z_eye.squeeze(-1), intrinsics, translation, rotation_matrix)
-        return points
+        rays = self.get_ray_directions(self.get_intrinsics(), height, width)[index]
+        return self.transform_rays(z_eye, rays, translation, rotation_matrix)
 
     @staticmethod
-    def simulate_lidar_from_depth(depth_img, camera_intrinsics, camera_translation, camera_rotation):
+    def get_ray_directions(camera_intrinsics, height, width):
         """
-        Simulate LiDAR points in the world coordinate system from a depth image.
+        Directions K^-1 [u, v, 1] of all pixels in the camera coordinate system, which are cached for each resolution
+        and intrinsics. The result is read-only.
 
         Parameters:
-            depth_img (np.ndarray): Depth image of shape (H, W, 3), where the last dimension represents RGB or grayscale depth values.
             camera_intrinsics (np.ndarray): Camera intrinsic matrix of shape (3, 3).
-            camera_translation (np.ndarray): Translation vector of the camera in world coordinates of shape (3,).
-            camera_rotation (np.ndarray): Rotation matrix of the camera in world coordinates of shape (3, 3).
+            height (int): Height of the depth image.
+            width (int): Width of the depth image.
 
         Returns:
-            np.ndarray: LiDAR points in the world coordinate system of shape (N, 3), where N is the number of valid points.
+            np.ndarray: Ray directions of shape (H, W, 3), the point of pixel (i, j) is the ray times depth[-i-1, -j-1].
         """
-        # Extract the depth channel (assuming it's grayscale or depth is in the R channel)
-        # Get image dimensions
-        depth_img = depth_img.T
-        depth_img = depth_img[::-1, ::-1]
-        height, width = depth_img.shape
+        intrinsics = tuple(float(x) for x in np.asarray(camera_intrinsics).reshape(-1))
+        return _get_ray_directions(intrinsics, int(height), int(width))
 
-        # Create a grid of pixel coordinates (u, v)
-        u, v = np.meshgrid(np.arange(width), np.arange(height))
-        uv_coords = np.stack([u, v, np.ones_like(u)], axis=-1)  # Shape: (H, W, 3)
+    @staticmethod
+    def sample_pixels(height, width, stride=1, num_points=None, rng=None):
+        """
+        Index of the sampled pixels, which applies to both the depth image and the ray directions.
 
-        # Reshape to (H*W, 3) for easier matrix multiplication
-        uv_coords = uv_coords.reshape(-1, 3)
+        Parameters:
+            height (int): Height of the depth image.
+            width (int): Width of the depth image.
+            stride (int): Keep one pixel every stride pixels in both dimensions.
+            num_points (int): Keep num_points random pixels instead. The order of pixels is kept.
+            rng (np.random.RandomState): Random generator for num_points, default to np.random.
 
-        # Invert the camera intrinsic matrix to project pixels to camera coordinates
-        K_inv = np.linalg.inv(camera_intrinsics)
+        Returns:
+            tuple: Index of the sampled pixels.
+        """
+        if num_points is not None:
+            pixels = np.sort((rng or np.random).choice(height * width, num_points, replace=False))
+            return np.divmod(pixels, width)
+        return slice(None, None, stride), slice(None, None, stride)
 
-        # Compute 3D points in the camera coordinate system
-        cam_coords = (K_inv @ uv_coords.T).T  # Shape: (H*W, 3)
-        cam_coords *= depth_img.reshape(-1)[..., None]  # Scale by depth
+    @staticmethod
+    def transform_rays(depth, rays, camera_translation, camera_rotation):
+        """
+        Scale the rays by the depth and transform the points to the world coordinate system.
+        """
+        cam_coords = rays * depth[..., None]
+        return cam_coords @ np.asarray(camera_rotation, dtype=cam_coords.dtype).T + \
+            np.asarray(camera_translation, dtype=cam_coords.dtype)
 
-        # Remove invalid points (e.g., depth = 0)
-        # valid_mask = depth_img.flatten() > 0
-        # cam_coords = cam_coords[valid_mask]
-        cam_coords = cam_coords[..., [2, 1, 0]]
+    @staticmethod
+    def simulate_lidar_from_depth(
+        depth_img, camera_intrinsics, camera_translation, camera_rotation, stride=1, num_points=None, rng=None
+    ):
+        """
+        Simulate LiDAR points in the world coordinate system from a depth image.
 
-        # Transform points to the world coordinate system
-        world_coords = (camera_rotation @ cam_coords.T).T + camera_translation
+        Parameters:
+            depth_img (np.ndarray): Depth image of shape (H, W).
+            camera_intrinsics (np.ndarray): Camera intrinsic matrix of shape (3, 3).
+            camera_translation (np.ndarray): Translation vector of the camera in world coordinates of shape (3,).
+            camera_rotation (np.ndarray): Rotation matrix of the camera in world coordinates of shape (3, 3).
+            stride (int): Keep one pixel every stride pixels in both dimensions.
+            num_points (int): Keep num_points random pixels instead.
+            rng (np.random.RandomState): Random generator for num_points, default to np.random.
 
-        # to original shape
-        world_coords = world_coords.reshape(height, width, 3)
-        return world_coords.swapaxes(0, 1)
+        Returns:
+            np.ndarray: LiDAR points in the world coordinate system of shape (H, W, 3). It is (H / stride, W / stride,
+            3) or (num_points, 3) when subsampled. The pixels are sampled before the transform.
+        """
+        height, width = depth_img.shape
+        index = PointCloudLidar.sample_pixels(height, width, stride, num_points, rng)
+        rays = PointCloudLidar.get_ray_directions(camera_intrinsics, height, width)[index]
+        return PointCloudLidar.transform_rays(depth_img[::-1, ::-1][index], rays, camera_translation, camera_rotation)
@@ -59,7 +59,7 @@ class TrafficCone(TrafficObject):
         self.set_static(static)
         if self.render:
             if TrafficCone.MODEL is None:
-                model = self.loader.loadModel(AssetLoader.file_path("models", "traffic_cone", "scene.gltf"))
+                model = AssetLoader.load_model(AssetLoader.file_path("models", "traffic_cone", "scene.gltf"))
                 # model.node().setTag("semantic", "vehicle")
                 model.setScale(0.02, 0.02, 0.025)
                 model.setPos(0, 0, -self.HEIGHT / 2)
@@ -104,7 +104,7 @@ class TrafficWarning(TrafficObject):
         self.set_static(static)
         if self.render:
             if TrafficWarning.MODEL is None:
-                model = self.loader.loadModel(AssetLoader.file_path("models", "warning", "warning.gltf"))
+                model = AssetLoader.load_model(AssetLoader.file_path("models", "warning", "warning.gltf"))
                 model.setScale(0.02)
                 model.setH(-90)
                 model.setPos(0, 0, -self.HEIGHT / 2 - 0.1)
@@ -144,7 +144,7 @@ class TrafficBarrier(TrafficObject):
         self.set_static(static)
         if self.render:
             if TrafficBarrier.MODEL is None:
-                model = self.loader.loadModel(AssetLoader.file_path("models", "barrier", "scene.gltf"))
+                model = AssetLoader.load_model(AssetLoader.file_path("models", "barrier", "scene.gltf"))
                 model.setH(-90)
                 model.setPos(0, 0, -1.05)
                 model.setScale(0.7)
@@ -63,7 +63,7 @@ class BaseTrafficLight(BaseObject):
         if self.render:
             if len(BaseTrafficLight.TRAFFIC_LIGHT_MODEL) == 0 and self._show_model:
                 for color in ["green", "red", "yellow", "unknown"]:
-                    model = self.loader.loadModel(
+                    model = AssetLoader.load_model(
                         AssetLoader.file_path("models", "traffic_light", "{}.gltf".format(color))
                     )
                     model.setPos(0, 0, self.TRAFFIC_LIGHT_HEIGHT)
@@ -28,7 +28,7 @@ class Cyclist(BaseTrafficParticipant):
         self.body.addShape(BulletBoxShape((self.LENGTH / 2, self.WIDTH / 2, self.HEIGHT / 2)))
         if self.render:
             if Cyclist.MODEL is None:
-                model = self.loader.loadModel(AssetLoader.file_path("models", "bicycle", "scene.gltf"))
+                model = AssetLoader.load_model(AssetLoader.file_path("models", "bicycle", "scene.gltf"))
                 model.setScale(0.15)
                 model.setPos(0, 0, -0.3)
                 Cyclist.MODEL = model
@@ -402,7 +402,7 @@ class BaseVehicle(BaseObject, BaseVehicleState):
         if self.light is None:
             self._light_models = []
             for y in [-1, 1]:
-                light_model = self.loader.loadModel(AssetLoader.file_path("models", "sphere.egg"))
+                light_model = AssetLoader.load_model(AssetLoader.file_path("models", "sphere.egg"))
                 light_model.reparentTo(self.origin)
                 light_model.setPos(self.LIGHT_POSITION[0] * y, self.LIGHT_POSITION[1], self.LIGHT_POSITION[2])
                 light_model.setScale(0.13, 0.05, 0.13)
@@ -602,7 +602,7 @@ class BaseVehicle(BaseObject, BaseVehicleState):
         if self.render:
             [path, scale, offset, HPR] = self.path
             if path not in BaseVehicle.model_collection:
-                car_model = self.loader.loadModel(AssetLoader.file_path("models", path))
+                car_model = AssetLoader.load_model(AssetLoader.file_path("models", path))
                 car_model.setTwoSided(False)
                 BaseVehicle.model_collection[path] = car_model
                 car_model.setScale(scale)
@@ -650,7 +650,7 @@ class BaseVehicle(BaseObject, BaseVehicleState):
         if self.render:
             model = 'right_tire_front.gltf' if front else 'right_tire_back.gltf'
             model_path = AssetLoader.file_path("models", os.path.dirname(self.path[0]), model)
-            wheel_model = self.loader.loadModel(model_path)
+            wheel_model = AssetLoader.load_model(model_path)
             wheel_model.setTwoSided(self.TIRE_TWO_SIDED)
             wheel_model.reparentTo(wheel_np)
             wheel_model.set_scale(1 * self.TIRE_MODEL_CORRECT if left else -1 * self.TIRE_MODEL_CORRECT)
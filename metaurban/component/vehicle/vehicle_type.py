@@ -118,7 +118,7 @@ class CustomizedCar(BaseVehicle):
     def _add_visualization(self):
         if self.render:
             [path, scale, offset, HPR] = self.path
-            car_model = self.loader.loadModel(AssetLoader.file_path("models", path))
+            car_model = AssetLoader.load_model(AssetLoader.file_path("models", path))
             car_model.setTwoSided(False)
             BaseVehicle.model_collection[path] = car_model
             car_model.setScale(scale)
@@ -164,7 +164,7 @@ class CustomizedCar(BaseVehicle):
         if self.render:
             model = 'right_tire_front.gltf' if front else 'right_tire_back.gltf'
             model_path = AssetLoader.file_path("models", os.path.dirname(self.path[0]), model)
-            wheel_model = self.loader.loadModel(model_path)
+            wheel_model = AssetLoader.load_model(model_path)
             wheel_model.setTwoSided(self.TIRE_TWO_SIDED)
             wheel_model.reparentTo(wheel_np)
             wheel_model.set_scale(
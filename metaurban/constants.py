@@ -599,6 +599,22 @@ DEFAULT_SENSOR_OFFSET = (0., 0.8, 1.5)
 DEFAULT_SENSOR_HPR = (0., -5, 0.0)
 
 import random, os
+from glob import glob
+
+
+class lazy_class_attribute:
+    """
+    A class attribute computed by the decorated function on its first access and then stored on the class, so that
+    the assets are only searched by processes using them instead of at import time
+    """
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+
+    def __get__(self, instance, owner):
+        value = self.func(owner)
+        setattr(owner, self.name, value)
+        return value
 
 
 class PedestrianAssetPaths:
@@ -682,20 +698,32 @@ class PedestrianAssetPaths:
     ## construct actors ###
     MAX_ACTOR_NUM = 20  # TODO : 1.max_actor_num (pass from main file)
 
-    PEDESTRIAN_ACTORS_BATCH = []  #{}
-    from glob import glob
-    ### SYNBODY ###   # -> has root center offset problem -> 1100 assets -32 -> 1067 # 71kpts
-    syn_actors = list(glob(PEDESTRIAN_ROOT + 'SynBody_actor/converted/*.gltf'))
-    random.shuffle(syn_actors)
+    @lazy_class_attribute
+    def PEDESTRIAN_ACTORS_BATCH(cls):
+        ### SYNBODY ###   # -> has root center offset problem -> 1100 assets -32 -> 1067 # 71kpts
+        syn_actors = list(glob(PEDESTRIAN_ROOT + 'SynBody_actor/converted/*.gltf'))
+        random.shuffle(syn_actors)
+
+        # MAX_ACTOR_NUM = min(10,len(syn_actors))   ###
+        return [
+            {
+                'actor_path': actor,
+                'motion_path': cls.SYNBODY_PEDESTRIAN_MOTIONS,
+                'height': 1.5
+            } for actor in syn_actors[:cls.MAX_ACTOR_NUM]
+        ]
 
-    # MAX_ACTOR_NUM = min(10,len(syn_actors))   ###
-    for actor in syn_actors[:MAX_ACTOR_NUM]:
-        PEDESTRIAN_ACTORS_BATCH.append({'actor_path': actor, 'motion_path': SYNBODY_PEDESTRIAN_MOTIONS, 'height': 1.5})
+    @lazy_class_attribute
+    def PEDESTRIAN_ACTORS_BATCH_NUM(cls):
+        return len(cls.PEDESTRIAN_ACTORS_BATCH)
 
-    PEDESTRIAN_ACTORS_BATCH_NUM = len(PEDESTRIAN_ACTORS_BATCH)
+    @lazy_class_attribute
+    def BELDAM_PEDESTRIAN_MOTIONS(cls):
+        return list(glob(PEDESTRIAN_ROOT + 'motions_bedlam/converted/*.gltf'))
 
-    BELDAM_PEDESTRIAN_MOTIONS = list(glob(PEDESTRIAN_ROOT + 'motions_bedlam/converted/*.gltf'))
-    BELDAM_PEDESTRIAN_MOTIONS_NUM = len(BELDAM_PEDESTRIAN_MOTIONS)
+    @lazy_class_attribute
+    def BELDAM_PEDESTRIAN_MOTIONS_NUM(cls):
+        return len(cls.BELDAM_PEDESTRIAN_MOTIONS)
 
     @staticmethod
     def get_static_random_actor():
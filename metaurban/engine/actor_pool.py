@@ -0,0 +1,84 @@
+from collections import defaultdict
+
+from direct.actor.Actor import Actor
+
+from metaurban.engine.logger import get_logger
+
+logger = get_logger()
+
+
+class ActorPool:
+    """
+    Keep the Actors of destroyed objects, detached and with their animations loaded, so that the next object using the
+    same model and animations doesn't load and parse them again. Actors are keyed by (model path, animations).
+
+    Objects cleared with force_destroy=False are buffered by the engine together with their actors and reused by
+    spawn_object(), so the pool only receives the actors of objects which are destroyed: with force_destroy=True, when
+    the engine buffer of the class is full (num_buffering_objects) and at engine close. The actors loaded in advance by
+    warm_up(), see BaseEngine.warm_up_actor_pool(), serve the first spawns in all cases.
+    """
+    # number of actors kept for each key, unless max_actors_per_model is given
+    MAX_ACTORS_PER_MODEL = 20
+
+    _actors = defaultdict(list)
+
+    @staticmethod
+    def get_key(actor_path, anims):
+        return str(actor_path), tuple(sorted((name, str(path)) for name, path in anims.items()))
+
+    @classmethod
+    def acquire(cls, actor_path, anims):
+        """
+        Return an Actor with the given model and animations, from the pool if possible
+        :param actor_path: model path
+        :param anims: dict mapping animation names to animation files, as accepted by Actor.loadAnims
+        """
+        actors = cls._actors.get(cls.get_key(actor_path, anims))
+        if actors:
+            return actors.pop()
+        actor = Actor(actor_path)
+        actor.loadAnims(anims)
+        return actor
+
+    @classmethod
+    def release(cls, actor, actor_path, anims, max_actors_per_model=None):
+        """
+        Return an Actor acquired with acquire() to the pool. The actor is stopped, detached and its transform is cleared.
+        Actors exceeding max_actors_per_model are cleaned up instead.
+        """
+        max_actors_per_model = cls.MAX_ACTORS_PER_MODEL if max_actors_per_model is None else max_actors_per_model
+        actors = cls._actors[cls.get_key(actor_path, anims)]
+        if len(actors) >= max_actors_per_model:
+            actor.cleanup()
+            actor.removeNode()
+            return
+        actor.stop()
+        actor.detachNode()
+        actor.clearTransform()
+        actors.append(actor)
+
+    @classmethod
+    def warm_up(cls, actor_path, anims, num=1, max_actors_per_model=None):
+        """
+        Load actors in advance, so that the first spawns of this model don't pay the loading cost
+        """
+        for _ in range(num - cls.get_num_actors(actor_path, anims)):
+            actor = Actor(actor_path)
+            actor.loadAnims(anims)
+            cls.release(actor, actor_path, anims, max_actors_per_model)
+
+    @classmethod
+    def get_num_actors(cls, actor_path, anims):
+        return len(cls._actors.get(cls.get_key(actor_path, anims), ()))
+
+    @classmethod
+    def clear(cls):
+        """
+        Clean up all pooled actors
+        """
+        for actors in cls._actors.values():
+            for actor in actors:
+                actor.cleanup()
+                actor.removeNode()
+        cls._actors.clear()
+        logger.debug("Actor pool is cleared")
@@ -1,6 +1,10 @@
+import hashlib
 import os
 import pathlib
 import sys
+from functools import lru_cache
+
+from panda3d.core import BamFile, BamWriter, Filename
 
 from metaurban.constants import RENDER_MODE_NONE
 from metaurban.engine.logger import get_logger
@@ -14,6 +18,9 @@ class AssetLoader:
     """
     logger = get_logger()
     loader = None
+    # directory of the on-disk cache of models compiled to .bam, None means disabled. See load_model()
+    compiled_cache_dir = None
+    COMPILED_EXTENSIONS = (".gltf", ".glb")
     asset_path = pathlib.PurePosixPath(__file__).parent.parent.joinpath("assets") if not is_win(
     ) else pathlib.Path(__file__).resolve().parent.parent.joinpath("assets")
 
@@ -83,7 +90,81 @@ class AssetLoader:
         :return: model node path
         """
         assert cls.loader is not None
-        return cls.loader.loadModel(file_path)
+        if cls.compiled_cache_dir is None or not str(file_path).lower().endswith(cls.COMPILED_EXTENSIONS):
+            return cls.loader.loadModel(file_path)
+        compiled_path = cls.get_compiled_path(file_path)
+        if os.path.isfile(compiled_path):
+            return cls.loader.loadModel(Filename.fromOsSpecific(compiled_path))
+        model = cls.loader.loadModel(file_path)
+        cls.write_compiled_model(model, compiled_path)
+        return model
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def importer_version():
+        """
+        Versions of the importer, i.e. panda3d and panda3d-gltf. Compiled models are rebuilt when they change. It is
+        read once per process
+        """
+        from panda3d.core import PandaSystem
+        try:
+            from importlib.metadata import version
+            gltf_version = version("panda3d-gltf")
+        except Exception:
+            gltf_version = "unknown"
+        return "panda3d-{}_gltf-{}".format(PandaSystem.getVersionString(), gltf_version)
+
+    @classmethod
+    def get_compiled_path(cls, file_path, cache_dir=None):
+        """
+        Path of the compiled .bam of a model file. It is keyed by the source path, its mtime and size and the importer
+        version, so editing the source or upgrading the importer never returns a stale model
+        :param file_path: path of the source model, usually the return value of AssetLoader.file_path()
+        :param cache_dir: cache directory, default to AssetLoader.compiled_cache_dir
+        :return: path of the compiled model in os specific style
+        """
+        cache_dir = cache_dir or cls.compiled_cache_dir
+        assert cache_dir is not None, "Compiled model cache is not enabled"
+        source = os.path.abspath(Filename(str(file_path)).toOsSpecific())
+        stat = os.stat(source)
+        key = "{}|{}|{}|{}".format(source, stat.st_mtime_ns, stat.st_size, cls.importer_version())
+        name = os.path.splitext(os.path.basename(source))[0]
+        return os.path.join(cache_dir, "{}-{}.bam".format(name, hashlib.sha1(key.encode("utf-8")).hexdigest()))
+
+    @classmethod
+    def write_compiled_model(cls, model, compiled_path):
+        """
+        Write the model to compiled_path. The file is written to a temporary file and then renamed, so that concurrent
+        processes sharing the cache never read a partial file. Failures are logged and ignored.
+        """
+        tmp_path = "{}.{}.tmp".format(compiled_path, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(compiled_path), exist_ok=True)
+            bam_file = BamFile()
+            if not bam_file.openWrite(Filename.fromOsSpecific(tmp_path)):
+                raise IOError("Can not open {}".format(tmp_path))
+            # textures are referenced with their full path, as the cache directory is not next to the assets
+            bam_file.getWriter().setFileTextureMode(BamWriter.BTM_fullpath)
+            success = bam_file.writeObject(model.node())
+            bam_file.close()
+            if not success:
+                raise IOError("Can not write {}".format(tmp_path))
+            os.replace(tmp_path, compiled_path)
+        except Exception as e:
+            cls.logger.warning("Fail to write compiled model {}: {}".format(compiled_path, e))
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        return True
+
+    @classmethod
+    def enable_compiled_cache(cls, cache_dir):
+        """
+        Load .gltf/.glb models from, and save them to, the compiled .bam cache in cache_dir. None disables the cache
+        """
+        cls.compiled_cache_dir = None if cache_dir is None else os.path.abspath(os.path.expanduser(str(cache_dir)))
+        if cls.compiled_cache_dir is not None:
+            cls.logger.debug("Compiled model cache: {}".format(cls.compiled_cache_dir))
 
     @classmethod
     def initialized(cls):
@@ -122,11 +203,13 @@ def initialize_asset_loader(engine):
         )
         return
     AssetLoader.init_loader(engine)
+    AssetLoader.enable_compiled_cache(engine.global_config["compiled_asset_cache"])
 
 
 def close_asset_loader():
     cls = AssetLoader
     cls.loader = None
+    cls.compiled_cache_dir = None
 
 
 def randomize_cover():
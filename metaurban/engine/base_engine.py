@@ -2,15 +2,18 @@ import os
 import pickle
 import time
 from collections import OrderedDict
+from contextlib import nullcontext
 from typing import Callable, Optional, Union, List, Dict, AnyStr
 
 import numpy as np
 
 from metaurban.base_class.randomizable import Randomizable
 from metaurban.constants import RENDER_MODE_NONE
+from metaurban.engine.actor_pool import ActorPool
 from metaurban.engine.core.engine_core import EngineCore
 from metaurban.engine.interface import Interface
 from metaurban.engine.logger import get_logger, reset_logger
+from metaurban.engine.profiler import StepProfiler
 
 from metaurban.pull_asset import pull_asset
 from metaurban.utils import concat_step_infos
@@ -35,6 +38,24 @@ def generate_distinct_rgb_values():
 COLOR_SPACE = generate_distinct_rgb_values()
 
 
+def pack_colors(image):
+    """
+    Pack 8-bit BGR colors (..., 3) to keys of the instance color lookup table. The colors of COLOR_SPACE are multiples
+    of 8, so 5 bits per channel are kept, and the key is -1 if any of the dropped bits is set.
+    """
+    image = image.astype(np.int32)
+    b, g, r = image[..., 0], image[..., 1], image[..., 2]
+    keys = (r >> 3) << 10 | (g >> 3) << 5 | b >> 3
+    keys[((r | g | b) & 7) != 0] = -1
+    return keys
+
+
+# lookup key and index in COLOR_SPACE of each color
+_keys = pack_colors(np.rint(np.asarray(COLOR_SPACE)[:, ::-1] * 255))
+assert len(set(_keys.tolist())) == len(COLOR_SPACE) and (_keys >= 0).all()
+COLOR_KEYS = {color: (int(key), index) for index, (color, key) in enumerate(zip(COLOR_SPACE, _keys))}
+
+
 class BaseEngine(EngineCore, Randomizable):
     """
     Due to the feature of Panda3D, BaseEngine should only be created once(Singleton Pattern)
@@ -51,6 +72,9 @@ class BaseEngine(EngineCore, Randomizable):
     def __init__(self, global_config):
         self.c_id = dict()
         self.id_c = dict()
+        # packed color -> index of the color in COLOR_SPACE, and index -> object id, see decode_instance_mask()
+        self.color_lut = np.full(1 << 15, -1, dtype=np.int32)
+        self.instance_ids = np.full(self.MAX_COLOR + 1, None, dtype=object)
         self.try_pull_asset(global_config)
         EngineCore.__init__(self, global_config)
         Randomizable.__init__(self, self.global_random_seed)
@@ -84,6 +108,14 @@ class BaseEngine(EngineCore, Randomizable):
         # topdown renderer
         self.top_down_renderer = None
 
+        # per manager profiling
+        self.profiler = None
+        if self.global_config.get("profile", False):
+            self.profiler = StepProfiler(
+                window=self.global_config.get("profile_window", 1000),
+                record_memory=self.global_config.get("profile_memory", False)
+            )
+
         # warm up
         self.warmup()
 
@@ -173,6 +205,7 @@ class BaseEngine(EngineCore, Randomizable):
         # print("After picking:", len(BaseEngine.COLORS_OCCUPIED), len(BaseEngine.COLORS_FREE))
         self.id_c[id] = my_color
         self.c_id[my_color] = id
+        self._set_instance_color(my_color, id)
         return my_color
 
     def _clean_color(self, id):
@@ -192,6 +225,29 @@ class BaseEngine(EngineCore, Randomizable):
             # print("After cleaning:,", len(BaseEngine.COLORS_OCCUPIED), len(BaseEngine.COLORS_FREE))
             self.id_c.pop(id)
             self.c_id.pop(my_color)
+            self._set_instance_color(my_color, None)
+
+    def _set_instance_color(self, color, id):
+        """
+        Keep the lookup table of decode_instance_mask() in step with the color mapping. id None releases the color
+        """
+        key, index = COLOR_KEYS[color]
+        self.color_lut[key] = -1 if id is None else index
+        self.instance_ids[index] = id
+
+    def decode_instance_mask(self, image):
+        """
+        Decode an image of InstanceCamera to per-pixel instance indices with one lookup, instead of matching colors one
+        by one with color_to_id().
+        :param image: BGR image of shape (..., 3), uint8 or float in [0, 1], i.e. InstanceCamera.perceive() output
+        :return: int32 array of shape (...), the index of the object color in COLOR_SPACE, or -1 for the background and
+        unknown colors. engine.instance_ids[indices] gives the object ids, which is None for -1
+        """
+        image = np.asarray(image)
+        if image.dtype != np.uint8:
+            image = np.rint(image * 255)
+        keys = pack_colors(image[..., :3])
+        return np.where(keys >= 0, self.color_lut[keys], -1)
 
     def id_to_color(self, id):
         if id in self.id_c.keys():
@@ -322,29 +378,12 @@ class BaseEngine(EngineCore, Randomizable):
         self.record_episode = self.global_config["record_episode"]
         self.only_reset_when_replay = self.global_config["only_reset_when_replay"]
 
-        _debug_memory_usage = False
-
-        if _debug_memory_usage:
-
-            def process_memory():
-                import psutil
-                import os
-                process = psutil.Process(os.getpid())
-                mem_info = process.memory_info()
-                return mem_info.rss
-
-            cm = process_memory()
-
         # reset manager
         for manager_name, manager in self._managers.items():
             # clean all manager
-            new_step_infos = manager.before_reset()
+            with self.profile(manager_name, "before_reset"):
+                new_step_infos = manager.before_reset()
             step_infos = concat_step_infos([step_infos, new_step_infos])
-            if _debug_memory_usage:
-                lm = process_memory()
-                if lm - cm != 0:
-                    print("{}: Before Reset! Mem Change {:.3f}MB".format(manager_name, (lm - cm) / 1e6))
-                cm = lm
         self.terrain.before_reset()
         self._object_clean_check()
 
@@ -352,25 +391,15 @@ class BaseEngine(EngineCore, Randomizable):
             if self.replay_episode and self.only_reset_when_replay and manager is not self.replay_manager:
                 # The scene will be generated from replay manager in only reset replay mode
                 continue
-            new_step_infos = manager.reset()
+            with self.profile(manager_name, "reset"):
+                new_step_infos = manager.reset()
             step_infos = concat_step_infos([step_infos, new_step_infos])
 
-            if _debug_memory_usage:
-                lm = process_memory()
-                if lm - cm != 0:
-                    print("{}: Reset! Mem Change {:.3f}MB".format(manager_name, (lm - cm) / 1e6))
-                cm = lm
-
         for manager_name, manager in self.managers.items():
-            new_step_infos = manager.after_reset()
+            with self.profile(manager_name, "after_reset"):
+                new_step_infos = manager.after_reset()
             step_infos = concat_step_infos([step_infos, new_step_infos])
 
-            if _debug_memory_usage:
-                lm = process_memory()
-                if lm - cm != 0:
-                    print("{}: After Reset! Mem Change {:.3f}MB".format(manager_name, (lm - cm) / 1e6))
-                cm = lm
-
         # reset terrain
         # center_p = self.current_map.get_center_point() if isinstance(self.current_map, PGMap) else [0, 0]
         center_p = [0, 0]
@@ -381,14 +410,17 @@ class BaseEngine(EngineCore, Randomizable):
             self.sky_box.set_position(center_p)
 
         # refresh graphics to support multi-thread rendering, avoiding bugs like shadow disappearance at first frame
-        for _ in range(5):
-            self.graphicsEngine.renderFrame()
+        with self.profile("render", "reset"):
+            for _ in range(5):
+                self.graphicsEngine.renderFrame()
 
         # reset colors
         BaseEngine.COLORS_FREE = set(COLOR_SPACE)
         BaseEngine.COLORS_OCCUPIED = set()
         new_i2c = {}
         new_c2i = {}
+        self.color_lut[:] = -1
+        self.instance_ids[:] = None
         # print("rest objects", len(self.get_objects()))
         for object in self.get_objects().values():
             if object.id in self.id_c.keys():
@@ -398,6 +430,7 @@ class BaseEngine(EngineCore, Randomizable):
                 BaseEngine.COLORS_FREE.remove(color)
                 new_i2c[id] = color
                 new_c2i[color] = id
+                self._set_instance_color(color, id)
         # print(len(BaseEngine.COLORS_FREE), len(BaseEngine.COLORS_OCCUPIED))
         self.c_id = new_c2i
         self.id_c = new_i2c
@@ -413,8 +446,9 @@ class BaseEngine(EngineCore, Randomizable):
         self.episode_step += 1
         step_infos = {}
         self.external_actions = external_actions
-        for manager in self.managers.values():
-            new_step_infos = manager.before_step()
+        for manager_name, manager in self.managers.items():
+            with self.profile(manager_name, "before_step"):
+                new_step_infos = manager.before_step()
             step_infos = concat_step_infos([step_infos, new_step_infos])
         return step_infos
 
@@ -431,8 +465,10 @@ class BaseEngine(EngineCore, Randomizable):
                         continue
 
                 if name != "record_manager":
-                    manager.step()
-            self.step_physics_world()
+                    with self.profile(name, "step"):
+                        manager.step()
+            with self.profile("physics", "step"):
+                self.step_physics_world()
 
             # the recording should happen after step physics world
             if "record_manager" in self.managers and i < step_num - 1:
@@ -450,7 +486,8 @@ class BaseEngine(EngineCore, Randomizable):
                 self.task_manager.step()
 
         #  Do rendering
-        self.task_manager.step()
+        with self.profile("render", "step"):
+            self.task_manager.step()
         if self.on_screen_message is not None:
             self.on_screen_message.render()
 
@@ -463,8 +500,9 @@ class BaseEngine(EngineCore, Randomizable):
         step_infos = {}
         if self.record_episode:
             assert list(self.managers.keys())[-1] == "record_manager", "Record Manager should have lowest priority"
-        for manager in self.managers.values():
-            new_step_info = manager.after_step(*args, **kwargs)
+        for manager_name, manager in self.managers.items():
+            with self.profile(manager_name, "after_step"):
+                new_step_info = manager.after_step(*args, **kwargs)
             step_infos = concat_step_infos([step_infos, new_step_info])
         self.interface.after_step()
 
@@ -487,6 +525,28 @@ class BaseEngine(EngineCore, Randomizable):
         # poses = [v.position for v in self.agent_manager.active_agents.values()]
         return step_infos
 
+    def profile(self, name, phase):
+        """
+        Context manager measuring the enclosed code as `name` in `phase` when profiling is enabled, no-op otherwise
+        """
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.measure(name, phase)
+
+    def get_profile(self):
+        """
+        Rolling statistics of the time spent by each manager in each phase, physics and rendering, see StepProfiler
+        """
+        assert self.profiler is not None, "Set profile=True in the config to enable profiling"
+        return self.profiler.get_profile()
+
+    def dump_profile_trace(self, file_name="metaurban_profile.json"):
+        """
+        Dump the latest profiled phases as a Chrome trace JSON file
+        """
+        assert self.profiler is not None, "Set profile=True in the config to enable profiling"
+        return self.profiler.dump_chrome_trace(file_name)
+
     def dump_episode(self, pkl_file_name=None) -> None:
         """Dump the data of an episode."""
         assert self.record_manager is not None
@@ -520,6 +580,7 @@ class BaseEngine(EngineCore, Randomizable):
                 self._clean_color(obj.id)
                 obj.destroy()
         self._dying_objects = {}
+        ActorPool.clear()
         if self.main_camera is not None:
             self.main_camera.destroy()
         self.interface.destroy()
@@ -759,6 +820,24 @@ class BaseEngine(EngineCore, Randomizable):
             warm_up_light = None
             barrier = None
             cone = None
+            self.warm_up_actor_pool()
+
+    def warm_up_actor_pool(self):
+        """
+        Load the actors of the agents sharing one model, i.e. wheelchairs, e-dogs and e-robots, into ActorPool, so that
+        spawning them in the first episode doesn't load the models. Pedestrians pick a random model each, so they are
+        not loaded in advance.
+        """
+        from metaurban.component.agents.pedestrian.base_pedestrian import BasePedestrian
+        from metaurban.constants import AssetPaths
+        max_actors = self.global_config["max_pooled_actors"]
+        for agent, num in [(AssetPaths.Pedestrian.get_wheelchair_agent(), "spawn_wheelchairman_num"),
+                           (AssetPaths.Pedestrian.get_edog_agent(), "spawn_edog_num"),
+                           (AssetPaths.Pedestrian.get_erobot_agent(), "spawn_erobot_num")]:
+            num = min(self.global_config.get(num, 0), max_actors)
+            if num > 0:
+                actor_key = BasePedestrian.get_actor_key(agent["actor_path"], agent["motion_path"])
+                ActorPool.warm_up(*actor_key, num=num, max_actors_per_model=max_actors)
 
     @staticmethod
     def try_pull_asset(global_config):
@@ -25,6 +25,7 @@ from metaurban.engine.core.light import Light
 from metaurban.engine.core.onscreen_message import ScreenMessage
 from metaurban.engine.core.physics_world import PhysicsWorld
 from metaurban.engine.core.pssm import PSSM
+from metaurban.engine.core.sensor_scheduler import SensorScheduler
 from metaurban.engine.core.sky_box import SkyBox
 from metaurban.engine.core.terrain import Terrain
 from metaurban.engine.logger import get_logger
@@ -344,6 +345,7 @@ class EngineCore(ShowBase.ShowBase):
 
         # create sensors
         self.sensors = {}
+        self.sensor_scheduler = SensorScheduler(self)
         self.setup_sensors()
 
         # toggle in debug physics world
@@ -98,12 +98,22 @@ class ImageBuffer:
         """
         pass
 
+    def get_buffers(self):
+        """
+        The graphics outputs rendered for this image buffer, including the intermediate buffers of its filters
+        """
+        buffers = [self.buffer]
+        manager = getattr(self, "manager", None)
+        if manager is not None:
+            buffers += manager.buffers
+        return buffers
+
     def get_rgb_array_cpu(self):
         """
         Get the rgb array on CPU, which suffers from the latency of moving data from graphics card to memory
         """
         origin_img = self.buffer.getDisplayRegion(1).getScreenshot()
-        img = np.frombuffer(origin_img.getRamImage().getData(), dtype=np.uint8)
+        img = np.frombuffer(origin_img.getRamImage(), dtype=np.uint8)
         img = img.reshape((origin_img.getYSize(), origin_img.getXSize(), -1))
         img = img[..., :self.num_channels]
         img = img[::-1]
@@ -0,0 +1,65 @@
+from metaurban.engine.core.image_buffer import ImageBuffer
+
+
+class SensorScheduler:
+    """
+    Render camera sensors outside the regular engine frame, e.g. when cameras are borrowed to capture images from other
+    poses. Only the buffers of the requested cameras are rendered, and the requests of different cameras are gathered
+    in one frame, so that capturing front/left/right views and their depth costs one renderFrame instead of one per
+    sensor. It is available as engine.sensor_scheduler.
+    """
+    def __init__(self, engine):
+        self.engine = engine
+
+    def render(self, cameras):
+        """
+        Render one frame for the given cameras only. The main window and the buffers of other cameras are deactivated
+        during the rendering, while other outputs, like shadow maps, are rendered as usual. The results are ready to be
+        read when this function returns.
+        """
+        own_buffers = [buffer for camera in cameras for buffer in camera.get_buffers()]
+        outputs = [self.engine.win]
+        for sensor in self.engine.sensors.values():
+            if isinstance(sensor, ImageBuffer) and sensor.buffer is not None and all(sensor is not c for c in cameras):
+                outputs += sensor.get_buffers()
+        deactivated = [output for output in outputs if output.isActive() and output not in own_buffers]
+        for output in deactivated:
+            output.setActive(False)
+        try:
+            self.engine.graphicsEngine.renderFrame()
+        finally:
+            for output in deactivated:
+                output.setActive(True)
+
+    def capture(self, requests, to_float=True):
+        """
+        Capture images for a batch of requests with as few frames as possible. Each frame renders every requested
+        camera once, so n different cameras take one frame, while a camera requested at k poses takes k frames.
+        :param requests: a list of (sensor, new_parent_node, position, hpr), where sensor is a sensor id or a camera.
+        The pose is set as in camera.perceive(), and restored afterwards
+        :param to_float: the same as in camera.perceive()
+        :return: a list of images, in the order of requests
+        """
+        cameras = [self.engine.get_sensor(sensor) if isinstance(sensor, str) else sensor for sensor, *_ in requests]
+        results = [None] * len(requests)
+        pending = []
+        for i, camera in enumerate(cameras):
+            if camera.enable_cuda:
+                # the cuda result is only updated by stepping the engine
+                results[i] = camera.perceive(to_float, *requests[i][1:])
+            else:
+                pending.append(i)
+        while len(pending) > 0:
+            frame, rest = [], []
+            for i in pending:
+                (rest if any(cameras[i] is cameras[j] for j in frame) else frame).append(i)
+            original_poses = [cameras[i].set_pose(*requests[i][1:]) for i in frame]
+            try:
+                self.render([cameras[i] for i in frame])
+                for i in frame:
+                    results[i] = cameras[i].format_image(cameras[i].get_rgb_array_cpu(), to_float)
+            finally:
+                for i, original_pose in zip(frame, original_poses):
+                    cameras[i].restore_pose(original_pose)
+            pending = rest
+        return results
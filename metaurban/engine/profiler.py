@@ -0,0 +1,83 @@
+import json
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+
+class StepProfiler:
+    """
+    Record the wall time, and optionally the RSS change, of each manager in each engine phase (reset, before_step,
+    step, after_step), as well as physics, rendering and observation. Only the latest `window` measurements of each
+    (phase, name) pair are kept, so percentiles follow the current behavior of the simulation. Enable it with the
+    config `profile=True` and read it with engine.get_profile() or engine.dump_profile_trace().
+    """
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, window=1000, record_memory=False):
+        self.window = window
+        self.record_memory = record_memory
+        self._durations = defaultdict(lambda: deque(maxlen=self.window))
+        self._memory = defaultdict(lambda: deque(maxlen=self.window))
+        # (name, phase, start, duration) of the latest measurements, for the Chrome trace
+        self._events = deque(maxlen=self.window * 16)
+        self._process = None
+        if record_memory:
+            import psutil
+            self._process = psutil.Process(os.getpid())
+
+    @contextmanager
+    def measure(self, name, phase):
+        rss = self._process.memory_info().rss if self.record_memory else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self._durations[(phase, name)].append(duration)
+            self._events.append((name, phase, start, duration))
+            if self.record_memory:
+                self._memory[(phase, name)].append(self._process.memory_info().rss - rss)
+
+    def get_profile(self):
+        """
+        Statistics of the recorded measurements, keyed by "phase/name". Times are in ms and memory in MB.
+        """
+        ret = {}
+        for (phase, name), durations in self._durations.items():
+            durations = np.asarray(durations) * 1e3
+            stat = dict(count=len(durations), mean=float(np.mean(durations)), total=float(np.sum(durations)))
+            for p, value in zip(self.PERCENTILES, np.percentile(durations, self.PERCENTILES)):
+                stat["p{}".format(p)] = float(value)
+            if self.record_memory:
+                stat["rss_delta_mean"] = float(np.mean(self._memory[(phase, name)])) / 1e6
+            ret["{}/{}".format(phase, name)] = stat
+        return ret
+
+    def dump_chrome_trace(self, file_name):
+        """
+        Write the latest measurements in the Chrome trace event format, which can be opened with chrome://tracing or
+        https://ui.perfetto.dev
+        """
+        pid = os.getpid()
+        # one row per phase
+        tids = {}
+        for _, phase, _, _ in self._events:
+            tids.setdefault(phase, len(tids))
+        events = [
+            dict(name="thread_name", ph="M", pid=pid, tid=tid, args=dict(name=phase)) for phase, tid in tids.items()
+        ]
+        events += [
+            dict(name=name, cat=phase, ph="X", ts=start * 1e6, dur=duration * 1e6, pid=pid, tid=tids[phase])
+            for name, phase, start, duration in self._events
+        ]
+        with open(file_name, "w") as file:
+            json.dump(dict(traceEvents=events, displayTimeUnit="ms"), file)
+        return file_name
+
+    def clear(self):
+        self._durations.clear()
+        self._memory.clear()
+        self._events.clear()
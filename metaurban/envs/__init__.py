@@ -1,3 +1,4 @@
 from metaurban.envs.sidewalk_dynamic_env import SidewalkDynamicMetaUrbanEnv
 from metaurban.envs.sidewalk_static_env import SidewalkStaticMetaUrbanEnv
 from metaurban.envs.top_down_env import TopDownMetaUrban, TopDownMetaUrbanEnvV2, TopDownSingleFrameMetaUrbanEnv
+from metaurban.envs.vector_env import VectorEnv
@@ -196,6 +196,12 @@ BASE_DEFAULT_CONFIG = dict(
     force_destroy=False,
     # Number of buffering objects for each class.
     num_buffering_objects=200,
+    # Number of loaded pedestrian actors kept for each model and animation set, so that destroyed pedestrians' actors
+    # can be reused without loading them again.
+    max_pooled_actors=20,
+    # Directory of the compiled model cache. When set, .gltf/.glb models are converted to .bam on the first load and
+    # read from the cache afterwards. Pre-build it with `python -m metaurban.build_asset_cache --cache-dir <dir>`.
+    compiled_asset_cache=None,
     # Turn on it to use render pipeline, which provides advanced rendering effects (Beta)
     render_pipeline=False,
     # daytime is only available when using render-pipeline
@@ -231,6 +237,10 @@ BASE_DEFAULT_CONFIG = dict(
     # ===== Debug =====
     # Please see Documentation: Debug for more details
     pstats=False,  # turn on to profile the efficiency
+    # record the time spent by each manager per phase, physics and rendering, see engine.get_profile()
+    profile=False,
+    profile_memory=False,  # also record the RSS change of each profiled phase
+    profile_window=1000,  # number of latest measurements kept for percentiles and the Chrome trace
     debug=False,  # debug, output more messages
     debug_panda3d=False,  # debug panda3d
     debug_physics_world=False,  # only render physics world without model, a special debug option
@@ -617,7 +627,8 @@ class BaseEnv(gym.Env):
             done_function_result, done_infos[v_id] = self.done_function(v_id)
             _, cost_infos[v_id] = self.cost_function(v_id)
             self.dones[v_id] = done_function_result or self.dones[v_id]
-            o = self.observations[v_id].observe(v)
+            with self.engine.profile(v_id, "observe"):
+                o = self.observations[v_id].observe(v)
             obses[v_id] = o
 
         step_infos = concat_step_infos([engine_info, done_infos, reward_infos, cost_infos])
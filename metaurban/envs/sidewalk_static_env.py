@@ -55,6 +55,7 @@ metaurban_DEFAULT_CONFIG = dict(
     # ===== Object =====
     accident_prob=0.,  # accident may happen on each block with this probability, except multi-exits block
     static_traffic_object=True,  # object won't react to any collisions
+    cache_asset_layout=True,  # replay the sidewalk objects placed for a seed when this seed is used again
 
     # ===== Others =====
     use_AI_protector=False,
@@ -1,6 +1,6 @@
 from metaurban.envs import SidewalkStaticMetaUrbanEnv
 from metaurban.obs.top_down_obs import TopDownObservation
-from metaurban.obs.top_down_obs_multi_channel import TopDownMultiChannel
+from metaurban.obs.top_down_obs_multi_channel import TopDownMultiChannel, NumpyTopDownMultiChannel
 from metaurban.utils import Config
 
 
@@ -16,7 +16,9 @@ class TopDownSingleFrameMetaUrbanEnv(SidewalkStaticMetaUrbanEnv):
                 "post_stack": 5,
                 "norm_pixel": True,
                 "resolution_size": 84,
-                "distance": 30
+                "distance": 30,
+                # pygame or numpy. The numpy backend of the multi-channel observation is headless and faster
+                "top_down_backend": "pygame"
             }
         )
         return config
@@ -30,9 +32,17 @@ class TopDownSingleFrameMetaUrbanEnv(SidewalkStaticMetaUrbanEnv):
         )
 
 
+def _get_multi_channel_class(backend):
+    if backend == "pygame":
+        return TopDownMultiChannel
+    elif backend == "numpy":
+        return NumpyTopDownMultiChannel
+    raise ValueError("Unknown top-down backend: {}, it should be pygame or numpy".format(backend))
+
+
 class TopDownMetaUrban(TopDownSingleFrameMetaUrbanEnv):
     def get_single_observation(self, _=None):
-        return TopDownMultiChannel(
+        return _get_multi_channel_class(self.config["top_down_backend"])(
             self.config["vehicle_config"],
             onscreen=self.config["use_render"],
             clip_rgb=self.config["norm_pixel"],
@@ -56,13 +66,15 @@ class TopDownMetaUrbanEnvV2(SidewalkStaticMetaUrbanEnv):
                 "post_stack": 5,
                 "norm_pixel": True,
                 "resolution_size": 84,
-                "distance": 30
+                "distance": 30,
+                # pygame or numpy. The numpy backend of the multi-channel observation is headless and faster
+                "top_down_backend": "pygame"
             }
         )
         return config
 
     def get_single_observation(self, _=None):
-        return TopDownMultiChannel(
+        return _get_multi_channel_class(self.config["top_down_backend"])(
             self.config["vehicle_config"],
             self.config["use_render"],
             self.config["norm_pixel"],
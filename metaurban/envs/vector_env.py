@@ -0,0 +1,270 @@
+import multiprocessing
+import time
+import traceback
+from collections import deque
+from multiprocessing import shared_memory
+
+import gymnasium as gym
+import numpy as np
+
+
+def _get_leaves(space, path=()):
+    """
+    Flatten a (nested) observation space to a list of (path, shape, dtype), one for each array of the observation
+    """
+    if isinstance(space, gym.spaces.Dict):
+        return [leaf for key, subspace in space.spaces.items() for leaf in _get_leaves(subspace, path + (key, ))]
+    elif isinstance(space, gym.spaces.Tuple):
+        return [leaf for i, subspace in enumerate(space.spaces) for leaf in _get_leaves(subspace, path + (i, ))]
+    elif isinstance(space, (gym.spaces.Box, gym.spaces.Discrete, gym.spaces.MultiDiscrete, gym.spaces.MultiBinary)):
+        return [(path, space.shape, np.dtype(space.dtype))]
+    else:
+        raise ValueError("Unsupported observation space: {}".format(space))
+
+
+def _get_item(obs, path):
+    for key in path:
+        obs = obs[key]
+    return obs
+
+
+def _build_obs(space, arrays, path=()):
+    """
+    Rebuild the structure of the observation space with the arrays, which are keyed by path
+    """
+    if isinstance(space, gym.spaces.Dict):
+        return {key: _build_obs(subspace, arrays, path + (key, )) for key, subspace in space.spaces.items()}
+    elif isinstance(space, gym.spaces.Tuple):
+        return tuple(_build_obs(subspace, arrays, path + (i, )) for i, subspace in enumerate(space.spaces))
+    return arrays[path]
+
+
+def _worker(index, env_class, config, pipe, auto_reset):
+    env = None
+    buffers = []
+    try:
+        env = env_class(config)
+        pipe.send(("ok", (env.observation_space, env.action_space)))
+        leaves = _get_leaves(env.observation_space)
+
+        # attach this worker's row of each shared array
+        names = pipe.recv()
+        for (path, shape, dtype), name in zip(leaves, names):
+            buffer = shared_memory.SharedMemory(name=name)
+            buffers.append(buffer)
+        rows = [
+            np.ndarray((index + 1, ) + shape, dtype=dtype, buffer=buffer.buf)[index]
+            for (path, shape, dtype), buffer in zip(leaves, buffers)
+        ]
+
+        def write(obs):
+            for (path, _, _), row in zip(leaves, rows):
+                row[...] = _get_item(obs, path)
+
+        while True:
+            command, data = pipe.recv()
+            if command == "step":
+                start = time.perf_counter()
+                obs, reward, terminated, truncated, info = env.step(data)
+                if auto_reset and (terminated or truncated):
+                    info = dict(info)
+                    # the terminal observation is returned in info, as the shared arrays hold the new episode
+                    info["final_observation"] = obs
+                    obs, info["reset_info"] = env.reset()
+                write(obs)
+                pipe.send(("ok", (reward, terminated, truncated, info, time.perf_counter() - start)))
+            elif command == "reset":
+                obs, info = env.reset(seed=data)
+                write(obs)
+                pipe.send(("ok", info))
+            elif command == "call":
+                name, args, kwargs = data
+                attr = getattr(env, name)
+                pipe.send(("ok", attr(*args, **kwargs) if callable(attr) else attr))
+            elif command == "close":
+                break
+            else:
+                raise ValueError("Unknown command: {}".format(command))
+    except (KeyboardInterrupt, EOFError):
+        pass
+    except Exception:
+        pipe.send(("error", "Worker {}:\n{}".format(index, traceback.format_exc())))
+    finally:
+        rows = None
+        for buffer in buffers:
+            buffer.close()
+        if env is not None:
+            env.close()
+        pipe.close()
+
+
+class VectorEnv:
+    """
+    Run a batch of single-agent environments, each in its own worker process with its own engine. Observations are
+    written by the workers to shared memory arrays allocated from the observation space, so that only actions, rewards
+    and infos go through the pipes. Episodes are reset automatically when they end: the terminal observation is returned
+    in info["final_observation"] and the returned observation is the first one of the next episode.
+
+    Usage:
+        envs = VectorEnv(SidewalkStaticMetaUrbanEnv, [dict(start_seed=i) for i in range(8)])
+        obs, infos = envs.reset()
+        obs, rewards, terminateds, truncateds, infos = envs.step(actions)
+        envs.close()
+    """
+    def __init__(self, env_class, configs, auto_reset=True, copy=True, start_method="spawn", timing_window=1000):
+        """
+        :param env_class: environment class, it should be importable by the workers
+        :param configs: a list of config, one for each environment
+        :param auto_reset: reset the environments when their episodes end
+        :param copy: return a copy of the observations. Otherwise the returned arrays are views of the shared memory,
+        which are overwritten by the next step or reset
+        :param start_method: multiprocessing start method. Workers are spawned by default to not inherit the engine
+        :param timing_window: number of latest step durations kept for each worker
+        """
+        self.num_envs = len(configs)
+        assert self.num_envs > 0, "At least one environment is required"
+        self.copy = copy
+        self.closed = False
+        self._waiting = False
+        self._buffers = []
+        ctx = multiprocessing.get_context(start_method)
+        self._pipes, self._processes = [], []
+        for index, config in enumerate(configs):
+            parent_pipe, child_pipe = ctx.Pipe()
+            process = ctx.Process(target=_worker, args=(index, env_class, config, child_pipe, auto_reset), daemon=True)
+            process.start()
+            child_pipe.close()
+            self._pipes.append(parent_pipe)
+            self._processes.append(process)
+        try:
+            spaces = self._receive_all()
+            self.observation_space, self.action_space = spaces[0]
+
+            # one array of shape (num_envs, ...) for each array of the observation
+            self._arrays = {}
+            for path, shape, dtype in _get_leaves(self.observation_space):
+                size = max(self.num_envs * int(np.prod(shape)) * dtype.itemsize, 1)
+                buffer = shared_memory.SharedMemory(create=True, size=size)
+                self._buffers.append(buffer)
+                self._arrays[path] = np.ndarray((self.num_envs, ) + shape, dtype=dtype, buffer=buffer.buf)
+            for pipe in self._pipes:
+                pipe.send([buffer.name for buffer in self._buffers])
+        except Exception:
+            self.close(terminate=True)
+            raise
+        self.step_times = [deque(maxlen=timing_window) for _ in range(self.num_envs)]
+
+    def _receive_all(self):
+        results, errors = [], []
+        for pipe in self._pipes:
+            status, result = pipe.recv()
+            (results if status == "ok" else errors).append(result)
+        if errors:
+            raise RuntimeError("\n".join(errors))
+        return results
+
+    def _get_obs(self):
+        arrays = {path: array.copy() for path, array in self._arrays.items()} if self.copy else self._arrays
+        return _build_obs(self.observation_space, arrays)
+
+    def reset(self, seed=None):
+        """
+        Reset all environments
+        :param seed: None, an int used as the seed of the first environment and incremented for the others, or a list
+        of seeds
+        :return: batched observations and a list of infos
+        """
+        assert not self._waiting, "Call step_wait() before reset()"
+        if seed is None or isinstance(seed, int):
+            seeds = [None if seed is None else seed + i for i in range(self.num_envs)]
+        else:
+            seeds = list(seed)
+            assert len(seeds) == self.num_envs
+        for pipe, env_seed in zip(self._pipes, seeds):
+            pipe.send(("reset", env_seed))
+        infos = self._receive_all()
+        return self._get_obs(), infos
+
+    def step_async(self, actions):
+        """
+        Send the actions to the workers without waiting for the results
+        """
+        assert not self._waiting, "Call step_wait() before another step_async()"
+        assert len(actions) == self.num_envs
+        for pipe, action in zip(self._pipes, actions):
+            pipe.send(("step", action))
+        self._waiting = True
+
+    def step_wait(self):
+        """
+        Wait for the steps sent by step_async()
+        :return: batched observations, rewards, terminateds and truncateds, and a list of infos
+        """
+        assert self._waiting, "Call step_async() before step_wait()"
+        self._waiting = False
+        results = self._receive_all()
+        rewards = np.array([result[0] for result in results], dtype=np.float64)
+        terminateds = np.array([result[1] for result in results], dtype=bool)
+        truncateds = np.array([result[2] for result in results], dtype=bool)
+        for step_times, result in zip(self.step_times, results):
+            step_times.append(result[4])
+        return self._get_obs(), rewards, terminateds, truncateds, [result[3] for result in results]
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+    def call(self, name, *args, **kwargs):
+        """
+        Call a method, or get an attribute, of all environments
+        """
+        assert not self._waiting, "Call step_wait() before call()"
+        for pipe in self._pipes:
+            pipe.send(("call", (name, args, kwargs)))
+        return self._receive_all()
+
+    def get_worker_timings(self):
+        """
+        Statistics of the latest env.step() durations of each worker in ms, including the auto reset
+        """
+        ret = []
+        for step_times in self.step_times:
+            step_times = np.asarray(step_times) * 1e3
+            if len(step_times) == 0:
+                ret.append(dict(count=0))
+                continue
+            p50, p99 = np.percentile(step_times, [50, 99])
+            ret.append(dict(count=len(step_times), mean=float(np.mean(step_times)), p50=float(p50), p99=float(p99)))
+        return ret
+
+    def close(self, terminate=False):
+        if self.closed:
+            return
+        self.closed = True
+        if self._waiting and not terminate:
+            self._receive_all()
+        for pipe, process in zip(self._pipes, self._processes):
+            if not terminate and process.is_alive():
+                try:
+                    pipe.send(("close", None))
+                except (BrokenPipeError, EOFError):
+                    pass
+        for process in self._processes:
+            if terminate:
+                process.terminate()
+            process.join()
+        for pipe in self._pipes:
+            pipe.close()
+        self._arrays = {}
+        for buffer in self._buffers:
+            try:
+                buffer.close()
+            except BufferError:
+                # the observations returned with copy=False still refer to it, it is freed with them
+                pass
+            buffer.unlink()
+        self._buffers = []
+
+    def __del__(self):
+        if not getattr(self, "closed", True):
+            self.close()
@@ -316,9 +316,11 @@ if __name__ == "__main__":
             
             if args.save_img and scenario_t >= start_t:
                 # ===== Prepare input =====
-                camera = env.engine.get_sensor("rgb_camera")
-                rgb_front = camera.perceive(
-                    to_float=config['norm_pixel'], new_parent_node=env.agent.origin, position=[0, -7, 1.0], hpr=[0, 0, 0]
+                # the three cameras are rendered in one frame
+                pose = (env.agent.origin, [0, -7, 1.0], [0, 0, 0])
+                rgb_front, depth_front, semantic_front = env.engine.sensor_scheduler.capture(
+                    [(sensor, *pose) for sensor in ["rgb_camera", "depth_camera", "semantic_camera"]],
+                    to_float=config['norm_pixel']
                 )
                 max_rgb_value = rgb_front.max()
                 rgb = rgb_front[..., ::-1]
@@ -327,20 +329,13 @@ if __name__ == "__main__":
                 else:
                     rgb = (rgb * 255).astype(np.uint8)
 
-                camera = env.engine.get_sensor("depth_camera")
-                depth_front = camera.perceive(
-                    to_float=config['norm_pixel'], new_parent_node=env.agent.origin, position=[0, -7, 1.0], hpr=[0, 0, 0]
-                ).reshape(576, 1024, -1)[..., -1]
+                depth_front = depth_front.reshape(576, 1024, -1)[..., -1]
                 depth = depth_front
                 depth_normalized = cv2.normalize(depth, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
                 depth_colored = cv2.applyColorMap(depth_normalized, cv2.COLORMAP_JET)
                 depth_img = cv2.bitwise_not(depth_front)
                 depth_img = depth_img[..., None]
 
-                camera = env.engine.get_sensor("semantic_camera")
-                semantic_front = camera.perceive(
-                    to_float=config['norm_pixel'], new_parent_node=env.agent.origin, position=[0, -7, 1.0], hpr=[0, 0, 0]
-                )
                 max_rgb_value = semantic_front.max()
                 semantic = semantic_front
                 if max_rgb_value > 1:
@@ -0,0 +1,159 @@
+"""
+All asset metainfo files of the adj_parameter_folder compiled to one JSON lines manifest. The first line is a header
+with the manifest version, the modification time of each directory and a hash of the whole content, and each following
+line holds one metainfo file with its relative path, mtime, size and content. Reading the manifest replaces walking the
+folder and parsing every file, which takes seconds on network filesystems.
+
+The manifest is checked against the folder with one stat per directory and per file. Added or removed files change the
+mtime of their directory, which triggers a new listing of the folder, and modified files are parsed again. Other
+entries are reused and the manifest is rewritten when anything changed.
+
+Build it in advance with: python -m metaurban.manager.asset_manifest
+"""
+import argparse
+import hashlib
+import json
+import os
+
+from metaurban.engine.logger import get_logger
+
+logger = get_logger()
+
+MANIFEST_VERSION = 1
+
+# folder -> list of (relative path, metainfo), loaded once per process
+_metainfos = {}
+
+
+def get_manifest_path(folder):
+    """
+    The manifest is stored next to the folder, so that it is not mistaken for a metainfo file
+    """
+    folder = os.path.abspath(folder)
+    return os.path.join(os.path.dirname(folder), "{}_manifest.jsonl".format(os.path.basename(folder)))
+
+
+def _read_manifest(manifest_path):
+    if not os.path.isfile(manifest_path):
+        return None, {}
+    try:
+        with open(manifest_path, "r") as file:
+            header = json.loads(file.readline())
+            entries = {}
+            for line in file:
+                entry = json.loads(line)
+                entries[entry["file"]] = entry
+    except (ValueError, KeyError) as e:
+        logger.warning("Asset manifest {} is broken and will be rebuilt: {}".format(manifest_path, e))
+        return None, {}
+    if header.get("version") != MANIFEST_VERSION:
+        return None, {}
+    return header, entries
+
+
+def _write_manifest(manifest_path, header, entries):
+    tmp_path = "{}.{}.tmp".format(manifest_path, os.getpid())
+    try:
+        with open(tmp_path, "w") as file:
+            file.write(json.dumps(header) + "\n")
+            for entry in entries:
+                file.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, manifest_path)
+    except OSError as e:
+        logger.warning("Fail to write asset manifest {}: {}".format(manifest_path, e))
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _get_directory_mtimes(folder, directories):
+    """
+    Return None if a directory is missing
+    """
+    mtimes = {}
+    for directory in directories:
+        try:
+            mtimes[directory] = os.stat(os.path.join(folder, directory)).st_mtime_ns
+        except OSError:
+            return None
+    return mtimes
+
+
+def _load_entry(folder, file_name, stat):
+    with open(os.path.join(folder, file_name), "rb") as file:
+        content = file.read()
+    return dict(
+        file=file_name,
+        mtime=stat.st_mtime_ns,
+        size=stat.st_size,
+        sha1=hashlib.sha1(content).hexdigest(),
+        metainfo=json.loads(content)
+    )
+
+
+def load_manifest(folder, manifest_path=None, rebuild=False):
+    """
+    Load the manifest of the folder, updating and rewriting it if the folder changed
+    :param folder: the folder of asset metainfo files, i.e. path_config["adj_parameter_folder"]
+    :param manifest_path: default to get_manifest_path(folder)
+    :param rebuild: ignore the existing manifest
+    :return: header and list of entries, in the order of os.walk
+    """
+    folder = os.path.abspath(folder)
+    manifest_path = manifest_path or get_manifest_path(folder)
+    header, old_entries = (None, {}) if rebuild else _read_manifest(manifest_path)
+
+    directory_mtimes = header and _get_directory_mtimes(folder, header["directories"])
+    if directory_mtimes is not None and directory_mtimes == header["directories"]:
+        # no file was added or removed, keep the order of the manifest
+        files = list(old_entries.keys())
+    else:
+        files, directory_mtimes = [], {}
+        for root, dirs, file_names in os.walk(folder):
+            directory = os.path.relpath(root, folder)
+            directory_mtimes[directory] = os.stat(root).st_mtime_ns
+            files += [os.path.normpath(os.path.join(directory, file_name)) for file_name in file_names]
+
+    entries, changed = [], header is None or len(files) != len(old_entries)
+    for file_name in files:
+        stat = os.stat(os.path.join(folder, file_name))
+        entry = old_entries.get(file_name)
+        if entry is None or entry["mtime"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+            entry = _load_entry(folder, file_name, stat)
+            changed = True
+        entries.append(entry)
+
+    if changed or directory_mtimes != header["directories"]:
+        content_hash = hashlib.sha1()
+        for entry in entries:
+            content_hash.update("{}:{}\n".format(entry["file"], entry["sha1"]).encode("utf-8"))
+        header = dict(version=MANIFEST_VERSION, directories=directory_mtimes, hash=content_hash.hexdigest())
+        _write_manifest(manifest_path, header, entries)
+        logger.debug("Asset manifest {} is updated, {} files".format(manifest_path, len(entries)))
+    return header, entries
+
+
+def get_asset_metainfos(folder):
+    """
+    All metainfo files of the folder as a list of (relative path, metainfo). The manifest is loaded once per process
+    and shared by all callers, so copy the metainfo before modifying it.
+    """
+    folder = os.path.abspath(folder)
+    if folder not in _metainfos:
+        _, entries = load_manifest(folder)
+        _metainfos[folder] = [(entry["file"], entry["metainfo"]) for entry in entries]
+    return _metainfos[folder]
+
+
+def clear_asset_metainfos():
+    _metainfos.clear()
+
+
+if __name__ == '__main__':
+    from metaurban.manager.read_config import configReader
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--folder", default=None, help="Metainfo folder, default to the adj_parameter_folder")
+    parser.add_argument("--rebuild", action="store_true", help="Ignore the existing manifest")
+    args = parser.parse_args()
+    folder = args.folder or configReader().loadPath()["adj_parameter_folder"]
+    header, entries = load_manifest(folder, rebuild=args.rebuild)
+    logger.info("Asset manifest {}: {} files, hash {}".format(get_manifest_path(folder), len(entries), header["hash"]))
@@ -9,7 +9,7 @@ from metaurban.component.road_network import Road
 from metaurban.manager.base_manager import BaseManager
 from metaurban.policy.orca_planner import OrcaPlanner
 import metaurban.policy.orca_planner_utils as orca_planner_utils
-from metaurban.policy.get_planning import get_planning
+from metaurban.policy.get_planning import PlanningSimulation
 from metaurban.engine.logger import get_logger
 logger = get_logger()
 
@@ -102,6 +102,7 @@ class PGBackgroundSidewalkAssetsManager(BaseManager):
         self.walkable_regions_mask = None
         self.start_points = None
         self.end_points = None
+        self.planning = None
         self.mask_delta = 2
 
         self.spawn_num = self.engine.global_config["spawn_human_num"] + \
@@ -139,13 +140,9 @@ class PGBackgroundSidewalkAssetsManager(BaseManager):
         self.start_points, self.end_points = self.random_start_and_end_points(
             self.walkable_regions_mask[:, :, 0], self.spawn_num + self.d_robot_num
         )
-        time_length, points, speed, early_stop_points = get_planning(
-            [self.start_points], [self.walkable_regions_mask], [self.end_points], [len(self.start_points)], 1
+        self.planning = PlanningSimulation(
+            self.start_points, self.end_points, self.walkable_regions_mask, map_seed=self.engine.global_seed
         )
-        self.points = iter(points[0])
-        self.time_length = time_length[0]
-        self.speeds = iter(speed[0])
-        self.es_points = early_stop_points[0]
         # spawn humanoids
         assert self.mode == HumanoidMode.Trigger
         self._create_humanoids_once(current_map, self.spawn_num, self.max_actor_num)
@@ -178,21 +175,17 @@ class PGBackgroundSidewalkAssetsManager(BaseManager):
             return
 
         try:
-            positions, speeds = next(self.points), next(self.speeds)
-        except:
+            positions, speeds = next(self.planning)
+        except StopIteration:
             import copy
             self.start_points = copy.deepcopy(self.end_points)
             _, self.end_points = self.random_start_and_end_points(
                 self.walkable_regions_mask[:, :, 0], self.spawn_num + self.d_robot_num
             )
-            time_length, points, speed, early_stop_points = get_planning(
-                [self.start_points], [self.walkable_regions_mask], [self.end_points], [len(self.start_points)], 1
+            self.planning = PlanningSimulation(
+                self.start_points, self.end_points, self.walkable_regions_mask, map_seed=self.engine.global_seed
             )
-            self.points = iter(points[0])
-            self.time_length = time_length[0]
-            self.speeds = iter(speed[0])
-            self.es_points = early_stop_points[0]
-            positions, speeds = next(self.points), next(self.speeds)
+            positions, speeds = next(self.planning)
         for v, pos, speed in zip(self._traffic_humanoids, positions, speeds):
             pos = self._to_block_coordinate(pos)  ####
             prev_pos = v.position
@@ -220,133 +213,15 @@ class PGBackgroundSidewalkAssetsManager(BaseManager):
         self.sidewalks_farfrom_road_buffer = current_map.sidewalks_farfrom_road_buffer
         self.valid_region = current_map.valid_region
 
-        polygons = []
-        for sidewalk in self.sidewalks.keys():
-            # if "SDW_I_" in sidewalk: continue
-            polygon = self.sidewalks[sidewalk]['polygon']
-            polygons += polygon
-        for crosswalk in self.crosswalks.keys():
-            # if "CRS_I_" in crosswalk: continue
-            polygon = self.crosswalks[crosswalk]['polygon']
-            polygons += polygon
-
-        for sidewalk in self.sidewalks_near_road_buffer.keys():
-            polygon = self.sidewalks_near_road_buffer[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.sidewalks_near_road.keys():
-            polygon = self.sidewalks_near_road[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.sidewalks_farfrom_road.keys():
-            polygon = self.sidewalks_farfrom_road[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.sidewalks_farfrom_road_buffer.keys():
-            polygon = self.sidewalks_farfrom_road_buffer[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.valid_region.keys():
-            polygon = self.valid_region[sidewalk]['polygon']
-            polygons += polygon
-
-        polygon_array = np.array(polygons)
-        min_x = np.min(polygon_array[:, 0])
-        max_x = np.max(polygon_array[:, 0])
-        min_y = np.min(polygon_array[:, 1])
-        max_y = np.max(polygon_array[:, 1])
-
-        rows = math.ceil(max_y - min_y) + 2 * self.mask_delta
-        columns = math.ceil(max_x - min_x) + 2 * self.mask_delta
-
-        self.mask_translate = np.array([-min_x + self.mask_delta, -min_y + self.mask_delta])
+        walkable_regions_mask, self.mask_translate = current_map.get_walkable_regions_mask(
+            walkable=current_map.WALKABLE_REGIONS[:-1], mask_delta=self.mask_delta
+        )
         if hasattr(self.engine, 'walkable_regions_mask'):
             return self.engine.walkable_regions_mask
-
-        walkable_regions_mask = np.zeros((rows, columns, 3), np.uint8)
-
-        for sidewalk in self.sidewalks.keys():
-            # if "SDW_I_" in sidewalk: continue
-            polygon_array = np.array(self.sidewalks[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-
-        for crosswalk in self.crosswalks.keys():
-            # if "SDW_I_" in sidewalk: continue
-            polygon_array = np.array(self.crosswalks[crosswalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-
-        for sidewalk in self.sidewalks_near_road_buffer.keys():
-            polygon_array = np.array(self.sidewalks_near_road_buffer[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-        for sidewalk in self.sidewalks_near_road.keys():
-            polygon_array = np.array(self.sidewalks_near_road[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-        for sidewalk in self.sidewalks_farfrom_road.keys():
-            polygon_array = np.array(self.sidewalks_farfrom_road[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-        for sidewalk in self.sidewalks_farfrom_road_buffer.keys():
-            polygon_array = np.array(self.sidewalks_farfrom_road_buffer[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-        walkable_regions_mask = cv2.flip(walkable_regions_mask, 0)  ### flip for orca   ######
-        # cv2.imwrite('1111.png', walkable_regions_mask)
-
         return walkable_regions_mask
 
     def _random_points_new(self, map_mask, num, min_dis=5):
-        import matplotlib.pyplot as plt
-        from scipy.signal import convolve2d
-        import random
-        from skimage import measure
-        h, _ = map_mask.shape
-        import metaurban.policy.orca_planner_utils as orca_planner_utils
-        mylist, h, w = orca_planner_utils.mask_to_2d_list(map_mask)
-        contours = measure.find_contours(mylist, 0.5, positive_orientation='high')
-        flipped_contours = []
-        for contour in contours:
-            contour = orca_planner_utils.find_tuning_point(contour, h)
-            flipped_contours.append(contour)
-        int_points = []
-        for p in flipped_contours:
-            for m in p:
-                int_points.append((int(m[1]), int(m[0])))
-
-        def find_walkable_area(map_mask):
-            kernel = np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]], dtype=np.uint8)
-            conv_result = convolve2d(map_mask / 255, kernel, mode='same')
-            ct_pts = np.where(conv_result == 8)  #8, 24
-            ct_pts = list(zip(ct_pts[1], ct_pts[0]))
-            ct_pts = [c for c in ct_pts if c not in int_points]
-            return ct_pts
-
-        selected_pts = []
-        walkable_pts = find_walkable_area(map_mask)
-        random.shuffle(walkable_pts)
-        if len(walkable_pts) < num:
-            raise ValueError(" Walkable points are less than spawn number! ")
-        try_time = 0
-        while len(selected_pts) < num:
-            if try_time > 10000:
-                raise ValueError("Try too many time to get valid humanoid points!")
-            cur_pt = random.choice(walkable_pts)
-            if all(math.dist(cur_pt, selected_pt) >= min_dis for selected_pt in selected_pts):
-                selected_pts.append(cur_pt)
-            try_time += 1
-        selected_pts = [(x[0], h - 1 - x[1]) for x in selected_pts]
-        return selected_pts
+        return orca_planner_utils.sample_walkable_points(map_mask, num, min_dis)
 
     def _random_points(self, map_mask, num):
         def in_walkable_area(x):
@@ -1,10 +1,12 @@
 # manager that adds items (currently pedestrian) on the sidewalk.
 # Note: currently you need to change path in the init function.
+import copy
 import math
 import os
 from collections import defaultdict
 from random import sample
 from metaurban.manager.read_config import configReader
+from metaurban.manager.asset_manifest import get_asset_metainfos
 from metaurban.component.pgblock.first_block import FirstPGBlock
 from metaurban.component.static_object.test_new_object import TestObject
 from metaurban.engine.engine_utils import get_engine
@@ -59,20 +61,25 @@ class GridCell:
 class ObjectPlacer:
     """
     This class is used to place objects on a grid, ensuring that they do not overlap.
+    The occupancy is kept as a boolean array, and the positions where an object fits are found at once with a
+    summed-area table of the occupancy, instead of checking the cells under each candidate position one by one.
     """
+    # number of candidate rows evaluated at first when searching for a position, doubled after each miss
+    MIN_CHUNK_ROWS = 8
+
     def __init__(self, grid):
         """
         Args:
-            grid (list): A 2D list of GridCell objects representing the placement grid.
-            
-            Example:
-            grid = [
-                [GridCell(), GridCell(), GridCell()],
-                [GridCell(), GridCell(), GridCell()],
-                [GridCell(), GridCell(), GridCell()]
-            ]
+            grid (np.ndarray or list): A (num_long, num_lat) boolean occupancy array, as returned by
+                AssetManager.create_grid, or a 2D list of GridCell objects representing the placement grid.
         """
-        self.grid = grid
+        if isinstance(grid, np.ndarray):
+            self.occupancy = grid.astype(bool)
+        else:
+            width = len(grid[0]) if len(grid) > 0 else 0
+            self.occupancy = np.array([[cell.is_occupied() for cell in row] for row in grid],
+                                      dtype=bool).reshape(len(grid), width)
+        self.buffer = 0
         # Dictionary to store the objects that have been placed, with their positions
         # Keys are tuples (object_id, position), values are tuples (position, object)
         self.placed_objects = {}
@@ -111,97 +118,111 @@ class ObjectPlacer:
     def find_placement_position(self, obj, last_long=None):
         """
         Find a position on the grid where the object can be placed.
-        For now, we just return the top-left position where the object can be placed.
+        The candidate top-left positions are scanned in the order given by obj['obj_generation_mode'], and the first one
+        where the object fits is returned.
         Args:
             obj (dict): The object to be placed, with properties like length and width.
         Returns:
             tuple: The top-left position where the object can be placed, or None if no position is found.
         """
-        if 'obj_generation_mode' in obj:
-            if obj['obj_generation_mode'] == 'parallel_only':
-                if last_long is not None:
-                    assert 'spawn_long_gap' in obj
-                    for i in range(last_long + obj['spawn_long_gap'], len(self.grid)):
-                        for j in range(1):
-                            if self.can_place(i + 1, j + 1, obj):
-                                return (i + 1, j + 1)  # Top-left position where the object can be placed
-                    return None
-
-                for i in range(len(self.grid)):
-                    for j in range(1):
-                        if self.can_place(i + 1, j + 1, obj):
-                            return (i + 1, j + 1)  # Top-left position where the object can be placed
-
-                return None
-
-            if obj['obj_generation_mode'] == 'normal':
-                if last_long is not None:
-                    assert 'spawn_long_gap' in obj
-                    for i in range(last_long + obj['spawn_long_gap'], len(self.grid)):
-                        for j in range(len(self.grid[i])):
-                            if self.can_place(i + 1, j + 1, obj):
-                                return (i + 1, j + 1)  # Top-left position where the object can be placed
-                    return None
-
-                for i in range(len(self.grid)):
-                    for j in range(len(self.grid[i])):
-                        if self.can_place(i + 1, j + 1, obj):
-                            return (i + 1, j + 1)  # Top-left position where the object can be placed
-
-            if obj['obj_generation_mode'] == 'random_start':
-                if last_long is not None:
-                    assert 'spawn_long_gap' in obj
-                    if last_long + obj['spawn_long_gap'] >= len(self.grid) - 5:
-                        return None
-                    start_long = np.random.randint(
-                        last_long + obj['spawn_long_gap'],
-                        min(len(self.grid) - 5, last_long + obj['spawn_long_gap'] + 1), 1
-                    )[0]
-                    start_lat = np.random.randint(0, max(len(self.grid[0]) - 10, 1), 1)[0]
-                    for i in range(start_long, len(self.grid)):
-                        for j in range(start_lat, len(self.grid[i])):
-                            if self.can_place(i + 1, j + 1, obj):
-                                return (i + 1, j + 1)  # Top-left position where the object can be placed
-                    return None
-
-                start_long = np.random.randint(0, max(len(self.grid) - 10, 1), 1)[0]
-                start_lat = np.random.randint(0, max(len(self.grid[0]) - 10, 1), 1)[0]
-                for i in range(start_long, len(self.grid)):
-                    for j in range(start_lat, len(self.grid[i])):
-                        return (i + 1, j + 1)  # Top-left position where the object can be placed
+        num_long, num_lat = self.occupancy.shape
+        mode = obj.get('obj_generation_mode', 'normal')
+        if mode not in ['parallel_only', 'normal', 'random_start', 'inverse']:
+            return None
+        if last_long is not None:
+            assert 'spawn_long_gap' in obj
+            start_long = last_long + obj['spawn_long_gap']
 
-                return None
+        if mode == 'parallel_only':
+            # only the first lateral position
+            if last_long is not None:
+                return self._first_fit(obj, (start_long + 1, num_long + 1), (1, 2))
+            return self._first_fit(obj, (1, num_long + 1), (1, 2))
 
-            if obj['obj_generation_mode'] == 'inverse':
-                if last_long is not None:
-                    assert 'spawn_long_gap' in obj
-                    for i in range(len(self.grid) - 1, last_long + obj['spawn_long_gap'], -1):
-                        for j in range(len(self.grid[i]) - 1, 0, -1):
-                            if self.can_place(i + 1, j + 1, obj):
-                                return (i + 1, j + 1)  # Top-left position where the object can be placed
+        if mode == 'random_start':
+            if last_long is not None:
+                if start_long >= num_long - 5:
                     return None
+                start_long = np.random.randint(start_long, min(num_long - 5, start_long + 1), 1)[0]
+                start_lat = np.random.randint(0, max(num_lat - 10, 1), 1)[0]
+                return self._first_fit(obj, (start_long + 1, num_long + 1), (start_lat + 1, num_lat + 1))
+
+            # the random position is returned as is, without checking the occupancy
+            start_long = np.random.randint(0, max(num_long - 10, 1), 1)[0]
+            start_lat = np.random.randint(0, max(num_lat - 10, 1), 1)[0]
+            if start_long < num_long and start_lat < num_lat:
+                return (int(start_long) + 1, int(start_lat) + 1)
+            return None
 
-                for i in range(len(self.grid)):
-                    for j in range(len(self.grid[i])):
-                        if self.can_place(i + 1, j + 1, obj):
-                            return (i + 1, j + 1)  # Top-left position where the object can be placed
+        if mode == 'inverse' and last_long is not None:
+            # from the end of the grid back to the last position, the first lateral position is never used
+            return self._first_fit(obj, (start_long + 2, num_long + 1), (2, num_lat + 1), reverse=True)
 
-                return None
-        else:
-            if last_long is not None:
-                assert 'spawn_long_gap' in obj
-                for i in range(last_long + obj['spawn_long_gap'], len(self.grid)):
-                    for j in range(len(self.grid[i])):
-                        if self.can_place(i + 1, j + 1, obj):
-                            return (i + 1, j + 1)  # Top-left position where the object can be placed
-                return None
+        # normal, and inverse without a last position
+        if last_long is not None:
+            return self._first_fit(obj, (start_long + 1, num_long + 1), (1, num_lat + 1))
+        return self._first_fit(obj, (1, num_long + 1), (1, num_lat + 1))
 
-            for i in range(len(self.grid)):
-                for j in range(len(self.grid[i])):
-                    if self.can_place(i + 1, j + 1, obj):
-                        return (i + 1, j + 1)  # Top-left position where the object can be placed
+    def _span(self, obj):
+        """
+        The number of cells the object spans along and across the lane, with the buffer around it
+        """
+        # Define the size of each cell (in meters, for example)
+        cell_length = 1  # Length of each cell in meters
+        cell_width = 1  # Width of each cell in meters
+        span_length = math.ceil(obj['general']['length'] / cell_length) + self.buffer
+        span_width = math.ceil(obj['general']['width'] / cell_width) + self.buffer
+        return span_length, span_width
 
-            return None
+    def _fit_mask(self, span, i_start, i_end, j_start, j_end):
+        """
+        Boolean array whose element (i, j) tells if an object spanning span=(span_length, span_width) cells fits with
+        its top-left corner at (i_start + i, j_start + j), computed with a summed-area table of the cells under these
+        positions.
+        """
+        span_length, span_width = span
+        occupancy = self.occupancy[i_start:i_end + span_length - 1, j_start:j_end + span_width - 1]
+        integral = np.zeros((occupancy.shape[0] + 1, occupancy.shape[1] + 1), dtype=np.int32)
+        np.cumsum(np.cumsum(occupancy, axis=0, dtype=np.int32), axis=1, out=integral[1:, 1:])
+        num_i, num_j = i_end - i_start, j_end - j_start
+        occupied = (
+            integral[span_length:, span_width:] - integral[:num_i, span_width:] - integral[span_length:, :num_j] +
+            integral[:num_i, :num_j]
+        )
+        return occupied == 0
+
+    def _first_fit(self, obj, long_range, lat_range, reverse=False):
+        """
+        The first top-left position in [long_range[0], long_range[1]) x [lat_range[0], lat_range[1]) where the object
+        fits, scanned row by row. With reverse=True, the rows and the cells in each row are scanned backward.
+        The rows are evaluated by chunks of growing size, so that the search stops early when a position is found.
+        """
+        span = span_length, span_width = self._span(obj)
+        i_start = max(int(long_range[0]), 0)
+        i_end = min(int(long_range[1]), self.occupancy.shape[0] - span_length + 1)
+        j_start = max(int(lat_range[0]), 0)
+        j_end = min(int(lat_range[1]), self.occupancy.shape[1] - span_width + 1)
+        chunk_rows = self.MIN_CHUNK_ROWS
+        while i_start < i_end and j_start < j_end:
+            if reverse:
+                chunk_start, chunk_end = max(i_end - chunk_rows, i_start), i_end
+            else:
+                chunk_start, chunk_end = i_start, min(i_start + chunk_rows, i_end)
+            candidates = self._fit_mask(span, chunk_start, chunk_end, j_start, j_end)
+            if reverse:
+                candidates = candidates[::-1, ::-1]
+            index = np.argmax(candidates)
+            i, j = divmod(int(index), candidates.shape[1])
+            if candidates[i, j]:
+                if reverse:
+                    return (chunk_end - 1 - i, j_end - 1 - j)
+                return (chunk_start + i, j_start + j)
+            if reverse:
+                i_end = chunk_start
+            else:
+                i_start = chunk_end
+            chunk_rows *= 2
+        return None
 
     def can_place(self, start_i, start_j, obj):
         """
@@ -214,28 +235,14 @@ class ObjectPlacer:
         Returns:
             bool: True if the object can be placed, False otherwise.
         """
-        # Define the size of each cell (in meters, for example)
-        cell_length = 1  # Length of each cell in meters
-        cell_width = 1  # Width of each cell in meters
-
-        # Calculate the number of cells the object spans, rounding up
-        # Note we add 2 to the span to create a buffer around the object
-        span_length = math.ceil(obj['general']['length'] / cell_length) + self.buffer
-        span_width = math.ceil(obj['general']['width'] / cell_width) + self.buffer
-        # span_length = math.ceil(obj['general']['width'] / cell_width) + 2
-        # span_width = math.ceil(obj['general']['length'] / cell_length) + 2
+        span_length, span_width = self._span(obj)
 
         # Check if the object fits within the grid bounds
-        if start_i + span_length > len(self.grid) or start_j + span_width > len(self.grid[0]):
+        if start_i + span_length > self.occupancy.shape[0] or start_j + span_width > self.occupancy.shape[1]:
             return False
 
         # Check for any overlaps with existing objects
-        for i in range(start_i, start_i + span_length):
-            for j in range(start_j, start_j + span_width):
-                if self.grid[i][j].is_occupied():
-                    return False
-
-        return True
+        return not self.occupancy[start_i:start_i + span_length, start_j:start_j + span_width].any()
 
     def mark_occupied_cells(self, start_position, obj):
         """
@@ -247,17 +254,8 @@ class ObjectPlacer:
             Nothing, directly marks the cells as occupied.
         """
         start_i, start_j = start_position
-        cell_length = 1  # Length of each cell in meters
-        cell_width = 1  # Width of each cell in meters
-
-        # Calculate the number of cells the object spans, rounding up
-        span_length = math.ceil(obj['general']['length'] / cell_length) + self.buffer
-        span_width = math.ceil(obj['general']['width'] / cell_width) + self.buffer
-
-        # Mark the occupied cells
-        for i in range(start_i, start_i + span_length):
-            for j in range(start_j, start_j + span_width):
-                self.grid[i][j].occupy(obj)
+        span_length, span_width = self._span(obj)
+        self.occupancy[start_i:start_i + span_length, start_j:start_j + span_width] = True
 
     def is_placement_possible(self):
         """
@@ -266,11 +264,7 @@ class ObjectPlacer:
         Returns:
             bool: True if there is space available, False otherwise.
         """
-        for i in range(len(self.grid)):
-            for j in range(len(self.grid[i])):
-                if not self.grid[i][j].is_occupied():
-                    return True
-        return False
+        return not self.occupancy.all()
 
 
 class AssetManager(BaseManager):
@@ -295,6 +289,17 @@ class AssetManager(BaseManager):
 
         self.all_object_polygons = []
 
+        # The placement is deterministic given the seed, the object density and the asset metainfo, so the layout
+        # computed for a seed is cached and replayed when this seed is used again
+        self.asset_set_key = tuple(
+            sorted(
+                (detail_type, tuple(obj['filename'] for obj in objects))
+                for detail_type, objects in self.type_metainfo_dict.items()
+            )
+        )
+        self.layout_cache = {}
+        self._layout = None
+
     def init_regular_objects(self):
 
         # regular objects
@@ -390,13 +395,12 @@ class AssetManager(BaseManager):
         # The key is the detail type, the value is a list of metainfo dictionaries
         # For example, key is bicycle, value is a list of metainfo dictionaries for all bicycle objects
         self.type_metainfo_dict = defaultdict(list)
-        for root, dirs, files in os.walk(self.path_config["adj_parameter_folder"]):
-            for file in files:
-                # We only load the metainfo for static objects, skip cars
-                if not file.lower().startswith("car"):
-                    with open(os.path.join(root, file), 'r') as f:
-                        loaded_metainfo = json.load(f)
-                        self.type_metainfo_dict[loaded_metainfo['general']['detail_type']].append(loaded_metainfo)
+        # The metainfo is read from the manifest shared by all managers, copy it as it is modified later
+        for file, metainfo in get_asset_metainfos(self.path_config["adj_parameter_folder"]):
+            # We only load the metainfo for static objects, skip cars
+            if not os.path.basename(file).lower().startswith("car"):
+                loaded_metainfo = copy.deepcopy(metainfo)
+                self.type_metainfo_dict[loaded_metainfo['general']['detail_type']].append(loaded_metainfo)
         number = 0
         for k, v in self.type_metainfo_dict.items():
             number += len(v)
@@ -464,12 +468,81 @@ class AssetManager(BaseManager):
         torch.cuda.manual_seed(seed)
         torch.cuda.manual_seed_all(seed)
 
+        assert len(self.spawned_objects.keys()) == 0
+        layout_key = (seed, self.density, self.asset_set_key)
+        if layout_key in self.layout_cache:
+            self.replay_layout(self.layout_cache[layout_key])
+        else:
+            self._layout = []
+            self.generate_layout()
+            layout = self.get_layout() if self.engine.global_config["cache_asset_layout"] else None
+            if layout is not None:
+                self.layout_cache[layout_key] = layout
+            self._layout = None
+
+        self.engine.objects_counts = self.count
+        self._get_walkable_regions(self.current_map)
+
+    def get_layout(self):
+        """
+        The layout generated by the last reset, which can be replayed by replay_layout() on the same map. It is None if
+        an object is spawned on a lane that can not be found in the road network by its index.
+        Returns:
+            dict: The spawned objects as (asset_metainfo, lane_index, position, heading_theta, region) tuples, the
+            object polygons, the placed types and the state of the random generators after the placement.
+        """
+        road_network = self.current_map.road_network
+        for _, lane_index, _, _, _ in self._layout:
+            try:
+                road_network.get_lane(lane_index)
+            except (KeyError, IndexError):
+                return None
+        return dict(
+            objects=self._layout,
+            object_polygons=self.all_object_polygons,
+            placed_types=copy.deepcopy(getattr(self, 'placed_types', {})),
+            random_state=random.getstate(),
+            np_random_state=np.random.get_state(),
+        )
+
+    def replay_layout(self, layout):
+        """
+        Spawn the objects of a layout returned by get_layout(), instead of placing them on the sidewalk grids again.
+        """
+        road_network = self.current_map.road_network
+        for asset_metainfo, lane_index, position, heading_theta, region in layout["objects"]:
+            self.spawn_asset(road_network.get_lane(lane_index), position, heading_theta, asset_metainfo, region)
+        self.count = len(layout["objects"])
+        self.all_object_polygons = list(layout["object_polygons"])
+        self.placed_types = copy.deepcopy(layout["placed_types"])
+        random.setstate(layout["random_state"])
+        np.random.set_state(layout["np_random_state"])
+
+    def spawn_asset(self, lane, position, heading_theta, asset_metainfo, region):
+        """
+        Spawn an object placed on the sidewalk and record it in the layout of this reset.
+        """
+        self.spawn_object(
+            TestObject,
+            force_spawn=True,
+            lane=lane,
+            position=position,
+            static=self.engine.global_config["static_traffic_object"],
+            heading_theta=heading_theta,
+            asset_metainfo=asset_metainfo
+        )
+        if self._layout is not None:
+            self._layout.append((asset_metainfo, lane.index, position, heading_theta, region))
+
+    def generate_layout(self):
+        """
+        Place objects on the grids of each sidewalk region of each block and spawn them.
+        """
         self.generated_lane = []
 
         self.count = 0
         self.all_object_polygons = []
         engine = get_engine()
-        assert len(self.spawned_objects.keys()) == 0
         # Iterate over all blocks in the current map (The blocks are the straight road segments in the map)
         # TODO: block by block
         for block in engine.current_map.blocks:
@@ -712,15 +785,9 @@ class AssetManager(BaseManager):
                                 self.calculate_lateral_range(region, lane, width_list, self.sidewalk_type)
                             )
                             self.count += 1
-                            self.spawn_object(
-                                TestObject,
-                                force_spawn=True,
-                                lane=lane,
-                                position=lane_position,
-                                static=self.engine.global_config["static_traffic_object"],
-                                heading_theta=lane.heading_theta_at(lane_position[0]) +
-                                obj['general'].get('heading', 0),
-                                asset_metainfo=obj
+                            self.spawn_asset(
+                                lane, lane_position,
+                                lane.heading_theta_at(lane_position[0]) + obj['general'].get('heading', 0), obj, region
                             )
 
                             polygon = []
@@ -1050,15 +1117,9 @@ class AssetManager(BaseManager):
 
                             self.count += 1
 
-                            self.spawn_object(
-                                TestObject,
-                                force_spawn=True,
-                                lane=lane,
-                                position=lane_position,
-                                static=self.engine.global_config["static_traffic_object"],
-                                heading_theta=lane.heading_theta_at(lane_position[0]) +
-                                obj['general'].get('heading', 0),
-                                asset_metainfo=obj
+                            self.spawn_asset(
+                                lane, lane_position,
+                                lane.heading_theta_at(lane_position[0]) + obj['general'].get('heading', 0), obj, region
                             )
 
                             polygon = []
@@ -1391,15 +1452,9 @@ class AssetManager(BaseManager):
                             )
                             self.count += 1
 
-                            self.spawn_object(
-                                TestObject,
-                                force_spawn=True,
-                                lane=lane,
-                                position=lane_position,
-                                static=self.engine.global_config["static_traffic_object"],
-                                heading_theta=lane.heading_theta_at(lane_position[0]) +
-                                obj['general'].get('heading', 0),
-                                asset_metainfo=obj
+                            self.spawn_asset(
+                                lane, lane_position,
+                                lane.heading_theta_at(lane_position[0]) + obj['general'].get('heading', 0), obj, region
                             )
 
                             polygon = []
@@ -1422,7 +1477,7 @@ class AssetManager(BaseManager):
                                     point = lane.position(longitude, lateral)
                                     polygon.append([point[0], point[1]])
                             self.all_object_polygons.append(polygon)
-            
+
             if block.ID == 'C':
 
                 self.block_type = 'C'
@@ -1687,15 +1742,9 @@ class AssetManager(BaseManager):
                             )
                             self.count += 1
 
-                            self.spawn_object(
-                                TestObject,
-                                force_spawn=True,
-                                lane=lane,
-                                position=lane_position,
-                                static=self.engine.global_config["static_traffic_object"],
-                                heading_theta=lane.heading_theta_at(lane_position[0]) +
-                                obj['general'].get('heading', 0),
-                                asset_metainfo=obj
+                            self.spawn_asset(
+                                lane, lane_position,
+                                lane.heading_theta_at(lane_position[0]) + obj['general'].get('heading', 0), obj, region
                             )
 
                             polygon = []
@@ -1719,9 +1768,6 @@ class AssetManager(BaseManager):
                                     polygon.append([point[0], point[1]])
                             self.all_object_polygons.append(polygon)
 
-        self.engine.objects_counts = self.count
-        self._get_walkable_regions(self.current_map)
-
     def create_grid(self, lane, lateral_range):
         """
         Create a grid for a given lane and lateral range.
@@ -1729,7 +1775,7 @@ class AssetManager(BaseManager):
             lane (Lane): The lane object.
             lateral_range (tuple): The start and end of the lateral range for the grid.
         Returns:
-            list: A 2D list of GridCell objects representing the grid."""
+            np.ndarray: A (num_cells_long, num_cells_lat) boolean array, True for the occupied cells."""
         # Define the size of each cell (in meters, for example)
         cell_length = 1  # Length of a cell along the lane
         cell_width = 1  # Width of a cell across the lane
@@ -1742,13 +1788,9 @@ class AssetManager(BaseManager):
             num_cells_long = int((lane.length + PGDrivableAreaProperty.SIDEWALK_LENGTH) / cell_length)
         num_cells_lat = int((lateral_range[1] - lateral_range[0]) / cell_width)
 
-        # Create the grid as a 2D array of GridCell objects
-        grid = [
-            [GridCell(position=(i * cell_length, j * cell_width + lateral_range[0])) for j in range(num_cells_lat)]
-            for i in range(num_cells_long)
-        ]
-
-        return grid
+        # Create the grid as an occupancy array
+        # the cell (i, j) is at (i * cell_length, j * cell_width + lateral_range[0]) in the lane coordinates
+        return np.zeros((max(num_cells_long, 0), max(num_cells_lat, 0)), dtype=bool)
 
     def retrieve_target_object_for_region(
         self, region, object_placer, obj_detail_type=None, obj_generation_mode=None, delta_scale=None
@@ -1979,14 +2021,13 @@ class AssetManager(BaseManager):
         """
         Visualize the grid by printing it to the console.
         Args:
-            grid (list): A 2D list of GridCell objects representing the grid.
+            grid (np.ndarray): A boolean occupancy array, such as ObjectPlacer.occupancy.
         Returns:
             Nothing, directly prints the grid to the console.
         """
         for row in grid:
             for cell in row:
-                # Assuming each cell has a method 'is_occupied' to check if it's occupied
-                char = 'X' if cell.is_occupied() else '.'
+                char = 'X' if cell else '.'
                 print(char, end=' ')
             print()  # Newline after each row
 
@@ -2162,101 +2203,10 @@ class AssetManager(BaseManager):
         self.sidewalks_farfrom_road_buffer = current_map.sidewalks_farfrom_road_buffer
         self.valid_region = current_map.valid_region
 
-        polygons = []
-        for sidewalk in self.sidewalks.keys():
-            # if "SDW_I_" in sidewalk: continue
-            polygon = self.sidewalks[sidewalk]['polygon']
-            polygons += polygon
-        for crosswalk in self.crosswalks.keys():
-            # if "CRS_I_" in crosswalk: continue
-            polygon = self.crosswalks[crosswalk]['polygon']
-            polygons += polygon
-
-        for sidewalk in self.sidewalks_near_road_buffer.keys():
-            polygon = self.sidewalks_near_road_buffer[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.sidewalks_near_road.keys():
-            polygon = self.sidewalks_near_road[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.sidewalks_farfrom_road.keys():
-            polygon = self.sidewalks_farfrom_road[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.sidewalks_farfrom_road_buffer.keys():
-            polygon = self.sidewalks_farfrom_road_buffer[sidewalk]['polygon']
-            polygons += polygon
-        # for sidewalk in self.valid_region.keys():
-        #     polygon = self.valid_region[sidewalk]['polygon']
-        #     polygons += polygon
-
-        # for polygon in self.all_object_polygons:
-        #     polygons += polygon
-
-        polygon_array = np.array(polygons)
-        min_x = np.min(polygon_array[:, 0])
-        max_x = np.max(polygon_array[:, 0])
-        min_y = np.min(polygon_array[:, 1])
-        max_y = np.max(polygon_array[:, 1])
         self.mask_delta = 2
-        rows = math.ceil(max_y - min_y) + 2 * self.mask_delta
-        columns = math.ceil(max_x - min_x) + 2 * self.mask_delta
-
-        self.mask_translate = np.array([-min_x + self.mask_delta, -min_y + self.mask_delta])
-        walkable_regions_mask = np.zeros((rows, columns, 3), np.uint8)
-        from shapely.geometry import Polygon
-        all_area = 0
-        for sidewalk in self.sidewalks.keys():
-            # if "SDW_I_" in sidewalk: continue
-            polygon_array = np.array(self.sidewalks[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            area = Polygon(polygon).area
-            all_area += area
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-
-        for crosswalk in self.crosswalks.keys():
-            # if "SDW_I_" in sidewalk: continue
-            polygon_array = np.array(self.crosswalks[crosswalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            area = Polygon(polygon).area
-            all_area += area
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-
-        for sidewalk in self.sidewalks_near_road_buffer.keys():
-            polygon_array = np.array(self.sidewalks_near_road_buffer[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            area = Polygon(polygon).area
-            all_area += area
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-        for sidewalk in self.sidewalks_near_road.keys():
-            polygon_array = np.array(self.sidewalks_near_road[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            area = Polygon(polygon).area
-            all_area += area
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-        for sidewalk in self.sidewalks_farfrom_road.keys():
-            polygon_array = np.array(self.sidewalks_farfrom_road[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            area = Polygon(polygon).area
-            all_area += area
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-        for sidewalk in self.sidewalks_farfrom_road_buffer.keys():
-            polygon_array = np.array(self.sidewalks_farfrom_road_buffer[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            area = Polygon(polygon).area
-            all_area += area
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-
+        walkable_regions_mask, self.mask_translate = current_map.get_walkable_regions_mask(
+            walkable=current_map.WALKABLE_REGIONS[:-1], mask_delta=self.mask_delta, flip=False
+        )
         return walkable_regions_mask
 
     def _get_walkable_regions(self, current_map):
@@ -2268,117 +2218,16 @@ class AssetManager(BaseManager):
         self.sidewalks_farfrom_road_buffer = current_map.sidewalks_farfrom_road_buffer
         self.valid_region = current_map.valid_region
 
-        polygons = []
-        p_crs = []
-        for sidewalk in self.sidewalks.keys():
-            # if "SDW_I_" in sidewalk: continue
-            polygon = self.sidewalks[sidewalk]['polygon']
-            polygons += polygon
-        for crosswalk in self.crosswalks.keys():
-            # if "CRS_I_" in crosswalk: continue
-            polygon = self.crosswalks[crosswalk]['polygon']
-            polygons += polygon
-            p_crs += polygon
-
-        for sidewalk in self.sidewalks_near_road_buffer.keys():
-            polygon = self.sidewalks_near_road_buffer[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.sidewalks_near_road.keys():
-            polygon = self.sidewalks_near_road[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.sidewalks_farfrom_road.keys():
-            polygon = self.sidewalks_farfrom_road[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.sidewalks_farfrom_road_buffer.keys():
-            polygon = self.sidewalks_farfrom_road_buffer[sidewalk]['polygon']
-            polygons += polygon
-        for sidewalk in self.valid_region.keys():
-            polygon = self.valid_region[sidewalk]['polygon']
-            polygons += polygon
-
-        for polygon in self.all_object_polygons:
-            polygons += polygon
-
-        polygon_array = np.array(polygons)
-        min_x = np.min(polygon_array[:, 0])
-        max_x = np.max(polygon_array[:, 0])
-        min_y = np.min(polygon_array[:, 1])
-        max_y = np.max(polygon_array[:, 1])
         self.mask_delta = 2
-        rows = math.ceil(max_y - min_y) + 2 * self.mask_delta
-        columns = math.ceil(max_x - min_x) + 2 * self.mask_delta
-
-        self.mask_translate = np.array([-min_x + self.mask_delta, -min_y + self.mask_delta])
-        walkable_regions_mask = np.zeros((rows, columns, 3), np.uint8)
-        from shapely.geometry import Polygon
-        all_area = 0
-        for sidewalk in self.sidewalks.keys():
-            # if "SDW_I_" in sidewalk: continue
-            polygon_array = np.array(self.sidewalks[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            area = Polygon(polygon).area
-            all_area += area
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-
-        for crosswalk in self.crosswalks.keys():
-            # if "SDW_I_" in sidewalk: continue
-            polygon_array = np.array(self.crosswalks[crosswalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            area = Polygon(polygon).area
-            all_area += area
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-
-        for sidewalk in self.sidewalks_near_road_buffer.keys():
-            polygon_array = np.array(self.sidewalks_near_road_buffer[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            area = Polygon(polygon).area
-            all_area += area
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-        for sidewalk in self.sidewalks_near_road.keys():
-            polygon_array = np.array(self.sidewalks_near_road[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            area = Polygon(polygon).area
-            all_area += area
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-        for sidewalk in self.sidewalks_farfrom_road.keys():
-            polygon_array = np.array(self.sidewalks_farfrom_road[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            area = Polygon(polygon).area
-            all_area += area
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-        for sidewalk in self.sidewalks_farfrom_road_buffer.keys():
-            polygon_array = np.array(self.sidewalks_farfrom_road_buffer[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            area = Polygon(polygon).area
-            all_area += area
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-        for sidewalk in self.valid_region.keys():
-            polygon_array = np.array(self.valid_region[sidewalk]['polygon'])
-            polygon_array += self.mask_translate
-            polygon_array = np.floor(polygon_array).astype(int)
-            polygon_array = polygon_array.reshape((-1, 1, 2))
-            cv2.fillPoly(walkable_regions_mask, [polygon_array], [255, 255, 255])
-
-        obj_area_total = 0
+        walkable_regions_mask, self.mask_translate = current_map.get_walkable_regions_mask(
+            mask_delta=self.mask_delta, flip=False
+        )
+        walkable_regions_mask = walkable_regions_mask.copy()
         for polygon in self.all_object_polygons:
             polygon_array = np.array(polygon)
             polygon_array += self.mask_translate
             polygon_array = np.floor(polygon_array).astype(int)
             polygon_array = polygon_array.reshape((-1, 1, 2))
-            obj_area = Polygon(polygon).area
-            obj_area_total += obj_area
             cv2.fillPoly(walkable_regions_mask, [polygon_array], [0, 0, 0])
 
         self.engine.walkable_regions_mask = walkable_regions_mask
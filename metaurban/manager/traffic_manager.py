@@ -9,6 +9,7 @@ import json
 import random
 import numpy as np
 from metaurban.manager.read_config import configReader
+from metaurban.manager.asset_manifest import get_asset_metainfos
 from metaurban.component.lane.abs_lane import AbstractLane
 from metaurban.component.map.base_map import BaseMap
 from metaurban.component.pgblock.first_block import FirstPGBlock
@@ -18,6 +19,7 @@ from metaurban.component.vehicle.vehicle_type import CustomizedCar
 from metaurban.constants import TARGET_VEHICLES, TRAFFIC_VEHICLES, OBJECT_TO_AGENT, AGENT_TO_OBJECT
 from metaurban.manager.base_manager import BaseManager
 from metaurban.utils import merge_dicts
+from metaurban.utils.neighbor_index import NeighborIndex
 
 BlockVehicles = namedtuple("block_vehicles", "trigger_road vehicles")
 import copy
@@ -69,6 +71,8 @@ class PGTrafficManager(BaseManager):
         self.random_traffic = self.engine.global_config["random_traffic"]
         self.density = self.engine.global_config["traffic_density"]
         self.respawn_lanes = None
+        # snapshot of the objects around traffic vehicles, only valid in before_step
+        self.neighbor_index = None
 
     def reset(self):
         """
@@ -114,9 +118,12 @@ class PGTrafficManager(BaseManager):
                         block_vehicles = self.block_triggered_vehicles.pop()
                         self._traffic_vehicles += list(self.get_objects(block_vehicles.vehicles).values())
 
+        # objects don't move until the physics step, so all vehicles share one snapshot of their surroundings
+        self.neighbor_index = NeighborIndex.from_engine(engine)
         for v in self._traffic_vehicles:
             p = self.engine.get_policy(v.name)
             v.before_step(p.act())
+        self.neighbor_index = None
         return dict()
 
     def after_step(self, *args, **kwargs):
@@ -490,12 +497,9 @@ class NewAssetPGTrafficManager(PGTrafficManager):
 
     def init_car_adj_list(self):
         self.car_asset_metainfos = []  # List to store the file paths
-        for root, dirs, files in os.walk(self.adj_folder):
-            for file in files:
-                if file.lower().startswith("car"):
-                    with open(os.path.join(root, file), 'r') as file:
-                        loaded_metainfo = json.load(file)
-                        self.car_asset_metainfos.append(loaded_metainfo)
+        for file, metainfo in get_asset_metainfos(self.adj_folder):
+            if os.path.basename(file).lower().startswith("car"):
+                self.car_asset_metainfos.append(copy.deepcopy(metainfo))
 
     def randomCustomizedCar(self):
         return CustomizedCar, random.choice(self.car_asset_metainfos)
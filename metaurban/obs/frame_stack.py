@@ -0,0 +1,44 @@
+import numpy as np
+
+
+class FrameStack:
+    """
+    Keep the latest stack_size frames along the last axis, the oldest first. Every frame is written twice in a buffer
+    of 2 * stack_size frames, so that the stack is always a slice of the buffer: pushing a frame writes it in place and
+    the stack is a view, instead of rolling and copying the whole stack every step. The frames are stored along the
+    first axis of the buffer, so that writing a frame and gathering the stack copy contiguous memory.
+    """
+    def __init__(self, frame_shape, stack_size, dtype, xp=np):
+        """
+        :param frame_shape: shape of a frame
+        :param stack_size: number of stacked frames
+        :param dtype: dtype of the storage, e.g. uint8 for raw images
+        :param xp: array module, numpy or cupy
+        """
+        self.stack_size = stack_size
+        self.xp = xp
+        self.buffer = xp.zeros((2 * stack_size, ) + tuple(frame_shape), dtype=dtype)
+        # slot of the next frame, which is also the start of the stack in the buffer
+        self.index = 0
+
+    def push(self, frame):
+        self.buffer[self.index] = frame
+        self.buffer[self.index + self.stack_size] = frame
+        self.index = (self.index + 1) % self.stack_size
+
+    @property
+    def view(self):
+        """
+        The stacked frames without copy. It is overwritten by the following push() calls
+        """
+        return self.xp.moveaxis(self.buffer[self.index:self.index + self.stack_size], 0, -1)
+
+    def get_stack(self):
+        """
+        A contiguous copy of the stacked frames
+        """
+        return self.xp.stack(self.buffer[self.index:self.index + self.stack_size], axis=-1)
+
+    def clear(self):
+        self.buffer[...] = 0
+        self.index = 0
@@ -3,6 +3,7 @@ from metaurban.component.sensors.base_camera import BaseCamera
 import numpy as np
 
 from metaurban.component.vehicle.base_vehicle import BaseVehicle
+from metaurban.obs.frame_stack import FrameStack
 from metaurban.obs.observation_base import BaseObservation
 from metaurban.obs.state_obs import StateObservation
 
@@ -98,9 +99,15 @@ class ImageObservation(BaseObservation):
         self.image_source = image_source
         super(ImageObservation, self).__init__(config)
         self.norm_pixel = clip_rgb
-        self.state = np.zeros(self.observation_space.shape, dtype=np.float32 if self.norm_pixel else np.uint8)
-        if self.enable_cuda:
-            self.state = cp.asarray(self.state)
+        space = self.observation_space
+        xp = cp if self.enable_cuda else np
+        self.frame_stack = FrameStack(space.shape[:-1], self.STACK_SIZE, space.dtype, xp)
+        # cameras write the new frame into it instead of allocating a new image
+        self._frame = xp.zeros(space.shape[:-1], dtype=space.dtype)
+
+    @property
+    def state(self):
+        return None if self.frame_stack is None else self.frame_stack.get_stack()
 
     @property
     def observation_space(self):
@@ -114,18 +121,25 @@ class ImageObservation(BaseObservation):
         else:
             return gym.spaces.Box(0, 255, shape=shape, dtype=np.uint8)
 
-    def observe(self, new_parent_node=None, position=None, hpr=None):
+    def observe(self, new_parent_node=None, position=None, hpr=None, copy=True):
         """
         Get the image Observation. By setting new_parent_node and the reset parameters, it can capture a new image from
-        a different position and pose
+        a different position and pose. With copy=False, a view of the stack is returned without copying, which is
+        overwritten by the next observe() or reset()
         """
-        new_obs = self.engine.get_sensor(self.image_source).perceive(self.norm_pixel, new_parent_node, position, hpr)
-        self.state = cp.roll(self.state, -1, axis=-1) if self.enable_cuda else np.roll(self.state, -1, axis=-1)
-        self.state[..., -1] = new_obs
-        return self.state
+        sensor = self.engine.get_sensor(self.image_source)
+        if isinstance(sensor, BaseCamera):
+            new_obs = sensor.perceive(self.norm_pixel, new_parent_node, position, hpr, out=self._frame)
+        else:
+            new_obs = sensor.perceive(self.norm_pixel, new_parent_node, position, hpr)
+        self.frame_stack.push(new_obs)
+        return self.frame_stack.get_stack() if copy else self.frame_stack.view
+
+    def get_stack(self):
+        return self.frame_stack.get_stack()
 
     def get_image(self):
-        return self.state.copy()[:, :, -1]
+        return self.frame_stack.get_stack()[:, :, -1]
 
     def reset(self, env, vehicle=None):
         """
@@ -134,16 +148,14 @@ class ImageObservation(BaseObservation):
         :param vehicle: BaseVehicle
         :return: None
         """
-        self.state = np.zeros(self.observation_space.shape, dtype=np.float32)
-        if self.enable_cuda:
-            self.state = cp.asarray(self.state)
+        self.frame_stack.clear()
 
     def destroy(self):
         """
         Clear memory
         """
         super(ImageObservation, self).destroy()
-        self.state = None
+        self.frame_stack = None
 
 
 class LidarStateObservation(BaseObservation):
@@ -53,6 +53,13 @@ class TopDownObservation(BaseObservation):
         # self.engine = None
 
         # initialize
+        self.init_display(main_window_position)
+
+        # canvas
+        self.init_canvas()
+        self.init_obs_window()
+
+    def init_display(self, main_window_position):
         pygame.init()
         pygame.display.set_caption(EDITION + " (Top-down)")
         # main_window_position means the left upper location.
@@ -63,10 +70,6 @@ class TopDownObservation(BaseObservation):
             (self.resolution[0] * 2, self.resolution[1] * 2)
         ) if self.onscreen else None
 
-        # canvas
-        self.init_canvas()
-        self.init_obs_window()
-
     def init_obs_window(self):
         self.obs_window = ObservationWindow((self.max_distance, self.max_distance), self.resolution)
 
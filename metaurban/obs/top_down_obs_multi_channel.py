@@ -9,6 +9,7 @@ from metaurban.component.traffic_participants.base_traffic_participant import Ba
 from metaurban.scenario.scenario_description import ScenarioDescription
 from metaurban.component.lane.point_lane import PointLane
 from metaurban.constants import Decoration, DEFAULT_AGENT
+from metaurban.obs.frame_stack import FrameStack
 from metaurban.obs.top_down_obs import TopDownObservation
 from metaurban.obs.top_down_obs_impl import WorldSurface, COLOR_BLACK, ObjectGraphics, LaneGraphics, \
     ObservationWindowMultiChannel
@@ -61,6 +62,7 @@ class TopDownMultiChannel(TopDownObservation):
         self.max_distance = max_distance
         self.scaling = self.resolution[0] / max_distance
         assert self.scaling == self.resolution[1] / self.max_distance
+        self._is_traffic_class = {}
 
     def init_obs_window(self):
         names = self.CHANNEL_NAMES.copy()
@@ -88,18 +90,13 @@ class TopDownMultiChannel(TopDownObservation):
         """
         # Setup the maximize size of the canvas
         # scaling and center can be easily found by bounding box
-        b_box = self.road_network.get_bounding_box()
         self.canvas_navigation.fill(COLOR_BLACK)
         self.canvas_ego.fill(COLOR_BLACK)
         self.canvas_road_network.fill(COLOR_BLACK)
         self.canvas_runtime.fill(COLOR_BLACK)
         self.canvas_background.fill(COLOR_BLACK)
         self.canvas_background.set_colorkey(self.canvas_background.BLACK)
-        x_len = b_box[1] - b_box[0]
-        y_len = b_box[3] - b_box[2]
-        max_len = max(x_len, y_len) + 20  # Add more 20 meters
-        scaling = self.MAP_RESOLUTION[1] / max_len - 0.1
-        assert scaling > 0
+        scaling, centering_pos = self.get_map_transform()
 
         # real-world distance * scaling = pixel in canvas
         self.canvas_background.scaling = scaling
@@ -108,21 +105,42 @@ class TopDownMultiChannel(TopDownObservation):
         self.canvas_ego.scaling = scaling
         self.canvas_road_network.scaling = scaling
 
-        centering_pos = ((b_box[0] + b_box[1]) / 2, (b_box[2] + b_box[3]) / 2)
         self.canvas_runtime.move_display_window_to(centering_pos)
         self.canvas_navigation.move_display_window_to(centering_pos)
         self.canvas_ego.move_display_window_to(centering_pos)
         self.canvas_background.move_display_window_to(centering_pos)
         self.canvas_road_network.move_display_window_to(centering_pos)
 
+        self.draw_navigation(self.canvas_background)
+        self.draw_lanes(self.canvas_background)
+
+        self.canvas_road_network.blit(self.canvas_background, (0, 0))
+        self.obs_window.reset(self.canvas_runtime)
+        self._should_draw_map = False
+
+    def get_map_transform(self):
+        """
+        :return: the scaling and the center of the canvas fitting the bounding box of the road network
+        """
+        b_box = self.road_network.get_bounding_box()
+        x_len = b_box[1] - b_box[0]
+        y_len = b_box[3] - b_box[2]
+        max_len = max(x_len, y_len) + 20  # Add more 20 meters
+        scaling = self.MAP_RESOLUTION[1] / max_len - 0.1
+        assert scaling > 0
+        centering_pos = ((b_box[0] + b_box[1]) / 2, (b_box[2] + b_box[3]) / 2)
+        return scaling, centering_pos
+
+    def draw_navigation(self, canvas):
         if isinstance(self.target_vehicle.navigation, NodeNetworkNavigation):
-            self.draw_navigation_node(self.canvas_background, (64, 64, 64))
+            self.draw_navigation_node(canvas, (64, 64, 64))
         elif isinstance(self.target_vehicle.navigation, EdgeNetworkNavigation):
             # TODO: draw edge network navigation
             pass
         elif isinstance(self.target_vehicle.navigation, TrajectoryNavigation):
-            self.draw_navigation_trajectory(self.canvas_background, (64, 64, 64))
+            self.draw_navigation_trajectory(canvas, (64, 64, 64))
 
+    def draw_lanes(self, canvas):
         if isinstance(self.road_network, NodeRoadNetwork):
             for _from in self.road_network.graph.keys():
                 decoration = True if _from == Decoration.start else False
@@ -130,17 +148,25 @@ class TopDownMultiChannel(TopDownObservation):
                     for l in self.road_network.graph[_from][_to]:
                         two_side = True if l is self.road_network.graph[_from][_to][-1] or decoration else False
                         LaneGraphics.LANE_LINE_WIDTH = 0.5
-                        LaneGraphics.display(l, self.canvas_background, two_side)
+                        LaneGraphics.display(l, canvas, two_side)
         elif hasattr(self.engine, "map_manager"):
             for data in self.engine.map_manager.current_map.blocks[-1].map_data.values():
                 if ScenarioDescription.POLYLINE in data:
                     LaneGraphics.display_scenario_line(
-                        data[ScenarioDescription.POLYLINE], data[ScenarioDescription.TYPE], self.canvas_background
+                        data[ScenarioDescription.POLYLINE], data[ScenarioDescription.TYPE], canvas
                     )
 
-        self.canvas_road_network.blit(self.canvas_background, (0, 0))
-        self.obs_window.reset(self.canvas_runtime)
-        self._should_draw_map = False
+    def get_traffic_objects(self, vehicle):
+        """
+        Vehicles and traffic participants except the given vehicle. The result of isinstance is cached for each class
+        """
+        for obj in self.engine.get_objects().values():
+            is_traffic = self._is_traffic_class.get(type(obj))
+            if is_traffic is None:
+                is_traffic = isinstance(obj, (BaseVehicle, BaseTrafficParticipant))
+                self._is_traffic_class[type(obj)] = is_traffic
+            if is_traffic and obj is not vehicle:
+                yield obj
 
     def _refresh(self, canvas, pos, clip_size):
         canvas.set_clip((pos[0] - clip_size[0] / 2, pos[1] - clip_size[1] / 2, clip_size[0], clip_size[1]))
@@ -164,30 +190,14 @@ class TopDownMultiChannel(TopDownObservation):
         ego_heading = vehicle.heading_theta
         ego_heading = ego_heading if abs(ego_heading) > 2 * np.pi / 180 else 0
 
-        for v in self.engine.get_objects(lambda o: isinstance(o, BaseVehicle) or isinstance(o, BaseTrafficParticipant)
-                                         ).values():
-            if v is vehicle:
-                continue
+        for v in self.get_traffic_objects(vehicle):
             h = v.heading_theta
             h = h if abs(h) > 2 * np.pi / 180 else 0
             ObjectGraphics.display(object=v, surface=self.canvas_runtime, heading=h, color=ObjectGraphics.BLUE)
 
         raw_pos = vehicle.position
         self.stack_past_pos.append(raw_pos)
-        for p_index in self._get_stack_indices(len(self.stack_past_pos)):
-            p_old = self.stack_past_pos[p_index]
-            diff = p_old - raw_pos
-            diff = (diff[0] * self.scaling, diff[1] * self.scaling)
-            # p = (p_old[0] - pos[0], p_old[1] - pos[1])
-            diff = (diff[1], diff[0])
-            p = pygame.math.Vector2(tuple(diff))
-            # p = pygame.math.Vector2(p)
-            p = p.rotate(np.rad2deg(ego_heading) + 90)
-            p = (p[1], p[0])
-            p = (
-                clip(p[0] + self.resolution[0] / 2, -self.resolution[0],
-                     self.resolution[0]), clip(p[1] + self.resolution[1] / 2, -self.resolution[1], self.resolution[1])
-            )
+        for p in self.get_past_pos_pixels(raw_pos, ego_heading):
             # p = self.canvas_background.pos2pix(p[0], p[1])
             self.canvas_past_pos.fill((255, 255, 255), (p, (1, 1)))
             # pygame.draw.circle(self.canvas_past_pos, (255, 255, 255), p, radius=1)
@@ -205,6 +215,28 @@ class TopDownMultiChannel(TopDownObservation):
         ret["past_pos"] = self.canvas_past_pos
         return ret
 
+    def get_past_pos_pixels(self, raw_pos, ego_heading):
+        """
+        :return: the pixels of the sampled past positions in the local view
+        """
+        ret = []
+        for p_index in self._get_stack_indices(len(self.stack_past_pos)):
+            p_old = self.stack_past_pos[p_index]
+            diff = p_old - raw_pos
+            diff = (diff[0] * self.scaling, diff[1] * self.scaling)
+            # p = (p_old[0] - pos[0], p_old[1] - pos[1])
+            diff = (diff[1], diff[0])
+            p = pygame.math.Vector2(tuple(diff))
+            # p = pygame.math.Vector2(p)
+            p = p.rotate(np.rad2deg(ego_heading) + 90)
+            p = (p[1], p[0])
+            p = (
+                clip(p[0] + self.resolution[0] / 2, -self.resolution[0],
+                     self.resolution[0]), clip(p[1] + self.resolution[1] / 2, -self.resolution[1], self.resolution[1])
+            )
+            ret.append(p)
+        return ret
+
     def _draw_ego_vehicle(self):
         vehicle = self.engine.agents[DEFAULT_AGENT]
         w = vehicle.top_down_width * self.scaling
@@ -227,12 +259,13 @@ class TopDownMultiChannel(TopDownObservation):
         # img = img[..., 0]
         # img = np.dot(img[..., :], [0.299, 0.587, 0.114])
         img = img[..., 0] * 0.299 + img[..., 1] * 0.587 + img[..., 2] * 0.114
+        return self._to_pixel(img)
 
+    def _to_pixel(self, gray):
         if self.norm_pixel:
-            img = img.astype(np.float32) / 255
+            return gray.astype(np.float32) / 255
         else:
-            img = img.astype(np.uint8)
-        return img
+            return gray.astype(np.uint8)
 
     def observe(self, vehicle: BaseVehicle):
         self.render()
@@ -305,3 +338,213 @@ class TopDownMultiChannel(TopDownObservation):
             return gym.spaces.Box(-0.0, 1.0, shape=shape, dtype=np.float32)
         else:
             return gym.spaces.Box(0, 255, shape=shape, dtype=np.uint8)
+
+
+def _rotation(angle):
+    """
+    Matrix rotating pixel coordinates, whose y axis points down, by angle counterclockwise on the screen, which is the
+    rotation of pygame.transform.rotozoom() and of the pygame.math.Vector2.rotate(-angle) calls in ObjectGraphics
+    """
+    c, s = math.cos(angle), math.sin(angle)
+    return np.array([[c, s], [-s, c]])
+
+
+def _sample_bilinear(image, x, y):
+    """
+    Sample an image padded by one pixel of zeros at the pixel coordinates x, y of the unpadded image, where pixel (i, j)
+    covers [j, j + 1) x [i, i + 1). Points outside the image are zeros
+    """
+    height, width = image.shape
+    x = np.clip(x + 0.5, 0, width - 1)
+    y = np.clip(y + 0.5, 0, height - 1)
+    x0 = np.minimum(x.astype(np.int64), width - 2)
+    y0 = np.minimum(y.astype(np.int64), height - 2)
+    fx = (x - x0).astype(image.dtype)
+    fy = (y - y0).astype(image.dtype)
+    # gather the 4 neighbours from the flattened image
+    image = image.ravel()
+    index = y0 * width + x0
+    top_left, top_right = image[index], image[index + 1]
+    bottom_left, bottom_right = image[index + width], image[index + width + 1]
+    top = top_left + (top_right - top_left) * fx
+    return top + (bottom_left + (bottom_right - bottom_left) * fx - top) * fy
+
+
+def _fill_convex_polygon(image, points, value):
+    """
+    Set the pixels whose centers are in the convex polygon to value. Points are the (x, y) vertices in order
+    """
+    x_min, y_min = np.maximum(np.floor(points.min(axis=0)).astype(int), 0)
+    x_max, y_max = np.minimum(np.ceil(points.max(axis=0)).astype(int), image.shape[1::-1])
+    if x_min >= x_max or y_min >= y_max:
+        return
+    x = np.arange(x_min, x_max) + 0.5
+    y = np.arange(y_min, y_max)[:, None] + 0.5
+    left, right = True, True
+    for (x1, y1), (x2, y2) in zip(points, np.roll(points, -1, axis=0)):
+        cross = (x2 - x1) * (y - y1) - (y2 - y1) * (x - x1)
+        left = left & (cross >= 0)
+        right = right & (cross <= 0)
+    image[y_min:y_max, x_min:x_max][left | right] = value
+
+
+class NumpyTopDownMultiChannel(TopDownMultiChannel):
+    """
+    Headless TopDownMultiChannel rasterized with NumPy. The lanes are drawn once per road network and the navigation
+    once per episode, and kept as a grayscale map, which is sampled around the ego vehicle every step. Other objects are
+    drawn as rotated rectangles in the ego frame directly, and the traffic flow history is kept in a ring buffer. The
+    observation matches TopDownMultiChannel except for the anti-aliased edges, and no pygame display is needed.
+    """
+    TRAFFIC_FLOW_GRAY = float(np.dot(ObjectGraphics.BLUE, [0.299, 0.587, 0.114]))
+
+    def __init__(self, *args, **kwargs):
+        super(NumpyTopDownMultiChannel, self).__init__(*args, **kwargs)
+        self.traffic_flow_stack = FrameStack(
+            self.obs_shape[::-1], self.stack_traffic_flow.maxlen, self.observation_space.dtype
+        )
+
+    def init_display(self, main_window_position):
+        if self.onscreen:
+            raise ValueError("NumpyTopDownMultiChannel can not render on screen, use TopDownMultiChannel instead")
+        self.screen = None
+
+    def init_canvas(self):
+        # the static layers are drawn by pygame on this surface, which doesn't need a display
+        self.canvas_background = WorldSurface(self.MAP_RESOLUTION, 0, pygame.Surface(self.MAP_RESOLUTION))
+        self.map_scaling = None
+        self.lane_layer = None
+        self._lane_layer_network = None
+        self.map_layer = None
+        self.channels = {}
+
+    def init_obs_window(self):
+        def get_grid(width, height):
+            # centers of the pixels relative to the ego vehicle, in shape (2, height, width). pygame rotates the pixel
+            # indices, so the ego vehicle is at the center of pixel (width / 2, height / 2)
+            x, y = np.meshgrid(np.arange(width) - width / 2, np.arange(height) - height / 2)
+            return np.stack([x, y])
+
+        width, height = self.obs_shape
+        # the road network window has twice the resolution and is downsampled, see ObservationWindowMultiChannel
+        self._road_grid = get_grid(width * 2, height * 2)
+        self._road_zoom = None
+        self._traffic_zoom = None
+
+    def _get_zoom(self, resolution):
+        """
+        Scale from the map to an observation window, as ObservationWindow._rotate()
+        """
+        receptive_field = int(self.canvas_background.pix(self.max_distance * np.sqrt(2))) * 2
+        return (int(resolution * np.sqrt(2)) + 1) / receptive_field
+
+    @staticmethod
+    def _get_gray_layer(canvas):
+        pixels = pygame.surfarray.pixels3d(canvas).transpose(1, 0, 2)
+        gray = np.multiply(pixels[..., 0], np.float32(0.299), dtype=np.float32)
+        gray += pixels[..., 1] * np.float32(0.587)
+        gray += pixels[..., 2] * np.float32(0.114)
+        del pixels
+        return gray
+
+    def draw_map(self):
+        """
+        Rasterize the lanes and the navigation to a grayscale map, in the same way as TopDownMultiChannel
+        """
+        canvas = self.canvas_background
+        self.map_scaling, centering_pos = self.get_map_transform()
+        canvas.scaling = self.map_scaling
+        canvas.move_display_window_to(centering_pos)
+        if self._lane_layer_network is not self.road_network:
+            canvas.fill(COLOR_BLACK)
+            self.draw_lanes(canvas)
+            self.lane_layer = self._get_gray_layer(canvas)
+            self._lane_layer_network = self.road_network
+        canvas.fill(COLOR_BLACK)
+        self.draw_navigation(canvas)
+        # lanes are drawn over the navigation
+        self.map_layer = np.pad(np.where(self.lane_layer > 0, self.lane_layer, self._get_gray_layer(canvas)), 1)
+        self._road_zoom = self._get_zoom(self.obs_shape[0] * 2)
+        self._traffic_zoom = self._get_zoom(self.obs_shape[0])
+        self._should_draw_map = False
+
+    def draw_scene(self):
+        assert len(self.engine.agents) == 1, "Don't support multi-agent top-down observation yet!"
+        vehicle = self.engine.agents[DEFAULT_AGENT]
+        canvas = self.canvas_background
+        width, height = self.obs_shape
+        pos = np.array(canvas.pos2pix(*vehicle.position))
+        # the window is rotated by the heading plus 90 degrees, as ObservationWindow._rotate()
+        rotation = _rotation(vehicle.heading_theta + np.pi / 2)
+
+        # map pixels of the road network window, which is downsampled from twice the resolution
+        cos, sin = rotation[0] / self._road_zoom
+        grid_x, grid_y = self._road_grid
+        road = _sample_bilinear(
+            self.map_layer, pos[0] + grid_x * cos - grid_y * sin, pos[1] + grid_x * sin + grid_y * cos
+        )
+        road_network = (road[::2, ::2] + road[1::2, ::2] + road[::2, 1::2] + road[1::2, 1::2]) / 4
+
+        traffic_flow = np.zeros((height, width), dtype=np.float32)
+        for v in self.get_traffic_objects(vehicle):
+            h = v.heading_theta
+            h = h if abs(h) > 2 * np.pi / 180 else 0
+            w = canvas.pix(v.WIDTH)
+            l = canvas.pix(v.LENGTH)
+            box = np.array([(-l / 2, -w / 2), (-l / 2, w / 2), (l / 2, w / 2), (l / 2, -w / 2)])
+            box = box @ _rotation(h).T + (np.array(canvas.pos2pix(*v.position)) - pos)
+            box = box @ rotation.T * self._traffic_zoom + (width / 2 + 0.5, height / 2 + 0.5)
+            _fill_convex_polygon(traffic_flow, box, self.TRAFFIC_FLOW_GRAY)
+
+        ego_heading = vehicle.heading_theta
+        ego_heading = ego_heading if abs(ego_heading) > 2 * np.pi / 180 else 0
+        raw_pos = vehicle.position
+        self.stack_past_pos.append(raw_pos)
+        past_pos = np.zeros((height, width), dtype=np.float32)
+        for x, y in self.get_past_pos_pixels(raw_pos, ego_heading):
+            # pygame truncates the position of the filled rect
+            x, y = int(x), int(y)
+            if 0 <= x < width and 0 <= y < height:
+                past_pos[y, x] = 255
+
+        self.channels = dict(road_network=road_network, traffic_flow=traffic_flow, past_pos=past_pos)
+        return self.channels
+
+    def render(self):
+        if self._should_draw_map:
+            self.draw_map()
+        self.draw_scene()
+
+    def get_observation_window(self):
+        """
+        :return: the grayscale channels of the current frame
+        """
+        return self.channels
+
+    def observe(self, vehicle: BaseVehicle):
+        self.render()
+        img_dict = {k: self._to_pixel(img) for k, img in self.channels.items()}
+
+        if self._should_fill_stack:
+            self.stack_past_pos.clear()
+            self.traffic_flow_stack.clear()
+            for _ in range(self.traffic_flow_stack.stack_size):
+                self.traffic_flow_stack.push(img_dict["traffic_flow"])
+            self._should_fill_stack = False
+        self.traffic_flow_stack.push(img_dict["traffic_flow"])
+
+        # the latest frame and one every frame_skip frames before it, as _get_stack_indices()
+        traffic_flow = self.traffic_flow_stack.view[..., ::-self.frame_skip]
+        img = np.concatenate(
+            [(img_dict["road_network"] * 2)[..., None], img_dict["past_pos"][..., None], traffic_flow], axis=-1
+        )
+        if self.norm_pixel:
+            img = np.clip(img, 0, 1.0)
+        else:
+            img = np.clip(img, 0, 255)
+        return img
+
+    def destroy(self):
+        self.lane_layer = None
+        self._lane_layer_network = None
+        self.map_layer = None
+        super(NumpyTopDownMultiChannel, self).destroy()
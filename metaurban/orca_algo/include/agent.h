@@ -59,6 +59,8 @@ class Agent {
 
 		virtual void SetPosition(const Point &pos);
 
+		virtual bool SetGoal(const Point &newGoal);
+
 		virtual void AddNeighbour(Agent &neighbour, float distSq);
 
 		virtual bool isFinished();
@@ -0,0 +1,67 @@
+#include <string>
+#include <vector>
+
+#include "reader.h"
+#include "const.h"
+#include "agent.h"
+#include "orca_agent.h"
+#include "orca_diff_drive_agent.h"
+#include "thetastar.h"
+#include "direct_planner.h"
+#include "agent_pnr.h"
+#include "agent_pnr_ecbs.h"
+#include "agent_returning.h"
+
+
+#ifndef ORCA_ARRAYREADER_H
+#define ORCA_ARRAYREADER_H
+
+
+/*
+ * Reader which builds the task from in-memory data instead of an XML document. The map is copied from a prebuilt
+ * one, so the static obstacles of a scene are only processed once, and the agents are created exactly as XMLReader
+ * does for the template written by orca_planner_utils.write_to_xml.
+ */
+class ArrayReader : public Reader {
+	public:
+		ArrayReader();
+
+		ArrayReader(const Map &map, const std::vector<Point> &starts, const std::vector<Point> &goals,
+					const std::string &agentType, int plannerType, const environment_options &options,
+					const AgentParam &param);
+
+		ArrayReader(const ArrayReader &obj);
+
+		~ArrayReader() override;
+
+		bool ReadData() override;
+
+		bool GetMap(Map **map) override;
+
+		bool GetEnvironmentOptions(environment_options **envOpt) override;
+
+		bool GetAgents(std::vector<Agent *> &agents, const int &numThreshold) override;
+
+		ArrayReader *Clone() const override;
+
+		ArrayReader &operator=(const ArrayReader &obj);
+
+
+	private:
+		Map mapTemplate;
+		std::vector<Point> starts;
+		std::vector<Point> goals;
+		std::string agentType;
+		int plannerType;
+		environment_options defaultOptions;
+		AgentParam defaultParam;
+
+		std::vector<Agent *> *allAgents;
+		Map *map;
+		environment_options *options;
+
+		bool ReadAgents();
+};
+
+
+#endif //ORCA_ARRAYREADER_H
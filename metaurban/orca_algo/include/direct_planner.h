@@ -29,6 +29,8 @@ class DirectPlanner : public PathPlanner {
 
 		Point GetPastPoint() override;
 
+		void SetTask(const Point &start, const Point &goal) override;
+
 };
 
 #endif //ORCA_DIRECTPLANNER_H
@@ -36,6 +36,10 @@ class Map {
 
 		const std::vector<std::vector<ObstacleSegment>> &GetObstacles() const;
 
+		const std::vector<std::vector<ObstacleSegment>> &GetDynamicObstacles() const;
+
+		void SetDynamicObstacles(const std::vector<std::vector<Point>> &obstacles);
+
 		Map &operator=(const Map &obj);
 
 	private:
@@ -44,6 +48,12 @@ class Map {
 		unsigned int width;
 		std::vector<std::vector<int>> *grid;
 		std::vector<std::vector<ObstacleSegment>> *obstacles;
+		std::vector<std::vector<ObstacleSegment>> dynamicObstacles;
+		int staticSegmentsNum;
+
+		void LinkObstacles();
+
+		static std::vector<ObstacleSegment> MakeObstacle(const std::vector<Point> &obstacle, int &idCounter);
 
 };
 
@@ -32,6 +32,9 @@ class Mission {
 		Mission(std::string &xml_data, unsigned int agentsNum, unsigned int stepsTh, bool time, size_t timeTh,
 				bool speedStop);
 
+		Mission(Reader *reader, unsigned int agentsNum, unsigned int stepsTh, bool time, size_t timeTh,
+				bool speedStop);
+
 		Mission(const Mission &obj);
 
 		~Mission();
@@ -43,6 +46,8 @@ class Mission {
 		Mission &operator=(const Mission &obj);
 		unordered_map<int, trajectory_dict> save_dict();
 
+		const std::unordered_map<int, std::vector<Point>> &GetStepsLog() const;
+
 
 #if FULL_LOG
 
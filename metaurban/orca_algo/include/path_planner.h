@@ -34,6 +34,8 @@ class PathPlanner {
 
 		virtual Point GetPastPoint() = 0;
 
+		virtual void SetTask(const Point &start, const Point &goal) = 0;
+
 		PathPlanner &operator=(const PathPlanner &obj) {
 			map = obj.map;
 			options = obj.options;
@@ -0,0 +1,64 @@
+#include <vector>
+#include <list>
+
+#include "agent.h"
+#include "reader.h"
+
+
+#ifndef ORCA_SIMULATOR_H
+#define ORCA_SIMULATOR_H
+
+
+/*
+ * Stateful counterpart of Mission. The task is advanced step by step instead of being run to the end at once and no
+ * trajectory is logged, so the caller only keeps the steps it asked for. Goals can be changed and dynamic obstacles
+ * (e.g. the ego robot) can be placed between steps.
+ */
+class Simulator {
+	public:
+		Simulator() = delete;
+
+		Simulator(Reader *reader, unsigned int agentsNum, unsigned int stepsTh, bool speedStop);
+
+		Simulator(const Simulator &obj) = delete;
+
+		~Simulator();
+
+		bool ReadTask();
+
+		bool Step();
+
+		bool IsDone() const;
+
+		bool SetGoal(unsigned int index, const Point &goal);
+
+		void SetDynamicObstacles(const std::vector<std::vector<Point>> &obstacles);
+
+		const std::vector<Agent *> &GetAgents() const;
+
+		unsigned int GetStepsCount() const;
+
+		Simulator &operator=(const Simulator &obj) = delete;
+
+	private:
+		void UpdateSate();
+
+		void AssignNeighbours();
+
+		std::vector<Agent *> agents;
+		Reader *taskReader;
+		Map *map;
+		environment_options *options;
+
+		bool stopByMeanSpeed;
+		bool allStops;
+		bool finished;
+
+		unsigned int stepsCount;
+		unsigned int stepsTreshhold;
+		unsigned int agentsNum;
+		std::vector<std::list<float>> commonSpeedsBuffer;
+};
+
+
+#endif //ORCA_SIMULATOR_H
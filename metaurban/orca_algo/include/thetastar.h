@@ -32,6 +32,8 @@ class ThetaStar : public PathPlanner {
 
 		Point GetPastPoint() override;
 
+		void SetTask(const Point &start, const Point &goal) override;
+
 		ThetaStar &operator=(const ThetaStar &obj);
 
 	private:
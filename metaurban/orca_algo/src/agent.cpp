@@ -137,6 +137,15 @@ void Agent::SetPosition(const Point &pos) {
 }
 
 
+bool Agent::SetGoal(const Point &newGoal) {
+	// The global path is searched again from the current position
+	start = position;
+	goal = newGoal;
+	planner->SetTask(position, newGoal);
+	return InitPath();
+}
+
+
 Point Agent::GetPosition() const {
 	return position;
 }
@@ -144,16 +153,16 @@ Point Agent::GetPosition() const {
 
 void Agent::UpdateNeighbourObst() {
 	NeighboursObst.clear();
-	std::vector<std::vector<ObstacleSegment>> tmpObstacles = map->GetObstacles();
 	float distSq = 0;
 
-	for (int i = 0; i < tmpObstacles.size(); i++) {
-		for (int j = 0; j < tmpObstacles[i].size(); j++) {
-
-			distSq = Utils::SqPointSegDistance(static_cast<Point>(tmpObstacles[i][j].left),
-											   static_cast<Point>(tmpObstacles[i][j].right), position);
-			if (distSq < maxSqObstDist) {
-				NeighboursObst.push_back({distSq, tmpObstacles[i][j]});
+	for (auto tmpObstacles: {&map->GetObstacles(), &map->GetDynamicObstacles()}) {
+		for (auto &obstacle: *tmpObstacles) {
+			for (auto &segment: obstacle) {
+				distSq = Utils::SqPointSegDistance(static_cast<Point>(segment.left), static_cast<Point>(segment.right),
+												   position);
+				if (distSq < maxSqObstDist) {
+					NeighboursObst.push_back({distSq, segment});
+				}
 			}
 		}
 	}
@@ -0,0 +1,218 @@
+#include "array_reader.h"
+
+
+ArrayReader::ArrayReader(const Map &map, const std::vector<Point> &starts, const std::vector<Point> &goals,
+						 const std::string &agentType, int plannerType, const environment_options &options,
+						 const AgentParam &param)
+		: mapTemplate(map), starts(starts), goals(goals), agentType(agentType), plannerType(plannerType),
+		  defaultOptions(options), defaultParam(param) {
+	this->allAgents = new std::vector<Agent *>();
+	this->map = nullptr;
+	this->options = nullptr;
+}
+
+
+ArrayReader::ArrayReader() {
+	this->plannerType = CN_DEFAULT_ST;
+	this->agentType = CNS_DEFAULT_AGENT_TYPE;
+	this->allAgents = nullptr;
+	this->map = nullptr;
+	this->options = nullptr;
+}
+
+
+ArrayReader::ArrayReader(const ArrayReader &obj) {
+	mapTemplate = obj.mapTemplate;
+	starts = obj.starts;
+	goals = obj.goals;
+	agentType = obj.agentType;
+	plannerType = obj.plannerType;
+	defaultOptions = obj.defaultOptions;
+	defaultParam = obj.defaultParam;
+
+	allAgents = (obj.allAgents == nullptr) ? nullptr : new std::vector<Agent *>(*(obj.allAgents));
+	map = (obj.map == nullptr) ? nullptr : new Map(*obj.map);
+	options = (obj.options == nullptr) ? nullptr : new environment_options(*obj.options);
+}
+
+
+ArrayReader::~ArrayReader() {
+	if (allAgents != nullptr) {
+		delete allAgents;
+		allAgents = nullptr;
+	}
+
+	if (options != nullptr) {
+		delete options;
+		options = nullptr;
+	}
+
+	if (map != nullptr) {
+		delete map;
+		map = nullptr;
+	}
+}
+
+
+bool ArrayReader::GetMap(Map **map) {
+	if (this->map != nullptr) {
+		*map = this->map;
+		this->map = nullptr;
+		return true;
+	}
+
+	return false;
+}
+
+
+bool ArrayReader::GetEnvironmentOptions(environment_options **envOpt) {
+	if (this->options != nullptr) {
+		*envOpt = this->options;
+		this->options = nullptr;
+		return true;
+	}
+	return false;
+}
+
+
+bool ArrayReader::GetAgents(std::vector<Agent *> &agents, const int &numThreshold) {
+
+	if (allAgents == nullptr || allAgents->size() >= numThreshold) {
+		agents.clear();
+		for (int i = 0; i < numThreshold; i++) {
+			agents.push_back((*allAgents)[i]);
+		}
+		for (int i = numThreshold; i < allAgents->size(); i++) {
+			delete (*allAgents)[i];
+		}
+		allAgents->clear();
+		delete allAgents;
+		allAgents = nullptr;
+
+		return true;
+	}
+	return false;
+}
+
+
+bool ArrayReader::ReadData() {
+	if (allAgents == nullptr || mapTemplate.GetHeight() == 0 || starts.size() != goals.size()) {
+		return false;
+	}
+
+	map = new Map(mapTemplate);
+	options = new environment_options(defaultOptions);
+	return ReadAgents();
+}
+
+
+ArrayReader &ArrayReader::operator=(const ArrayReader &obj) {
+	if (this != &obj) {
+		mapTemplate = obj.mapTemplate;
+		starts = obj.starts;
+		goals = obj.goals;
+		agentType = obj.agentType;
+		plannerType = obj.plannerType;
+		defaultOptions = obj.defaultOptions;
+		defaultParam = obj.defaultParam;
+
+		if (allAgents != nullptr) {
+			delete allAgents;
+		}
+		allAgents = (obj.allAgents == nullptr) ? nullptr : new std::vector<Agent *>(*(obj.allAgents));
+
+		if (map != nullptr) {
+			delete map;
+		}
+		map = (obj.map == nullptr) ? nullptr : new Map(*obj.map);
+
+		if (options != nullptr) {
+			delete options;
+		}
+		options = (obj.options == nullptr) ? nullptr : new environment_options(*obj.options);
+	}
+	return *this;
+}
+
+
+ArrayReader *ArrayReader::Clone() const {
+	return new ArrayReader(*this);
+}
+
+
+bool ArrayReader::ReadAgents() {
+	/* Same validity checks and agent construction as XMLReader::ReadAgents, the agent ID is its index */
+	for (int id = 0; id < starts.size(); id++) {
+		AgentParam param = AgentParam(defaultParam);
+		float stx = starts[id].X(), sty = starts[id].Y();
+		float gx = goals[id].X(), gy = goals[id].Y();
+		bool correct = true;
+
+		if (stx <= param.radius || sty <= param.radius ||
+			gx <= param.radius || gy <= param.radius ||
+			stx >= (map->GetWidth() * map->GetCellSize()) - param.radius ||
+			gx >= (map->GetWidth() * map->GetCellSize()) - param.radius ||
+			sty >= (map->GetHeight() * map->GetCellSize()) - param.radius ||
+			gy >= (map->GetHeight() * map->GetCellSize()) - param.radius) {
+			correct = false;
+		}
+
+		for (auto agent: *allAgents) {
+			float sqRadiusSum = static_cast<float>(std::pow((agent->GetRadius() + param.radius), 2.0));
+			float sqDist = (Point(stx, sty) - agent->GetPosition()).SquaredEuclideanNorm();
+			if (sqDist <= sqRadiusSum) {
+				correct = false;
+				break;
+			}
+		}
+		Node tmpStNode = map->GetClosestNode(Point(stx, sty));
+		Node tmpGlNode = map->GetClosestNode(Point(gx, gy));
+		LineOfSight positionChecker(param.radius / map->GetCellSize());
+		if (!positionChecker.checkTraversability(tmpStNode.i, tmpStNode.j, *map)) {
+			correct = false;
+		}
+		if (!positionChecker.checkTraversability(tmpGlNode.i, tmpGlNode.j, *map)) {
+			correct = false;
+		}
+
+		if (!correct) {
+			continue;
+		}
+
+		/* Creating of an agent */
+		Agent *a;
+		if (agentType == CNS_AT_ST_ORCA) {
+			a = new orca_agent(id, Point(stx, sty), Point(gx, gy), *map, *options, param);
+		}
+		else if (agentType == CNS_AT_ST_ORCADD) {
+			a = new ORCADDAgent(id, Point(stx, sty), Point(gx, gy), *map, *options, param,
+								2 * (param.radius + param.rEps), 2 * (param.radius), CN_DEFAULT_START_THETA);
+		}
+		else if (agentType == CNS_AT_ST_ORCAPAR) {
+			a = new agent_pnr(id, Point(stx, sty), Point(gx, gy), *map, *options, param);
+		}
+		else if (agentType == CNS_AT_ST_ORCAPARECBS) {
+			a = new ORCAAgentWithPARAndECBS(id, Point(stx, sty), Point(gx, gy), *map, *options, param);
+		}
+		else if (agentType == CNS_AT_ST_ORCARETURN) {
+			a = new ORCAAgentWithReturning(id, Point(stx, sty), Point(gx, gy), *map, *options, param);
+		}
+		else {
+			a = new orca_agent(id, Point(stx, sty), Point(gx, gy), *map, *options, param);
+		}
+
+		/* Set agent's planner */
+		switch (plannerType) {
+			case CN_SP_ST_DIR: {
+				a->SetPlanner(DirectPlanner(*map, *options, Point(stx, sty), Point(gx, gy), param.radius + param.rEps));
+				break;
+			}
+			default: {
+				a->SetPlanner(ThetaStar(*map, *options, Point(stx, sty), Point(gx, gy), param.radius + param.rEps));
+				break;
+			}
+		}
+		allAgents->push_back(a);
+	}
+	return true;
+}
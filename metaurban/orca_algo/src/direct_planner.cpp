@@ -40,3 +40,8 @@ Point DirectPlanner::GetPastPoint() {
 	return glStart;
 }
 
+
+void DirectPlanner::SetTask(const Point &start, const Point &goal) {
+	glStart = start;
+	glGoal = goal;
+}
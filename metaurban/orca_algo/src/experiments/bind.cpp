@@ -1,17 +1,27 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <pybind11/numpy.h>
 #include <iostream>
 #include <string>
 #include <ostream>
 #include <iomanip>
 #include <locale>
 #include "mission.h"
+#include "array_reader.h"
+#include "simulator.h"
 
 #define STEP_MAX            1200
 #define IS_TIME_BOUNDED     false
 #define STOP_BY_SPEED       true
 #define TIME_MAX            1200 * 60 * 1
 
+// Same task parameters as the template written by orca_planner_utils.write_to_xml
+#define PLAN_CELL_SIZE      1
+#define PLAN_AGENT_SIZE     0.3f
+#define PLAN_TIME_STEP      0.1f
+#define PLAN_DELTA          0.1f
+#define PLAN_MAPF_NUM       3
+
 
 namespace py = pybind11;
 
@@ -98,6 +108,168 @@ unordered_map<int, trajectory_dict> demo(string xml_data, int num)
 }
 
 
+typedef py::array_t<uint8_t, py::array::c_style | py::array::forcecast> grid_array;
+typedef py::array_t<float, py::array::c_style | py::array::forcecast> point_array;
+
+
+vector<Point> to_points(const point_array &array)
+{
+	if (array.ndim() != 2 || array.shape(1) != 2) {
+		throw std::invalid_argument("Point arrays should have the shape (N, 2)");
+	}
+	auto data = array.unchecked<2>();
+	vector<Point> points;
+	points.reserve(array.shape(0));
+	for (ssize_t i = 0; i < array.shape(0); i++) {
+		points.push_back(Point(data(i, 0), data(i, 1)));
+	}
+	return points;
+}
+
+
+struct planning_map {
+	/*
+	 * Static part of an ORCA task: the (H, W) occupancy grid (1 for blocked cells) and the (K, 2) obstacle contour
+	 * vertices. It is built once per scene and copied into every mission planned on it.
+	 */
+	planning_map(grid_array grid, vector<point_array> obstacles)
+	{
+		if (grid.ndim() != 2) {
+			throw std::invalid_argument("The grid should have the shape (H, W)");
+		}
+		auto grid_data = grid.unchecked<2>();
+		vector<vector<int>> grid_rows(grid.shape(0), vector<int>(grid.shape(1)));
+		for (ssize_t i = 0; i < grid.shape(0); i++) {
+			for (ssize_t j = 0; j < grid.shape(1); j++) {
+				grid_rows[i][j] = grid_data(i, j);
+			}
+		}
+		vector<vector<Point>> obstacle_points;
+		obstacle_points.reserve(obstacles.size());
+		for (auto &obstacle: obstacles) {
+			obstacle_points.push_back(to_points(obstacle));
+		}
+		map = Map(PLAN_CELL_SIZE, grid_rows, obstacle_points);
+	}
+
+	Map map;
+};
+
+
+ArrayReader *make_reader(const planning_map &static_map, point_array starts, point_array goals, string agent_type)
+{
+	vector<Point> start_points = to_points(starts);
+	vector<Point> goal_points = to_points(goals);
+	if (start_points.size() != goal_points.size()) {
+		throw std::invalid_argument("starts and goals should contain the same number of agents");
+	}
+
+	environment_options options(CN_DEFAULT_METRIC_TYPE, false, false, false, CN_DEFAULT_HWEIGHT, PLAN_TIME_STEP,
+								PLAN_DELTA, SPEED_BUFFER, PLAN_MAPF_NUM);
+	AgentParam param = AgentParam();
+	param.radius = PLAN_AGENT_SIZE;
+	return new ArrayReader(static_map.map, start_points, goal_points, agent_type, CN_SP_ST_THETA, options, param);
+}
+
+
+py::array_t<float> plan_on_map(const planning_map &static_map, point_array starts, point_array goals,
+							   string agent_type)
+{
+	/*
+	 * In-memory counterpart of demo(). starts/goals are (N, 2) positions in map coordinates. The trajectories are
+	 * returned as one (steps, N, 2) array ordered as the input agents.
+	 */
+	int num = starts.ndim() == 2 ? starts.shape(0) : 0;
+	Mission task = Mission(make_reader(static_map, starts, goals, agent_type), num, STEP_MAX, IS_TIME_BOUNDED,
+						   TIME_MAX, STOP_BY_SPEED);
+	if (!task.ReadTask()) {
+		throw std::runtime_error("Invalid ORCA task, some agents are out of the map or too close to obstacles");
+	}
+	task.StartMission();
+
+	auto &steps_log = task.GetStepsLog();
+	ssize_t steps = num > 0 ? steps_log.at(0).size() : 0;
+	py::array_t<float> result({steps, (ssize_t) num, (ssize_t) 2});
+	auto result_data = result.mutable_unchecked<3>();
+	for (int id = 0; id < num; id++) {
+		auto &path = steps_log.at(id);
+		for (ssize_t t = 0; t < steps; t++) {
+			result_data(t, id, 0) = path[t].X();
+			result_data(t, id, 1) = path[t].Y();
+		}
+	}
+	return result;
+}
+
+
+py::array_t<float> plan(grid_array grid, vector<point_array> obstacles, point_array starts, point_array goals,
+						string agent_type)
+{
+	return plan_on_map(planning_map(grid, obstacles), starts, goals, agent_type);
+}
+
+
+std::unique_ptr<Simulator> make_simulator(const planning_map &static_map, point_array starts, point_array goals,
+										   string agent_type)
+{
+	/* Same task as plan_on_map(), but it is run by the caller with Simulator.step */
+	int num = starts.ndim() == 2 ? starts.shape(0) : 0;
+	std::unique_ptr<Simulator> simulator(new Simulator(make_reader(static_map, starts, goals, agent_type), num,
+													   STEP_MAX, STOP_BY_SPEED));
+	if (!simulator->ReadTask()) {
+		throw std::runtime_error("Invalid ORCA task, some agents are out of the map or too close to obstacles");
+	}
+	return simulator;
+}
+
+
+py::array_t<float> get_positions(const Simulator &simulator)
+{
+	auto &agents = simulator.GetAgents();
+	py::array_t<float> result({(ssize_t) agents.size(), (ssize_t) 2});
+	auto result_data = result.mutable_unchecked<2>();
+	for (size_t id = 0; id < agents.size(); id++) {
+		result_data(id, 0) = agents[id]->GetPosition().X();
+		result_data(id, 1) = agents[id]->GetPosition().Y();
+	}
+	return result;
+}
+
+
+py::array_t<float> step_simulator(Simulator &simulator, int num_steps)
+{
+	/*
+	 * Advance at most num_steps steps, fewer if the task stops before. The positions after each step are returned as
+	 * a (steps, N, 2) array, so the rows follow the initial positions in the way plan_on_map() returns them.
+	 */
+	auto &agents = simulator.GetAgents();
+	vector<float> positions;
+	positions.reserve(std::max(num_steps, 0) * agents.size() * 2);
+	ssize_t steps = 0;
+	while (steps < num_steps && !simulator.IsDone()) {
+		simulator.Step();
+		for (auto agent: agents) {
+			positions.push_back(agent->GetPosition().X());
+			positions.push_back(agent->GetPosition().Y());
+		}
+		steps++;
+	}
+	py::array_t<float> result({steps, (ssize_t) agents.size(), (ssize_t) 2});
+	std::copy(positions.begin(), positions.end(), result.mutable_data());
+	return result;
+}
+
+
+void set_dynamic_obstacles(Simulator &simulator, vector<point_array> obstacles)
+{
+	vector<vector<Point>> obstacle_points;
+	obstacle_points.reserve(obstacles.size());
+	for (auto &obstacle: obstacles) {
+		obstacle_points.push_back(to_points(obstacle));
+	}
+	simulator.SetDynamicObstacles(obstacle_points);
+}
+
 
 PYBIND11_MODULE(bind, m)
 {
@@ -105,6 +277,30 @@ PYBIND11_MODULE(bind, m)
     m.doc() = "pybind11 test plugin";
     //def("提供给python调用的方法名"， &实际操作的函数， "函数功能说明"， 默认参数). 其中函数功能说明为可选
     m.def("demo", &demo, "A function which multiplies two numbers", py::arg("xml_data")="tmp", py::arg("num")=7);
+	m.def("plan", &plan, "Run ORCA on in-memory map and agents, return (steps, agents, 2) trajectories",
+		  py::arg("grid"), py::arg("obstacles"), py::arg("starts"), py::arg("goals"), py::arg("agent_type")="orca-par");
+	m.def("plan_on_map", &plan_on_map, "Run ORCA on a prebuilt PlanningMap, return (steps, agents, 2) trajectories",
+		  py::arg("static_map"), py::arg("starts"), py::arg("goals"), py::arg("agent_type")="orca-par");
+	py::class_<planning_map>(m, "PlanningMap")
+		.def(py::init<grid_array, vector<point_array>>(), py::arg("grid"), py::arg("obstacles"))
+		.def_property_readonly("height", [](const planning_map &self) { return self.map.GetHeight(); })
+		.def_property_readonly("width", [](const planning_map &self) { return self.map.GetWidth(); })
+		;
+	py::class_<Simulator>(m, "Simulator")
+		.def(py::init(&make_simulator), py::arg("static_map"), py::arg("starts"), py::arg("goals"),
+			 py::arg("agent_type")="orca-par")
+		.def("step", &step_simulator, "Advance the agents, return the (steps, agents, 2) positions after each step",
+			 py::arg("num_steps")=1)
+		.def("set_goal", [](Simulator &self, unsigned int index, std::pair<float, float> goal) {
+			return self.SetGoal(index, Point(goal.first, goal.second));
+		}, "Send an agent to a new goal, its global path is searched again", py::arg("index"), py::arg("goal"))
+		.def("set_dynamic_obstacles", &set_dynamic_obstacles,
+			 "Replace the moving obstacles, given as (K, 2) polygons, they are only avoided by the local planner",
+			 py::arg("obstacles"))
+		.def_property_readonly("positions", &get_positions)
+		.def_property_readonly("done", &Simulator::IsDone)
+		.def_property_readonly("steps", &Simulator::GetStepsCount)
+		;
 	py::class_<trajectory_dict>(m, "trajectory_dict")
 		.def(py::init<>())
 		.def_readwrite("xr", &trajectory_dict::xr)
@@ -6,6 +6,7 @@ Map::Map() {
 	width = 0;
 	grid = nullptr;
 	obstacles = nullptr;
+	staticSegmentsNum = 0;
 }
 
 
@@ -21,40 +22,15 @@ Map::Map(float cellSize, std::vector<std::vector<int>> &grid, std::vector<std::v
 	}
 
 	int idCounter = 0;
-
-	for (auto obstacle: obstacles) {
+	for (auto &obstacle: obstacles) {
 		if (obstacle.size() < 2) {
 			continue;
 		}
-
-		bool rCvx = true, lCvx;
-		std::vector<ObstacleSegment> tmpObstacle;
-		for (int i = 0; i < obstacle.size(); i++) {
-			Vertex left = obstacle[(i == 0 ? obstacle.size() - 1 : i - 1)];
-			Vertex right = obstacle[i];
-			Vertex next = obstacle[(i == obstacle.size() - 1 ? 0 : i + 1)];
-			lCvx = rCvx;
-			rCvx = true;
-			if (obstacle.size() > 2) {
-				rCvx = (left - next).Det(right - left) >= 0.0f;
-			}
-			right.SetConvex(rCvx);
-			left.SetConvex(lCvx);
-
-			tmpObstacle.emplace_back(ObstacleSegment(idCounter, left, right));
-			idCounter++;
-		}
-		tmpObstacle[0].left.SetConvex(rCvx);
-		this->obstacles->push_back(tmpObstacle);
-		tmpObstacle.clear();
+		this->obstacles->push_back(MakeObstacle(obstacle, idCounter));
 	}
+	staticSegmentsNum = idCounter;
 
-	for (auto &obstacle: (*this->obstacles)) {
-		for (int i = 0; i < obstacle.size(); i++) {
-			obstacle[i].next = (i == obstacle.size() - 1) ? &obstacle.at(0) : &obstacle.at(i + 1);
-			obstacle[i].prev = (i == 0) ? &obstacle.at(obstacle.size() - 1) : &obstacle.at(i - 1);
-		}
-	}
+	LinkObstacles();
 }
 
 
@@ -62,8 +38,11 @@ Map::Map(const Map &obj) {
 	cellSize = obj.cellSize;
 	grid = (obj.grid == nullptr) ? nullptr : new std::vector<std::vector<int>>(*obj.grid);
 	obstacles = (obj.obstacles == nullptr) ? nullptr : new std::vector<std::vector<ObstacleSegment>>(*obj.obstacles);
+	dynamicObstacles = obj.dynamicObstacles;
+	staticSegmentsNum = obj.staticSegmentsNum;
 	height = obj.height;
 	width = obj.width;
+	LinkObstacles();
 }
 
 
@@ -140,6 +119,48 @@ const std::vector<std::vector<ObstacleSegment>> &Map::GetObstacles() const {
 	return *obstacles;
 }
 
+
+const std::vector<std::vector<ObstacleSegment>> &Map::GetDynamicObstacles() const {
+	return dynamicObstacles;
+}
+
+
+void Map::SetDynamicObstacles(const std::vector<std::vector<Point>> &obstacles) {
+	// Segment IDs continue after the static ones, the grid is left untouched so global paths ignore these obstacles
+	int idCounter = staticSegmentsNum;
+	dynamicObstacles.clear();
+	for (auto &obstacle: obstacles) {
+		if (obstacle.size() < 2) {
+			continue;
+		}
+		dynamicObstacles.push_back(MakeObstacle(obstacle, idCounter));
+	}
+	LinkObstacles();
+}
+
+
+std::vector<ObstacleSegment> Map::MakeObstacle(const std::vector<Point> &obstacle, int &idCounter) {
+	bool rCvx = true, lCvx;
+	std::vector<ObstacleSegment> tmpObstacle;
+	for (int i = 0; i < obstacle.size(); i++) {
+		Vertex left = obstacle[(i == 0 ? obstacle.size() - 1 : i - 1)];
+		Vertex right = obstacle[i];
+		Vertex next = obstacle[(i == obstacle.size() - 1 ? 0 : i + 1)];
+		lCvx = rCvx;
+		rCvx = true;
+		if (obstacle.size() > 2) {
+			rCvx = (left - next).Det(right - left) >= 0.0f;
+		}
+		right.SetConvex(rCvx);
+		left.SetConvex(lCvx);
+
+		tmpObstacle.emplace_back(ObstacleSegment(idCounter, left, right));
+		idCounter++;
+	}
+	tmpObstacle[0].left.SetConvex(rCvx);
+	return tmpObstacle;
+}
+
 Map &Map::operator=(const Map &obj) {
 	if (this != &obj) {
 		cellSize = obj.cellSize;
@@ -156,11 +177,30 @@ Map &Map::operator=(const Map &obj) {
 		}
 		obstacles = (obj.obstacles == nullptr) ? nullptr : new std::vector<std::vector<ObstacleSegment>>(
 				*obj.obstacles);
+		dynamicObstacles = obj.dynamicObstacles;
+		staticSegmentsNum = obj.staticSegmentsNum;
+		LinkObstacles();
 	}
 	return *this;
 }
 
 
+void Map::LinkObstacles() {
+	// Copied segments still point to the neighbours of the source map, so the links are rebuilt on every copy
+	for (auto segments: {obstacles, &dynamicObstacles}) {
+		if (segments == nullptr) {
+			continue;
+		}
+		for (auto &obstacle: (*segments)) {
+			for (int i = 0; i < obstacle.size(); i++) {
+				obstacle[i].next = (i == obstacle.size() - 1) ? &obstacle.at(0) : &obstacle.at(i + 1);
+				obstacle[i].prev = (i == 0) ? &obstacle.at(obstacle.size() - 1) : &obstacle.at(i - 1);
+			}
+		}
+	}
+}
+
+
 
 
 
@@ -2,8 +2,12 @@
 
 
 Mission::Mission(std::string &xml_data, unsigned int agentsNum, unsigned int stepsTh, bool time, size_t timeTh,
+				 bool speedStop) : Mission(new XMLReader(xml_data), agentsNum, stepsTh, time, timeTh, speedStop) {}
+
+
+Mission::Mission(Reader *reader, unsigned int agentsNum, unsigned int stepsTh, bool time, size_t timeTh,
 				 bool speedStop) {
-	taskReader = new XMLReader(xml_data);
+	taskReader = reader;
 	agents = vector<Agent *>();
 	this->agentsNum = agentsNum;
 	stepsTreshhold = stepsTh;
@@ -447,4 +451,9 @@ unordered_map<int, trajectory_dict> Mission::save_dict() {
 	// taskLogger->SetSummary(missionResult);
 	// taskLogger->GenerateLog();
 	return traceDict;
-}
\ No newline at end of file
+}
+
+
+const std::unordered_map<int, std::vector<Point>> &Mission::GetStepsLog() const {
+	return stepsLog;
+}
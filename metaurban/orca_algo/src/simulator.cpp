@@ -0,0 +1,163 @@
+#include "simulator.h"
+
+
+Simulator::Simulator(Reader *reader, unsigned int agentsNum, unsigned int stepsTh, bool speedStop) {
+	taskReader = reader;
+	agents = std::vector<Agent *>();
+	this->agentsNum = agentsNum;
+	stepsTreshhold = stepsTh;
+	stopByMeanSpeed = speedStop;
+
+	map = nullptr;
+	options = nullptr;
+	stepsCount = 0;
+	allStops = false;
+	finished = false;
+	commonSpeedsBuffer = std::vector<std::list<float>>(agentsNum, std::list<float>(COMMON_SPEED_BUFF_SIZE, 1.0));
+}
+
+
+Simulator::~Simulator() {
+	for (auto &agent: agents) {
+		if (agent != nullptr) {
+			delete agent;
+			agent = nullptr;
+		}
+	}
+
+	if (map != nullptr) {
+		delete map;
+		map = nullptr;
+	}
+
+	if (options != nullptr) {
+		delete options;
+		options = nullptr;
+	}
+
+	if (taskReader != nullptr) {
+		delete taskReader;
+		taskReader = nullptr;
+	}
+}
+
+
+bool Simulator::ReadTask() {
+	if (!(taskReader->ReadData() && taskReader->GetMap(&map) && taskReader->GetAgents(agents, this->agentsNum) &&
+		  taskReader->GetEnvironmentOptions(&options))) {
+		return false;
+	}
+
+	for (auto agent: agents) {
+		agent->InitPath();
+	}
+	return true;
+}
+
+
+bool Simulator::Step() {
+	/* One iteration of the Mission::StartMission loop, returns true once the task would have been stopped there */
+	if (finished) {
+		return true;
+	}
+
+	AssignNeighbours();
+
+	for (auto &agent: agents) {
+		agent->UpdatePrefVelocity();
+	}
+
+	for (auto &agent: agents) {
+		agent->ComputeNewVelocity();
+	}
+
+	UpdateSate();
+
+	bool allFinished = true;
+	for (auto &agent: agents) {
+		allFinished = allFinished && agent->isFinished();
+	}
+	finished = allFinished || (stopByMeanSpeed && allStops) || stepsCount >= stepsTreshhold;
+	return finished;
+}
+
+
+bool Simulator::IsDone() const {
+	return finished;
+}
+
+
+bool Simulator::SetGoal(unsigned int index, const Point &goal) {
+	if (index >= agents.size()) {
+		return false;
+	}
+
+	/* The agent is considered to be moving again, so the task is not stopped before it starts to accelerate */
+	commonSpeedsBuffer[index] = std::list<float>(COMMON_SPEED_BUFF_SIZE, 1.0);
+	allStops = false;
+	finished = false;
+	stepsCount = 0;
+	return agents[index]->SetGoal(goal);
+}
+
+
+void Simulator::SetDynamicObstacles(const std::vector<std::vector<Point>> &obstacles) {
+	map->SetDynamicObstacles(obstacles);
+}
+
+
+const std::vector<Agent *> &Simulator::GetAgents() const {
+	return agents;
+}
+
+
+unsigned int Simulator::GetStepsCount() const {
+	return stepsCount;
+}
+
+
+void Simulator::UpdateSate() {
+	size_t i = 0;
+	allStops = true;
+
+	for (auto &agent: agents) {
+		agent->ApplyNewVelocity();
+		Point newPos = agent->GetPosition() + (agent->GetVelocity() * options->timestep);
+		agent->SetPosition(newPos);
+		commonSpeedsBuffer[i].pop_front();
+		commonSpeedsBuffer[i].push_back(agent->GetVelocity().EuclideanNorm());
+
+		float sum = 0.0f;
+		float c = 0.0f;
+		float y, t;
+		float mean;
+		for (auto speed: commonSpeedsBuffer[i]) {
+			y = speed - c;
+			t = sum + y;
+			c = (t - sum) - y;
+			sum = t;
+		}
+		mean = sum / commonSpeedsBuffer[i].size();
+
+		if (mean >= MISSION_SMALL_SPEED) {
+			allStops = false;
+		}
+		i++;
+	}
+
+	stepsCount++;
+}
+
+
+void Simulator::AssignNeighbours() {
+	for (auto &agent: agents) {
+
+		for (auto &neighbour: agents) {
+			if (agent != neighbour) {
+				float distSq = (agent->GetPosition() - neighbour->GetPosition()).SquaredEuclideanNorm();
+				agent->AddNeighbour(*neighbour, distSq);
+			}
+		}
+		agent->UpdateNeighbourObst();
+	}
+}
@@ -335,6 +335,12 @@ ThetaStar &ThetaStar::operator=(const ThetaStar &obj) {
 	return *this;
 }
 
+void ThetaStar::SetTask(const Point &start, const Point &goal) {
+	// Drops the current path and the search state, CreateGlobalPath has to be called again
+	*this = ThetaStar(*map, *options, start, goal, radius);
+}
+
+
 ThetaStar *ThetaStar::Clone() const {
 	return new ThetaStar(*this);
 }
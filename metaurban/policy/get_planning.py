@@ -1,3 +1,7 @@
+import atexit
+import hashlib
+from collections import OrderedDict
+
 import numpy as np
 import xml.etree.ElementTree as ET
 import multiprocessing
@@ -7,6 +11,17 @@ import metaurban.policy.orca_planner_utils as orca_planner_utils
 from skimage import measure
 import time
 
+# Static obstacle model of the latest maps, keyed by (map seed, mask hash). Only agents change between replans
+MAX_CACHED_PLANNING_MAPS = 16
+_planning_maps = OrderedDict()
+
+# Steps simulated ahead of the consumer by a PlanningSimulation
+PLANNING_HORIZON = 10
+
+# Persistent worker processes planning several environments at once, see get_planning(num_workers=...)
+_planning_pool = None
+_planning_pool_size = 0
+
 
 def generate_template_xml(mask):
     cellsize = 1
@@ -23,6 +38,47 @@ def generate_template_xml(mask):
     return root
 
 
+def generate_planning_map(mask):
+    grid = orca_planner_utils.mask_to_grid(mask)
+    h = grid.shape[0]
+    contours = measure.find_contours(grid, 0.5, positive_orientation='high')
+
+    flipped_contours = []
+    for contour in contours:
+        contour = orca_planner_utils.find_tuning_point(contour, h)
+        flipped_contours.append(contour)
+    return grid, orca_planner_utils.contours_to_obstacles(flipped_contours)
+
+
+def get_planning_map(mask, map_seed=None):
+    """
+    Return the bind.PlanningMap of this walkable region mask. The contours and the grid are only extracted the first
+    time a (map_seed, mask) pair is seen, later calls reuse the cached one.
+    """
+    mask = np.ascontiguousarray(mask)
+    key = (map_seed, mask.shape, hashlib.md5(mask.data).hexdigest())
+    if key in _planning_maps:
+        _planning_maps.move_to_end(key)
+        return _planning_maps[key]
+    grid, obstacles = generate_planning_map(mask)
+    planning_map = bind.PlanningMap(grid, obstacles)
+    _planning_maps[key] = planning_map
+    if len(_planning_maps) > MAX_CACHED_PLANNING_MAPS:
+        _planning_maps.popitem(last=False)
+    return planning_map
+
+
+def clear_planning_maps():
+    _planning_maps.clear()
+
+
+def get_time_length(positions):
+    ## number of steps before each agent stays at the same position for the first time
+    stopped = np.all(positions[1:] == positions[:-1], axis=2)
+    first_stop = np.argmax(stopped, axis=0) + 1
+    return np.where(np.any(stopped, axis=0), first_stop, len(positions)).tolist()
+
+
 def get_speed(start_positions, positions):
     pos1 = positions[:-1]
     pos2 = positions[1:]
@@ -56,46 +112,115 @@ def set_agents(start_positions, goals, root):
         agents.append(agent)
 
 
-def run_planning(start_positions, goals, mask, num_agent, thread_id, results):
-    root = generate_template_xml(mask)
-    set_agents(start_positions, goals, root)
-    xml_string = ET.tostring(root, encoding='unicode')
-    result = bind.demo(xml_string, num_agent)
-    nexts = []
-    time_length_list = []
-    for v in result.values():
-        nextxr = np.array(v.xr)  #[:min_total_step]
-        nextyr = np.array(v.yr)  #[:min_total_step]
-        nextr = np.stack([nextxr, nextyr], axis=1)
-        nexts.append(nextr)
-
-        time_length = 0
-        last_x, last_y = None, None
-        flag = False
-        for x, y in zip(nextxr, nextyr):
-            if x == last_x and y == last_y:
-                time_length_list.append(time_length)
-                flag = True
-                break
-            else:
-                last_x, last_y = x, y
-                time_length += 1
-        if not flag:
-            time_length_list.append(time_length)
-    nexts = np.stack(nexts, axis=1)
+def run_planning(start_positions, goals, mask, num_agent, thread_id, results, map_seed=None):
+    planning_map = get_planning_map(mask, map_seed)
+    starts = np.asarray(start_positions, dtype=np.float32).reshape(-1, 2)
+    goals = np.asarray(goals, dtype=np.float32).reshape(-1, 2) + 0.5  # magic number
+    nexts = bind.plan_on_map(planning_map, starts, goals, "orca-par")
+    time_length_list = get_time_length(nexts)
     speed = get_speed(start_positions, nexts)
-    earliest_stop_pos = list(nexts)[-1]
-    #print(f"Before assignment, results type: {type(results)}")
-    #result = {key: convert_to_dict(value) for key, value in result.items()}
-    #results[thread_id] = result
+    earliest_stop_pos = nexts[-1]
     results[thread_id] = (nexts, time_length_list, speed, earliest_stop_pos)
-    #print(f"After assignment, results type: {type(results)}")
 
 
-def get_planning(start_positions_list, masks, goals_list, num_agent_list, num_envs, roots=None):
+class PlanningSimulation:
+    """
+    Receding horizon counterpart of run_planning. The agents are only simulated `horizon` steps ahead of the consumer,
+    and iterating it yields the same (positions, speed) rows as the nexts and speed of run_planning. Goals and moving
+    obstacles can be changed meanwhile, they take effect after the steps which are already simulated.
+    """
+    def __init__(self, start_positions, goals, mask, map_seed=None, horizon=PLANNING_HORIZON):
+        starts = np.asarray(start_positions, dtype=np.float32).reshape(-1, 2)
+        goals = np.asarray(goals, dtype=np.float32).reshape(-1, 2) + 0.5  # magic number
+        self.horizon = horizon
+        self.simulator = bind.Simulator(get_planning_map(mask, map_seed), starts, goals, "orca-par")
+        self._positions = self.simulator.positions[None]
+        self._index = 0
+        self._last_positions = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._index == len(self._positions):
+            if self.simulator.done:
+                raise StopIteration
+            self._positions = self.simulator.step(self.horizon)
+            self._index = 0
+        positions = self._positions[self._index]
+        self._index += 1
+        if self._last_positions is None:
+            speed = np.zeros(len(positions))
+        else:
+            speed = np.linalg.norm(positions - self._last_positions, axis=1)
+        self._last_positions = positions
+        return positions, speed
+
+    def set_goal(self, index, goal):
+        return self.simulator.set_goal(index, (goal[0] + 0.5, goal[1] + 0.5))
+
+    def set_dynamic_obstacles(self, positions, radius):
+        ## e.g. the ego robot, avoided by the agents but not by their global paths
+        self.simulator.set_dynamic_obstacles(
+            [orca_planner_utils.disc_to_obstacle(position, radius) for position in positions]
+        )
+
+
+def _run_planning_in_worker(start_positions, goals, mask, num_agent, map_seed):
+    results = [None]
+    run_planning(start_positions, goals, mask, num_agent, 0, results, map_seed=map_seed)
+    return results[0]
+
+
+def get_planning_pool(num_workers):
+    """
+    Return the process pool used for planning, it is created once and kept alive, so that each worker also keeps its
+    own planning map cache across calls. Workers are spawned instead of forked to not inherit the engine state.
+    """
+    global _planning_pool, _planning_pool_size
+    if _planning_pool is not None and _planning_pool_size != num_workers:
+        close_planning_pool()
+    if _planning_pool is None:
+        _planning_pool = multiprocessing.get_context("spawn").Pool(num_workers)
+        _planning_pool_size = num_workers
+    return _planning_pool
+
+
+def close_planning_pool():
+    global _planning_pool, _planning_pool_size
+    if _planning_pool is not None:
+        _planning_pool.terminate()
+        _planning_pool.join()
+        _planning_pool = None
+        _planning_pool_size = 0
+
+
+atexit.register(close_planning_pool)
+
+
+def get_planning(
+    start_positions_list, masks, goals_list, num_agent_list, num_envs, roots=None, map_seeds=None, num_workers=1
+):
+    """
+    Plan the agents of num_envs environments. With num_workers > 1, the environments are planned in parallel by a
+    persistent process pool, otherwise they are planned one by one in this process.
+    """
     results = [None] * num_envs
-    for i in range(num_envs):
-        run_planning(start_positions_list[i], goals_list[i], masks[i], num_agent_list[i], i, results)
+    if map_seeds is None:
+        map_seeds = [None] * num_envs
+    if num_workers > 1 and num_envs > 1:
+        pool = get_planning_pool(num_workers)
+        results = pool.starmap(
+            _run_planning_in_worker, [
+                (start_positions_list[i], goals_list[i], masks[i], num_agent_list[i], map_seeds[i])
+                for i in range(num_envs)
+            ]
+        )
+    else:
+        for i in range(num_envs):
+            run_planning(
+                start_positions_list[i], goals_list[i], masks[i], num_agent_list[i], i, results, map_seed=map_seeds[i]
+            )
 
     nexts_list = []
     time_length_lists = []
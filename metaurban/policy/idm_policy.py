@@ -236,7 +236,9 @@ class IDMPolicy(BasePolicy):
     def act(self, *args, **kwargs):
         # concat lane
         success = self.move_to_next_road()
-        all_objects = self.control_object.lidar.get_surrounding_objects(self.control_object)
+        all_objects = self.control_object.lidar.get_surrounding_objects(
+            self.control_object, neighbor_index=self.get_neighbor_index()
+        )
         try:
             if success and self.enable_lane_change:
                 # perform lane change due to routing
@@ -267,6 +269,12 @@ class IDMPolicy(BasePolicy):
         self.action_info["action"] = action
         return action
 
+    def get_neighbor_index(self):
+        """
+        The snapshot of surrounding objects shared by all traffic vehicles in this step, or None if it is not built
+        """
+        return getattr(getattr(self.engine, "traffic_manager", None), "neighbor_index", None)
+
     def move_to_next_road(self):
         # routing target lane is in current ref lanes
         current_lanes = self.control_object.navigation.current_ref_lanes
@@ -476,7 +484,9 @@ class TrajectoryIDMPolicy(IDMPolicy):
         # concat lane
         try:
             if do_speed_control:
-                all_objects = self.control_object.lidar.get_surrounding_objects(self.control_object)
+                all_objects = self.control_object.lidar.get_surrounding_objects(
+                    self.control_object, neighbor_index=self.get_neighbor_index()
+                )
                 # can not find routing target lane
                 surrounding_objects = FrontBackObjects.get_find_front_back_objs_single_lane(
                     all_objects, self.routing_target_lane, self.control_object.position, max_distance=self.IDM_MAX_DIST
@@ -8,6 +8,7 @@ logger = get_logger()
 # import bind
 import numpy as np
 import math
+import random
 
 from PIL import Image, ImageOps
 import xml.etree.ElementTree as ET
@@ -123,6 +124,81 @@ def mask_to_2d_list(mask):
     return binary_list, h, w
 
 
+def mask_to_grid(mask):
+    ## get occupancy grid (1 for obstacles) as uint8 array, same values as mask_to_2d_list
+    img = Image.fromarray(mask).convert('L')
+    return (np.asarray(img) < 128).astype(np.uint8)
+
+
+def contours_to_obstacles(flipped_contours):
+    ## obstacle vertices as float32 arrays, truncated to integers as write_to_xml does
+    return [np.trunc(np.asarray(contour, dtype=np.float64)).astype(np.float32) for contour in flipped_contours]
+
+
+def disc_to_obstacle(position, radius, num_vertices=8):
+    ## counter-clockwise polygon enclosing a disc, the vertex order ORCA expects for an obstacle seen from outside
+    angles = np.linspace(0, 2 * np.pi, num_vertices, endpoint=False)
+    radius = radius / np.cos(np.pi / num_vertices)
+    polygon = np.stack([position[0] + radius * np.cos(angles), position[1] + radius * np.sin(angles)], axis=1)
+    return polygon.astype(np.float32)
+
+
+def walkable_candidates(map_mask):
+    ## (x, y) pixels whose 8 neighbours are all walkable, the center one excluded, in row-major order
+    walkable = np.pad(map_mask == 255, 1, constant_values=False)
+    h, w = map_mask.shape
+    interior = np.ones((h, w), dtype=bool)
+    for di in range(3):
+        for dj in range(3):
+            if di != 1 or dj != 1:
+                interior &= walkable[di:di + h, dj:dj + w]
+
+    ## contour vertices are dropped with their coordinates read as (column, row) = (y, x), as it was always done
+    grid = mask_to_grid(map_mask)
+    for contour in measure.find_contours(grid, 0.5, positive_orientation='high'):
+        contour = find_tuning_point(contour, h)
+        if len(contour) == 0:
+            continue
+        rows, cols = contour[:, 0].astype(int), contour[:, 1].astype(int)
+        inside = (rows < h) & (cols < w)
+        interior[rows[inside], cols[inside]] = False
+    rows, cols = np.nonzero(interior)
+    return np.stack([cols, rows], axis=1)
+
+
+def sample_walkable_points(map_mask, num, min_dis=5, generated_position=None):
+    """
+    Uniformly sample num walkable points, at least min_dis apart from each other, for spawning agents. The returned
+    points are (x, h - 1 - y) as the planner expects. With generated_position, only the farthest tenth of the
+    candidates from it is used. Candidates are drawn with the random module, like random.choice did before.
+    """
+    h = map_mask.shape[0]
+    candidates = walkable_candidates(map_mask)
+    if generated_position is not None:
+        flipped = np.stack([candidates[:, 0], h - 1 - candidates[:, 1]], axis=1)
+        dis_to_start = np.linalg.norm(flipped - generated_position, axis=1)
+        candidates = candidates[np.argsort(dis_to_start)[::-1]][:int(len(candidates) / 10)]
+    if len(candidates) < num:
+        raise ValueError(" Walkable points are less than spawn number! ")
+
+    ## selected points hashed by (x, y) // min_dis, any point closer than min_dis is in one of the 9 nearby cells
+    cells = {}
+    selected_pts = []
+    try_time = 0
+    while len(selected_pts) < num:
+        if try_time > 10000:
+            raise ValueError("Try too many time to get valid humanoid points!")
+        try_time += 1
+        x, y = candidates[random.randrange(len(candidates))].tolist()
+        cx, cy = int(x // min_dis), int(y // min_dis)
+        if any(math.dist((x, y), pt) < min_dis for i in (cx - 1, cx, cx + 1) for j in (cy - 1, cy, cy + 1)
+               for pt in cells.get((i, j), ())):
+            continue
+        cells.setdefault((cx, cy), []).append((x, y))
+        selected_pts.append((x, y))
+    return [(x, h - 1 - y) for x, y in selected_pts]
+
+
 def find_tuning_point(contour, h):
     unique_pt = []
     filtered_contour = []
@@ -0,0 +1,32 @@
+from metaurban.engine.actor_pool import ActorPool
+
+ACTOR_PATH = "models/panda-model"
+ANIMS = {"walk": "models/panda-walk4"}
+
+
+def test_actor_pool():
+    """
+    Released actors are reused with their animations loaded, up to the per-model cap
+    """
+    ActorPool.clear()
+    actor = ActorPool.acquire(ACTOR_PATH, ANIMS)
+    assert actor.getAnimNames() == ["walk"]
+    actor.setPos(1, 2, 3)
+    actor.loop("walk")
+    ActorPool.release(actor, ACTOR_PATH, ANIMS)
+    assert ActorPool.get_num_actors(ACTOR_PATH, ANIMS) == 1
+    reused = ActorPool.acquire(ACTOR_PATH, dict(ANIMS))
+    assert reused is actor and reused.getPos() == (0, 0, 0) and reused.getCurrentAnim() is None
+    assert ActorPool.get_num_actors(ACTOR_PATH, ANIMS) == 0
+
+    ActorPool.warm_up(ACTOR_PATH, ANIMS, num=3, max_actors_per_model=2)
+    assert ActorPool.get_num_actors(ACTOR_PATH, ANIMS) == 2
+    ActorPool.release(reused, ACTOR_PATH, ANIMS, max_actors_per_model=2)
+    assert ActorPool.get_num_actors(ACTOR_PATH, ANIMS) == 2
+    assert ActorPool.get_num_actors(ACTOR_PATH, {"run": "models/panda-walk4"}) == 0
+    ActorPool.clear()
+    assert ActorPool.get_num_actors(ACTOR_PATH, ANIMS) == 0
+
+
+if __name__ == '__main__':
+    test_actor_pool()
@@ -0,0 +1,156 @@
+import json
+import os
+import random
+from types import SimpleNamespace
+
+import numpy as np
+
+from metaurban.component.lane.straight_lane import StraightLane
+from metaurban.component.road_network.node_road_network import NodeRoadNetwork
+from metaurban.constants import PGLineType
+from metaurban.engine.base_engine import BaseEngine
+from metaurban.manager.asset_manifest import clear_asset_metainfos
+from metaurban.manager.read_config import configReader
+from metaurban.manager.sidewalk_manager import AssetManager
+
+# detail type: (number of assets, length, width)
+_ASSETS = dict(Tree=(2, 2, 2), Lamp_post=(2, 1, 1), TrashCan=(1, 1, 1), Mailbox=(2, 1, 1), Bench=(2, 2, 1))
+
+
+def _write_metainfos(folder):
+    for detail_type, (num, length, width) in _ASSETS.items():
+        for i in range(num):
+            file_name = "{}_{}.json".format(detail_type, i)
+            general = dict(detail_type=detail_type, length=length, width=width)
+            with open(os.path.join(folder, file_name), "w") as file:
+                json.dump(dict(filename=file_name, CLASS_NAME=file_name, general=general), file)
+
+
+def _make_engine(cache_asset_layout):
+    """
+    An engine with a map of one straight block with a ribbon sidewalk, where spawned objects are recorded
+    """
+    road_network = NodeRoadNetwork()
+    positive_lane = StraightLane([0, 0], [120, 0], 3.5, [PGLineType.BROKEN, PGLineType.SIDE])
+    negative_lane = StraightLane([120, -3.5], [0, -3.5], 3.5, [PGLineType.BROKEN, PGLineType.SIDE])
+    positive_lane.index, negative_lane.index = ("a", "b", 0), ("-b", "-a", 0)
+    road_network.add_lane("a", "b", positive_lane)
+    road_network.add_lane("-b", "-a", negative_lane)
+    block = SimpleNamespace(
+        ID="S",
+        positive_basic_lane=positive_lane,
+        negative_basic_lane=negative_lane,
+        sidewalk_type="Ribbon Sidewalk",
+        near_road_buffer_width=None,
+        near_road_width=2.,
+        main_width=3.,
+        far_from_buffer_width=None,
+        far_from_width=3.,
+        valid_house_width=8.
+    )
+    current_map = SimpleNamespace(
+        blocks=[block],
+        road_network=road_network,
+        crosswalks={},
+        sidewalks={},
+        sidewalks_near_road={},
+        sidewalks_farfrom_road={},
+        sidewalks_near_road_buffer={},
+        sidewalks_farfrom_road_buffer={},
+        valid_region={},
+        get_walkable_regions_mask=lambda mask_delta, flip: (np.full((100, 180, 3), 255, np.uint8), np.array([30, 30]))
+    )
+    spawned = []
+
+    def spawn_object(object_class, **kwargs):
+        spawned.append(kwargs)
+        return SimpleNamespace(id=len(spawned))
+
+    engine = SimpleNamespace(
+        global_seed=0,
+        global_random_seed=0,
+        global_config=dict(object_density=0.5, cache_asset_layout=cache_asset_layout, static_traffic_object=True),
+        current_map=current_map,
+        map_manager=SimpleNamespace(current_map=current_map),
+        spawn_object=spawn_object,
+        clear_objects=lambda *args, **kwargs: [],
+        spawned=spawned
+    )
+    return engine
+
+
+def _reset(manager, seed):
+    """
+    Reset with the seed, returning the spawned objects, the layout and the state of random generators afterwards
+    """
+    engine = manager.engine
+    engine.global_seed = seed
+    manager.before_reset()
+    engine.spawned.clear()
+    manager.reset()
+    objects = [
+        (kwargs["asset_metainfo"], kwargs["lane"].index, tuple(kwargs["position"]), kwargs["heading_theta"])
+        for kwargs in engine.spawned
+    ]
+    return dict(
+        objects=objects,
+        object_polygons=manager.all_object_polygons,
+        placed_types=manager.placed_types,
+        walkable_regions_mask=engine.walkable_regions_mask,
+        random_state=random.getstate(),
+        np_random_state=np.random.get_state()
+    )
+
+
+def _assert_same_reset(result, expected):
+    assert result["objects"] == expected["objects"]
+    assert result["object_polygons"] == expected["object_polygons"]
+    assert result["placed_types"] == expected["placed_types"]
+    assert np.array_equal(result["walkable_regions_mask"], expected["walkable_regions_mask"])
+    assert result["random_state"] == expected["random_state"]
+    assert all(np.array_equal(a, b) for a, b in zip(result["np_random_state"], expected["np_random_state"]))
+
+
+def test_asset_layout_cache(tmp_path, monkeypatch):
+    """
+    Resetting with a seed used before replays its layout, which spawns the same objects and leaves the random
+    generators in the same state as generating the layout again on the sidewalks of the map
+    """
+    folder = str(tmp_path)
+    _write_metainfos(folder)
+    load_path = configReader.loadPath
+    monkeypatch.setattr(configReader, "loadPath", lambda self: dict(load_path(self), adj_parameter_folder=folder))
+    clear_asset_metainfos()
+    engine = BaseEngine.singleton
+    try:
+        results = {}
+        for cache_asset_layout in [True, False]:
+            BaseEngine.singleton = _make_engine(cache_asset_layout)
+            manager = AssetManager()
+            generate_layout, generations = manager.generate_layout, []
+            manager.generate_layout = lambda: generations.append(1) or generate_layout()
+
+            first, other = _reset(manager, seed=1), _reset(manager, seed=2)
+            assert len(first["objects"]) > 0 and first["objects"] != other["objects"]
+            _assert_same_reset(_reset(manager, seed=1), first)
+            _assert_same_reset(_reset(manager, seed=2), other)
+            if cache_asset_layout:
+                assert len(generations) == 2 and len(manager.layout_cache) == 2
+            else:
+                assert len(generations) == 4 and len(manager.layout_cache) == 0
+            results[cache_asset_layout] = first, other
+
+        # the layouts replayed with the cache are the ones generated without it
+        for result, expected in zip(results[True], results[False]):
+            _assert_same_reset(result, expected)
+    finally:
+        BaseEngine.singleton = engine
+        clear_asset_metainfos()
+
+
+if __name__ == '__main__':
+    import pathlib
+    import tempfile
+    import pytest
+    with tempfile.TemporaryDirectory() as tmp_dir, pytest.MonkeyPatch.context() as mp:
+        test_asset_layout_cache(pathlib.Path(tmp_dir), mp)
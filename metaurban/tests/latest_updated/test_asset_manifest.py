@@ -0,0 +1,58 @@
+import json
+import os
+import time
+
+from metaurban.manager.asset_manifest import load_manifest, get_manifest_path, get_asset_metainfos, \
+    clear_asset_metainfos
+
+
+def _write_metainfo(folder, file_name, detail_type, width=1.):
+    with open(os.path.join(folder, file_name), "w") as file:
+        json.dump(dict(filename=file_name, general=dict(detail_type=detail_type, width=width)), file)
+
+
+def _walk(folder):
+    ret = []
+    for root, _, files in os.walk(folder):
+        for file_name in files:
+            with open(os.path.join(root, file_name), "r") as file:
+                ret.append((os.path.relpath(os.path.join(root, file_name), folder), json.load(file)))
+    return ret
+
+
+def test_asset_manifest(tmp_path):
+    """
+    The manifest holds the same metainfo as walking the folder, and follows added, removed and modified files
+    """
+    folder = str(tmp_path / "adj_parameter_folder")
+    os.makedirs(os.path.join(folder, "bench"))
+    for i in range(5):
+        _write_metainfo(folder, "car_{}.json".format(i), "car")
+        _write_metainfo(os.path.join(folder, "bench"), "bench_{}.json".format(i), "Bench")
+    header, entries = load_manifest(folder)
+    assert os.path.isfile(get_manifest_path(folder))
+    assert [(entry["file"], entry["metainfo"]) for entry in entries] == _walk(folder)
+
+    # an unchanged folder is not parsed again
+    assert load_manifest(folder) == (header, entries)
+
+    time.sleep(0.01)
+    os.remove(os.path.join(folder, "car_0.json"))
+    _write_metainfo(os.path.join(folder, "bench"), "bench_5.json", "Bench")
+    _write_metainfo(os.path.join(folder, "bench"), "bench_1.json", "Bench", width=2.)
+    new_header, new_entries = load_manifest(folder)
+    assert sorted((entry["file"], entry["metainfo"]) for entry in new_entries) == sorted(_walk(folder))
+    assert new_header["hash"] != header["hash"]
+    assert load_manifest(folder, rebuild=True)[0]["hash"] == new_header["hash"]
+
+    clear_asset_metainfos()
+    metainfos = get_asset_metainfos(folder)
+    assert get_asset_metainfos(folder) is metainfos and len(metainfos) == 10
+    clear_asset_metainfos()
+
+
+if __name__ == '__main__':
+    import pathlib
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_asset_manifest(pathlib.Path(tmp_dir))
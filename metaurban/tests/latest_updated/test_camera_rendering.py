@@ -0,0 +1,122 @@
+import numpy as np
+from panda3d.core import loadPrcFileData, CardMaker
+
+from metaurban.component.sensors.base_camera import BaseCamera
+from metaurban.component.sensors.depth_camera import DepthCamera
+from metaurban.constants import CamMask
+from metaurban.engine.core.sensor_scheduler import SensorScheduler
+
+
+class _Camera(BaseCamera):
+    CAM_MASK = CamMask.RgbCam
+    BUFFER_W = 32
+    BUFFER_H = 24
+
+
+def _make_engine():
+    loadPrcFileData("", "window-type offscreen")
+    loadPrcFileData("", "audio-library-name null")
+    from direct.showbase.ShowBase import ShowBase
+    engine = ShowBase()
+    engine.global_config = dict(camera_fov=65)
+    engine.sensors = {}
+    engine.sensor_scheduler = SensorScheduler(engine)
+    # a red card in front of the cameras, which are looking along +y
+    card = engine.render.attachNewNode(CardMaker("card").generate())
+    card.setPos(-0.5, 5, -0.5)
+    card.setColor(1, 0, 0, 1)
+    return engine
+
+
+def test_camera_render_once():
+    """
+    Perceiving from a new pose renders this camera only once, and the result matches the image of a full engine frame
+    """
+    engine = _make_engine()
+    try:
+        camera, other = _Camera(engine), _Camera(engine)
+        engine.sensors.update(camera=camera, other=other)
+        engine.graphicsEngine.renderFrame()
+        looking_at_card = camera.perceive(False)
+        assert looking_at_card[12, 16].tolist() == [0, 0, 255]
+
+        other_image = other.perceive(False).copy()
+        other.cam.setH(180)
+        # turning around, the card is not in the view
+        image = camera.perceive(False, engine.render, (0, 0, 0), (180, 0, 0))
+        assert image[12, 16].tolist() != [0, 0, 255]
+        # the other camera is not rendered, and the main window is active again
+        assert np.array_equal(other.perceive(False), other_image) and engine.win.isActive()
+
+        engine.graphicsEngine.renderFrame()
+        assert np.array_equal(other.perceive(False), image)
+
+        out = np.zeros(looking_at_card.shape, dtype=np.float32)
+        assert camera.perceive(True, engine.render, (0, 0, 0), (0, 0, 0), out=out) is out
+        assert np.array_equal(out, (looking_at_card / 255).astype(np.float32))
+    finally:
+        engine.destroy()
+
+
+def test_depth_camera_perceive_copy():
+    """
+    A depth image kept by the caller is not changed by rendering the camera again
+    """
+    engine = _make_engine()
+    try:
+        camera = DepthCamera(32, 24, engine)
+        engine.sensors["depth"] = camera
+        engine.graphicsEngine.renderFrame()
+        image = camera.perceive(True)
+        looking_at_card = image.copy()
+        assert image[12, 16, 0] < 1.0
+
+        # turning around, the card is not in the view
+        new_image = camera.perceive(True, engine.render, (0, 0, 0), (180, 0, 0))
+        assert not np.array_equal(new_image, looking_at_card)
+        assert np.array_equal(image, looking_at_card) and not np.shares_memory(image, new_image)
+    finally:
+        engine.destroy()
+
+
+class _CountingGraphicsEngine:
+    def __init__(self, graphics_engine):
+        self.graphics_engine = graphics_engine
+        self.num_frames = 0
+
+    def renderFrame(self):
+        self.num_frames += 1
+        self.graphics_engine.renderFrame()
+
+
+def test_sensor_scheduler_capture():
+    """
+    Requests of different cameras are rendered in one frame, and give the same images as perceiving one by one
+    """
+    engine = _make_engine()
+    try:
+        cameras = [_Camera(engine) for _ in range(3)] + [DepthCamera(32, 24, engine)]
+        engine.sensors.update({"camera_{}".format(i): camera for i, camera in enumerate(cameras)})
+        poses = [(0, 0, 0), (180, 0, 0), (20, 0, 0), (0, 0, 0), (0, 0, 0)]
+        requests = [(camera, engine.render, (0, 0, 0), hpr) for camera, hpr in zip(cameras + cameras[:1], poses)]
+        expected = [camera.perceive(True, *pose) for camera, *pose in requests]
+        original_hpr = cameras[0].cam.getHpr()
+
+        graphics_engine = _CountingGraphicsEngine(engine.graphicsEngine)
+        engine.graphicsEngine = graphics_engine
+        images = engine.sensor_scheduler.capture(requests)
+        # the first camera is requested twice, so it takes two frames
+        assert graphics_engine.num_frames == 2
+        assert all(np.array_equal(image, e) for image, e in zip(images, expected))
+        assert images[0][12, 16].tolist() == [0, 0, 1] and images[1][12, 16].tolist() != [0, 0, 1]
+        assert images[3].shape == (24, 32, 1) and images[3][12, 16, 0] < 1.0
+        assert cameras[0].cam.getHpr() == original_hpr
+        engine.graphicsEngine = graphics_engine.graphics_engine
+    finally:
+        engine.destroy()
+
+
+if __name__ == '__main__':
+    test_camera_render_once()
+    test_depth_camera_perceive_copy()
+    test_sensor_scheduler_capture()
@@ -0,0 +1,109 @@
+import base64
+import json
+import os
+import struct
+import time
+
+from metaurban.build_asset_cache import build_asset_cache, get_loader
+from metaurban.engine.asset_loader import AssetLoader
+
+
+def _write_triangle(file_path, size=1.):
+    data = struct.pack("<9f", 0, 0, 0, size, 0, 0, 0, size, 0) + struct.pack("<3H", 0, 1, 2) + b"\0\0"
+    model = {
+        "asset": {
+            "version": "2.0"
+        },
+        "scene": 0,
+        "scenes": [{
+            "nodes": [0]
+        }],
+        "nodes": [{
+            "mesh": 0,
+            "name": "triangle"
+        }],
+        "meshes": [{
+            "primitives": [{
+                "attributes": {
+                    "POSITION": 0
+                },
+                "indices": 1
+            }]
+        }],
+        "buffers": [
+            {
+                "byteLength": len(data),
+                "uri": "data:application/octet-stream;base64," + base64.b64encode(data).decode()
+            }
+        ],
+        "bufferViews": [
+            {
+                "buffer": 0,
+                "byteOffset": 0,
+                "byteLength": 36
+            }, {
+                "buffer": 0,
+                "byteOffset": 36,
+                "byteLength": 6
+            }
+        ],
+        "accessors": [
+            {
+                "bufferView": 0,
+                "componentType": 5126,
+                "count": 3,
+                "type": "VEC3",
+                "min": [0, 0, 0],
+                "max": [size, size, 0]
+            }, {
+                "bufferView": 1,
+                "componentType": 5123,
+                "count": 3,
+                "type": "SCALAR"
+            }
+        ]
+    }
+    with open(file_path, "w") as file:
+        json.dump(model, file)
+
+
+def test_compiled_asset_cache(tmp_path):
+    """
+    Models are compiled to .bam on the first load, read from the cache afterwards and compiled again when the source
+    changes
+    """
+    asset_dir, cache_dir = tmp_path / "assets", tmp_path / "cache"
+    os.makedirs(asset_dir / "triangle")
+    file_path = str(asset_dir / "triangle" / "triangle.gltf")
+    _write_triangle(file_path)
+
+    assert build_asset_cache(str(cache_dir), str(asset_dir)) == 1
+    assert build_asset_cache(str(cache_dir), str(asset_dir)) == 0
+    compiled_path = AssetLoader.get_compiled_path(file_path, str(cache_dir))
+    assert os.listdir(cache_dir) == [os.path.basename(compiled_path)]
+
+    loader = AssetLoader.loader
+    try:
+        AssetLoader.loader = get_loader()
+        AssetLoader.enable_compiled_cache(str(cache_dir))
+        model = AssetLoader.load_model(file_path)
+        assert model.find("**/triangle").getTightBounds()[1][0] == 1.
+
+        # editing the source invalidates the compiled model
+        time.sleep(0.01)
+        _write_triangle(file_path, size=2.)
+        assert not os.path.isfile(AssetLoader.get_compiled_path(file_path))
+        model = AssetLoader.load_model(file_path)
+        assert model.find("**/triangle").getTightBounds()[1][0] == 2.
+        assert os.path.isfile(AssetLoader.get_compiled_path(file_path))
+        assert len(os.listdir(cache_dir)) == 2
+    finally:
+        AssetLoader.loader = loader
+        AssetLoader.enable_compiled_cache(None)
+
+
+if __name__ == '__main__':
+    import pathlib
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_compiled_asset_cache(pathlib.Path(tmp_dir))
@@ -0,0 +1,103 @@
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from metaurban.engine.base_engine import BaseEngine
+from metaurban.obs.frame_stack import FrameStack
+from metaurban.obs.image_obs import ImageObservation
+
+
+def test_frame_stack():
+    """
+    The ring buffer gives the same stack as rolling the stack and writing the new frame last, in uint8 and float32
+    """
+    rng = np.random.default_rng(0)
+    for dtype, stack_size in ((np.uint8, 3), (np.float32, 4), (np.uint8, 1)):
+        shape = (12, 16, 4)
+        stack = FrameStack(shape, stack_size, dtype)
+        expected = np.zeros(shape + (stack_size, ), dtype=dtype)
+        for step in range(10):
+            if step == 6:
+                stack.clear()
+                expected = np.zeros_like(expected)
+            frame = rng.integers(0, 256, shape).astype(dtype)
+            stack.push(frame)
+            expected = np.roll(expected, -1, axis=-1)
+            expected[..., -1] = frame
+            assert stack.view.dtype == dtype and stack.view.shape == expected.shape
+            assert np.array_equal(stack.view, expected)
+            copy = stack.get_stack()
+            assert copy.flags["C_CONTIGUOUS"] and np.array_equal(copy, expected)
+
+
+def test_image_observation_holds_frames():
+    """
+    Observations kept by the caller, e.g. the final observation of an episode, are not changed by later steps or reset
+    """
+    shape, stack_size = (6, 8, 3), 3
+    obs = ImageObservation.__new__(ImageObservation)
+    obs.image_source, obs.norm_pixel = "rgb_camera", False
+    obs.frame_stack = FrameStack(shape, stack_size, np.uint8)
+    frames = [np.full(shape, i + 1, dtype=np.uint8) for i in range(6)]
+    new_frames = iter(frames)
+    sensor = SimpleNamespace(perceive=lambda *args, **kwargs: next(new_frames))
+    engine, BaseEngine.singleton = BaseEngine.singleton, SimpleNamespace(get_sensor=lambda name: sensor)
+    try:
+        held = []
+        for step in range(4):
+            held.append((obs.observe(), obs.state))
+            if step == 1:
+                obs.reset(None)
+        for step, (observation, state) in enumerate(held):
+            assert observation.shape == shape + (stack_size, )
+            assert np.array_equal(observation[..., -1], frames[step]) and np.array_equal(state, observation)
+        assert np.array_equal(held[1][0][..., -2], frames[0]) and not held[2][0][..., :-1].any()
+
+        # the view is opt-in, and it is overwritten by the next observation
+        view = obs.observe(copy=False)
+        observation = view.copy()
+        assert np.array_equal(observation[..., -1], frames[4])
+        obs.observe()
+        assert not np.array_equal(view, observation)
+    finally:
+        BaseEngine.singleton = engine
+
+
+def benchmark_frame_stack(shape=(512, 512, 4), stack_size=4, repeat=200):
+    """
+    ImageObservation.observe(), which returns a copy of the stack, against rolling the stack as before, in uint8 and
+    float32
+    """
+    for dtype, norm_pixel in ((np.uint8, False), (np.float32, True)):
+        frame = np.ones(shape, dtype=dtype)
+        state = np.zeros(shape + (stack_size, ), dtype=dtype)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            state = np.roll(state, -1, axis=-1)
+            state[..., -1] = frame
+        roll_time = (time.perf_counter() - start) / repeat
+
+        obs = ImageObservation.__new__(ImageObservation)
+        obs.image_source, obs.norm_pixel = "rgb_camera", norm_pixel
+        obs.frame_stack = FrameStack(shape, stack_size, dtype)
+        sensor = SimpleNamespace(perceive=lambda *args, **kwargs: frame)
+        engine, BaseEngine.singleton = BaseEngine.singleton, SimpleNamespace(get_sensor=lambda name: sensor)
+        try:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                obs.observe()
+            observe_time = (time.perf_counter() - start) / repeat
+        finally:
+            BaseEngine.singleton = engine
+        print(
+            "{}: np.roll {:.3f} ms, observe() {:.3f} ms".format(
+                np.dtype(dtype).name, roll_time * 1e3, observe_time * 1e3
+            )
+        )
+
+
+if __name__ == '__main__':
+    test_frame_stack()
+    test_image_observation_holds_frames()
+    benchmark_frame_stack()
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+import time
+
+# seconds, override it with the environment variable METAURBAN_IMPORT_TIME_BUDGET on slow machines
+IMPORT_TIME_BUDGET = float(os.environ.get("METAURBAN_IMPORT_TIME_BUDGET", 15))
+
+
+def test_import_time():
+    """
+    `import metaurban` in a fresh interpreter stays in budget, and doesn't search the pedestrian assets
+    """
+    script = "\n".join(
+        [
+            "import metaurban",
+            "from metaurban.constants import PedestrianAssetPaths, lazy_class_attribute",
+            "for name in ['PEDESTRIAN_ACTORS_BATCH', 'BELDAM_PEDESTRIAN_MOTIONS']:",
+            "    assert isinstance(vars(PedestrianAssetPaths)[name], lazy_class_attribute), name",
+        ]
+    )
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", script], check=True)
+    import_time = time.perf_counter() - start
+    assert import_time < IMPORT_TIME_BUDGET, "import metaurban takes {:.1f}s".format(import_time)
+
+
+def test_lazy_pedestrian_assets():
+    """
+    The assets are searched on the first access and the result is kept
+    """
+    from metaurban.constants import PedestrianAssetPaths
+    actors = PedestrianAssetPaths.PEDESTRIAN_ACTORS_BATCH
+    assert isinstance(actors, list) and PedestrianAssetPaths.PEDESTRIAN_ACTORS_BATCH is actors
+    assert PedestrianAssetPaths.PEDESTRIAN_ACTORS_BATCH_NUM == len(actors) <= PedestrianAssetPaths.MAX_ACTOR_NUM
+    motions = PedestrianAssetPaths.BELDAM_PEDESTRIAN_MOTIONS
+    assert PedestrianAssetPaths.BELDAM_PEDESTRIAN_MOTIONS_NUM == len(motions)
+    assert "PEDESTRIAN_ACTORS_BATCH" in vars(PedestrianAssetPaths)
+
+
+if __name__ == '__main__':
+    test_import_time()
+    test_lazy_pedestrian_assets()
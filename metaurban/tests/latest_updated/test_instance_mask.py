@@ -0,0 +1,95 @@
+import time
+
+import numpy as np
+
+from metaurban.engine.base_engine import BaseEngine, COLOR_SPACE
+
+
+def _make_color_engine():
+    """
+    An engine with the color mapping only, which doesn't need a window or assets
+    """
+    engine = BaseEngine.__new__(BaseEngine)
+    engine.c_id, engine.id_c = dict(), dict()
+    engine.color_lut = np.full(1 << 15, -1, dtype=np.int32)
+    engine.instance_ids = np.full(BaseEngine.MAX_COLOR + 1, None, dtype=object)
+    return engine
+
+
+def _render_mask(engine, object_ids, shape, to_float=False):
+    """
+    Paint a BGR image as InstanceCamera does, the first entry of object_ids is the black background
+    """
+    pixels = np.random.RandomState(0).randint(len(object_ids), size=shape)
+    palette = np.array([(0, 0, 0)] + [engine.id_to_color(id) for id in object_ids[1:]])[:, ::-1]
+    palette = palette if to_float else np.rint(palette * 255).astype(np.uint8)
+    return palette[pixels], pixels
+
+
+def _decode_by_color(engine, image):
+    """
+    Decoding with color_to_id(), one unique color at a time
+    """
+    ret = np.full(image.shape[:-1], None, dtype=object)
+    colors, inverse = np.unique(image.reshape(-1, 3), axis=0, return_inverse=True)
+    for i, color in enumerate(colors):
+        color = tuple(round(c / 255, 5) for c in color[::-1])
+        if color in engine.c_id:
+            ret.reshape(-1)[inverse.reshape(-1) == i] = engine.color_to_id(color)
+    return ret
+
+
+def test_decode_instance_mask():
+    """
+    The lookup table follows spawned and cleared objects, and decodes the same ids as color_to_id()
+    """
+    engine = _make_color_engine()
+    try:
+        ids = ["object_{}".format(i) for i in range(200)]
+        for id in ids:
+            engine._pick_color(id)
+        for id in ids[::2]:
+            engine._clean_color(id)
+        object_ids = [None] + ids[1::2]
+
+        image, pixels = _render_mask(engine, object_ids, (64, 128))
+        indices = engine.decode_instance_mask(image)
+        assert indices.dtype == np.int32 and indices.shape == (64, 128)
+        decoded = engine.instance_ids[indices]
+        assert (decoded == np.asarray(object_ids, dtype=object)[pixels]).all()
+        assert (decoded == _decode_by_color(engine, image)).all()
+        assert all(COLOR_SPACE[i] == engine.id_to_color(engine.instance_ids[i]) for i in np.unique(indices) if i >= 0)
+
+        float_image, _ = _render_mask(engine, object_ids, (64, 128), to_float=True)
+        assert (engine.decode_instance_mask(float_image) == indices).all()
+
+        # cleared colors and colors off the color space are unknown
+        engine._clean_color(ids[1])
+        assert (engine.decode_instance_mask(image)[pixels == 1] == -1).all()
+        assert (engine.decode_instance_mask(image + 1) == -1).all()
+    finally:
+        BaseEngine.COLORS_FREE = set(COLOR_SPACE)
+        BaseEngine.COLORS_OCCUPIED = set()
+
+
+def benchmark_decode_instance_mask(height=512, width=1024, num_objects=300, repeat=10):
+    engine = _make_color_engine()
+    try:
+        ids = ["object_{}".format(i) for i in range(num_objects)]
+        for id in ids:
+            engine._pick_color(id)
+        image, _ = _render_mask(engine, [None] + ids, (height, width))
+        for name, func in [("color_to_id", lambda: _decode_by_color(engine, image)),
+                           ("lookup table", lambda: engine.instance_ids[engine.decode_instance_mask(image)])]:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                func()
+            print("{}: {:.2f} ms".format(name, (time.perf_counter() - start) / repeat * 1e3))
+    finally:
+        BaseEngine.COLORS_FREE = set(COLOR_SPACE)
+        BaseEngine.COLORS_OCCUPIED = set()
+
+
+if __name__ == '__main__':
+    test_decode_instance_mask()
+    benchmark_decode_instance_mask()
@@ -0,0 +1,29 @@
+import numpy as np
+
+from metaurban.component.lane.point_lane import PointLane
+
+
+def test_point_lane_coordinates():
+    """
+    Local coordinates computed from the accumulated segment lengths are consistent with position() and
+    heading_theta_at() along a curved point lane
+    """
+    theta = np.linspace(0, np.pi, 60)
+    points = np.stack([20 * np.cos(theta), 20 * np.sin(theta)], axis=1)
+    lane = PointLane(points, 2)
+    lengths = [seg["length"] for seg in lane.segment_property]
+    assert np.isclose(lane.length, sum(lengths))
+    for long in np.linspace(0.5, lane.length - 0.5, 25):
+        for lat in [-0.5, 0, 0.5]:
+            position = lane.position(long, lat)
+            ret_long, ret_lat = lane.local_coordinates(position)
+            # an offset point close to the end of a segment can be projected on the next one
+            assert np.isclose(ret_long, long, atol=0.1) and np.isclose(ret_lat, lat, atol=0.01)
+        index = np.searchsorted(np.cumsum(lengths), long, side="right")
+        assert lane.heading_theta_at(long) == lane.segment_property[index]["heading"]
+    assert np.allclose(lane.position(lane.length + 10, 0), lane.position(lane.length, 0) + 10 * \
+                       lane.segment_property[-1]["direction"])
+
+
+if __name__ == '__main__':
+    test_point_lane_coordinates()
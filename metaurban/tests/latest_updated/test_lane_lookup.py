@@ -0,0 +1,41 @@
+import math
+import random
+
+from metaurban.component.lane.circular_lane import CircularLane
+from metaurban.component.lane.straight_lane import StraightLane
+from metaurban.component.road_network.node_road_network import GraphLookupTable
+from metaurban.constants import Decoration
+
+
+def test_lane_lookup():
+    """
+    The closest lane found with the grid index should be the first one returned by the full search, including ties
+    """
+    rng = random.Random(0)
+    graph = {}
+    for road in range(100):
+        lanes = []
+        if road % 2 == 0:
+            x, y = rng.randint(-20, 20) * 5, rng.randint(-20, 20) * 5
+            for lane in range(rng.randint(1, 3)):
+                lanes.append(StraightLane((x, y + 3.5 * lane), (x + 50, y + 3.5 * lane)))
+        else:
+            center = (rng.uniform(-100, 100), rng.uniform(-100, 100))
+            start_phase, angle, clockwise = rng.uniform(-3, 3), rng.uniform(0.3, 3), rng.random() < 0.5
+            for lane in range(rng.randint(1, 3)):
+                lanes.append(CircularLane(center, 10 + 3.5 * lane, start_phase, angle, clockwise))
+        graph.setdefault(str(road // 3), {})[str(road)] = lanes
+    graph[Decoration.start] = {Decoration.end: [StraightLane((0, 0), (0, 30))]}
+
+    lookup = GraphLookupTable(graph, False)
+    for _ in range(500):
+        if rng.random() < 0.5:
+            position = (rng.randint(-50, 50) * 2.5 + rng.choice([0, 1.75]), rng.randint(-50, 50) * 2.5)
+        else:
+            position = (rng.uniform(-500, 500), rng.uniform(-500, 500))
+        distance, index = lookup.get(position, return_all=True)[0]
+        assert lookup.get(position, return_all=False) == (index, distance)
+
+
+if __name__ == '__main__':
+    test_lane_lookup()
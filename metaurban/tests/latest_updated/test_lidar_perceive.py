@@ -0,0 +1,71 @@
+import time
+
+import numpy as np
+from panda3d.bullet import BulletWorld, BulletRigidBodyNode, BulletBoxShape
+from panda3d.core import Vec3, NodePath, BitMask32
+
+from metaurban.component.sensors.distance_detector import perceive
+
+
+def test_lidar_perceive():
+    """
+    Lasers hit the box in front of them, ignore the filtered nodes, and masked lasers keep the full distance
+    """
+    world = BulletWorld()
+    root = NodePath("root")
+    nodes = []
+    for name, position in (("own", (0, 0, 0.5)), ("front", (10, 0, 0.5))):
+        node = BulletRigidBodyNode(name)
+        node.addShape(BulletBoxShape(Vec3(1, 1, 1)))
+        node.setIntoCollideMask(BitMask32.bit(1))
+        root.attachNewNode(node).setPos(*position)
+        world.attachRigidBody(node)
+        nodes.append(node)
+    own, front = nodes
+
+    num_lasers = 8
+    lidar_range = np.arange(num_lasers) * 2 * np.pi / num_lasers
+
+    def _perceive(detector_mask, require_colors=False):
+        return perceive(
+            np.ones((num_lasers, )), detector_mask, BitMask32.bit(1), lidar_range, 50, 0, 0, 0, num_lasers, 0.5, world,
+            {own}, require_colors, True, 0, 0, 0
+        )
+
+    cloud_points, detected_objects, colors = _perceive(None, require_colors=True)
+    assert np.isclose(cloud_points[0], 9 / 50)
+    assert np.all(cloud_points[1:] == 1.0)
+    assert [result.getNode() for result in detected_objects] == [front]
+    assert len(colors) == num_lasers
+    assert np.allclose(colors[0][1][:2], (9, 0)) and np.allclose(colors[4][1][:2], (-50, 0))
+
+    detector_mask = np.ones((num_lasers, ), dtype=np.uint8)
+    detector_mask[0] = 0
+    cloud_points, detected_objects, _ = _perceive(detector_mask)
+    assert np.all(cloud_points == 1.0) and not detected_objects
+
+
+def benchmark_lidar_perceive(num_lasers=240, num_boxes=60, repeat=200):
+    world = BulletWorld()
+    root = NodePath("root")
+    rng = np.random.RandomState(0)
+    for i in range(num_boxes):
+        node = BulletRigidBodyNode("box_{}".format(i))
+        node.addShape(BulletBoxShape(Vec3(1, 1, 1)))
+        node.setIntoCollideMask(BitMask32.bit(1))
+        root.attachNewNode(node).setPos(*rng.uniform(-40, 40, size=2), 0.5)
+        world.attachRigidBody(node)
+    lidar_range = np.arange(num_lasers) * 2 * np.pi / num_lasers
+    cloud_points = np.ones((num_lasers, ))
+    start = time.perf_counter()
+    for _ in range(repeat):
+        perceive(
+            cloud_points, None, BitMask32.bit(1), lidar_range, 50, 0, 0, 0, num_lasers, 0.5, world, set(), False, True,
+            0, 0, 0
+        )
+    print("{} lasers, {} boxes: {:.3f} ms".format(num_lasers, num_boxes, (time.perf_counter() - start) / repeat * 1e3))
+
+
+if __name__ == '__main__':
+    test_lidar_perceive()
+    benchmark_lidar_perceive()
@@ -0,0 +1,105 @@
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+from panda3d.bullet import BulletWorld, BulletRigidBodyNode, BulletBoxShape, BulletGhostNode, BulletCylinderShape, ZUp
+from panda3d.core import Vec3, NodePath
+
+from metaurban.base_class.base_object import PhysicsNodeList
+from metaurban.constants import CollisionGroup
+from metaurban.utils.neighbor_index import NeighborIndex
+
+
+class _Object(SimpleNamespace):
+    __hash__ = object.__hash__
+    __eq__ = object.__eq__
+
+
+def _make_scene(num_objects, seed=0):
+    rng = random.Random(seed)
+    world = BulletWorld()
+    CollisionGroup.set_collision_rule(world)
+    root = NodePath("root")
+    objects = []
+    for i in range(num_objects):
+        node = BulletRigidBodyNode("object_{}".format(i))
+        node.addShape(BulletBoxShape(Vec3(2.3, 1, 0.8)))
+        node.setIntoCollideMask(
+            rng.choice([CollisionGroup.Vehicle, CollisionGroup.TrafficObject, CollisionGroup.BasePedestrian])
+        )
+        path = root.attachNewNode(node)
+        path.setPos(rng.uniform(-150, 150), rng.uniform(-150, 150), 0.8)
+        path.setH(rng.uniform(0, 360))
+        world.attachRigidBody(node)
+        nodes = PhysicsNodeList()
+        nodes.append(node)
+        nodes.attached = True
+        objects.append(_Object(name=node.getName(), dynamic_nodes=nodes, position=np.array([path.getX(), path.getY()])))
+    name_to_object = {obj.name: obj for obj in objects}
+    engine = SimpleNamespace(physics_world=SimpleNamespace(dynamic_world=world), get_objects=lambda: name_to_object)
+    return engine, objects
+
+
+def _contact_test(engine, objects, radius=50):
+    """
+    What Lidar.get_surrounding_objects does for each object
+    """
+    detector_world = BulletWorld()
+    detector = NodePath(BulletGhostNode("detector_mask"))
+    detector.node().addShape(BulletCylinderShape(radius, 5, ZUp))
+    detector.node().setIntoCollideMask(CollisionGroup.LidarBroadDetector)
+    detector_world.attach(detector.node())
+    name_to_object = {obj.name: obj for obj in objects}
+    ret = []
+    for obj in objects:
+        detector.setPos(obj.position[0], obj.position[1], 0)
+        surrounding = set()
+        for contact in engine.physics_world.dynamic_world.contactTest(detector.node(), True).getContacts():
+            nodes = [contact.getNode0(), contact.getNode1()]
+            nodes.remove(detector.node())
+            surrounding.add(name_to_object[nodes[0].getName()])
+        surrounding.discard(obj)
+        ret.append(surrounding)
+    return ret
+
+
+def test_neighbor_index():
+    """
+    The neighbor index finds every object found by the contact test, skipping the ones ignored by the lidar detector
+    """
+    engine, objects = _make_scene(200)
+    index = NeighborIndex.from_engine(engine)
+    masks = [obj.dynamic_nodes[0].getIntoCollideMask() for obj in index.objects]
+    assert 0 < len(masks) < len(objects) and CollisionGroup.BasePedestrian not in masks
+    for obj, surrounding in zip(objects, _contact_test(engine, objects)):
+        found = index.get_surrounding_objects(obj, 50)
+        assert surrounding <= found
+        # the extra objects only touch the detection range with their bounding circle
+        for other in found - surrounding:
+            assert 50 - 3 < np.linalg.norm(other.position - obj.position) < 50 + 3
+
+
+def benchmark_neighbor_index(num_vehicles=60, repeat=20):
+    engine, objects = _make_scene(num_vehicles)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        _contact_test(engine, objects)
+    contact_test_time = (time.perf_counter() - start) / repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        index = NeighborIndex.from_engine(engine)
+        for obj in objects:
+            index.get_surrounding_objects(obj, 50)
+    index_time = (time.perf_counter() - start) / repeat
+    print(
+        "{} vehicles, per step: contact test {:.3f} ms, neighbor index {:.3f} ms".format(
+            num_vehicles, contact_test_time * 1e3, index_time * 1e3
+        )
+    )
+
+
+if __name__ == '__main__':
+    test_neighbor_index()
+    for num_vehicles in (60, 200):
+        benchmark_neighbor_index(num_vehicles)
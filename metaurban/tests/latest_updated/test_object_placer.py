@@ -0,0 +1,62 @@
+import numpy as np
+
+from metaurban.manager.sidewalk_manager import ObjectPlacer
+
+
+def _make_obj(length, width, mode, gap=1):
+    return {
+        'CLASS_NAME': 'Test',
+        'general': {
+            'length': length,
+            'width': width
+        },
+        'spawn_long_gap': gap,
+        'obj_generation_mode': mode
+    }
+
+
+def test_object_placer():
+    """
+    The placer returns the first free position in the scan order of each generation mode, as checking every candidate
+    position with can_place does, and never overlaps two objects
+    """
+    rng = np.random.RandomState(0)
+    occupancy = rng.rand(60, 8) < 0.1
+    for mode in ['parallel_only', 'normal', 'inverse']:
+        placer = ObjectPlacer(occupancy.copy())
+        placer.buffer = 2
+        last_long = 0
+        for _ in range(20):
+            obj = _make_obj(rng.uniform(0.5, 3), rng.uniform(0.5, 2), mode, gap=rng.randint(0, 4))
+            start = last_long + obj['spawn_long_gap']
+            if mode == 'parallel_only':
+                candidates = [(i + 1, 1) for i in range(start, 60)]
+            elif mode == 'normal':
+                candidates = [(i + 1, j + 1) for i in range(start, 60) for j in range(8)]
+            else:
+                candidates = [(i + 1, j + 1) for i in range(59, start, -1) for j in range(7, 0, -1)]
+            expected = next((c for c in candidates if placer.can_place(c[0], c[1], obj)), None)
+            before = placer.occupancy.sum()
+            placed, last_long = placer.place_object(obj, last_long)
+            assert placed == (expected is not None)
+            if placed:
+                assert last_long == expected[0]
+                assert placer.occupancy.sum() - before == (np.ceil(obj['general']['length']) + 2) * \
+                    (np.ceil(obj['general']['width']) + 2)
+
+    def random_start_positions():
+        np.random.seed(0)
+        placer = ObjectPlacer(np.zeros((60, 8), dtype=bool))
+        placer.buffer = 2
+        last_long = 0
+        for _ in range(10):
+            placer.place_object(_make_obj(2, 1, 'random_start'), last_long)
+            last_long = max(position[0] for position, _ in placer.placed_objects.values())
+        return list(placer.placed_objects)
+
+    assert len(random_start_positions()) > 1
+    assert random_start_positions() == random_start_positions()
+
+
+if __name__ == '__main__':
+    test_object_placer()
@@ -0,0 +1,148 @@
+import xml.etree.ElementTree as ET
+
+import cv2
+import numpy as np
+
+import metaurban.policy.get_planning as get_planning
+from metaurban.policy.get_planning import bind
+
+
+def _make_mask():
+    mask = np.zeros((80, 120, 3), np.uint8)
+    for polygon in ([[5, 5], [115, 5], [115, 25], [5, 25]], [[5, 5], [25, 5], [25, 75], [5, 75]], [[5, 55], [115, 55],
+                                                                                                   [115, 75], [5, 75]]):
+        cv2.fillPoly(mask, [np.array(polygon)], [255, 255, 255])
+    return mask
+
+
+def test_in_memory_planning_matches_xml():
+    """
+    The array based bind.plan entry point should produce the same trajectories as the XML based bind.demo
+    """
+    mask = _make_mask()
+    h = mask.shape[0]
+    starts = [(10, h - 1 - 60), (100, h - 1 - 15), (15, h - 1 - 20)]
+    goals = [(100, h - 1 - 65), (15, h - 1 - 40), (60, h - 1 - 65)]
+
+    root = get_planning.generate_template_xml(mask)
+    get_planning.set_agents(starts, goals, root)
+    result = bind.demo(ET.tostring(root, encoding='unicode'), len(starts))
+    expected = np.stack([np.stack([result[i].xr, result[i].yr], axis=1) for i in range(len(starts))], axis=1)
+
+    results = [None]
+    get_planning.run_planning(starts, goals, mask, len(starts), 0, results)
+    nexts, time_length, speed, earliest_stop_pos = results[0]
+    assert nexts.shape == expected.shape == (len(nexts), len(starts), 2)
+    assert np.allclose(nexts, expected)
+    assert len(time_length) == len(starts) and len(speed) == len(nexts)
+    assert np.allclose(earliest_stop_pos, expected[-1])
+
+
+def test_planning_map_cache():
+    """
+    Replanning on the same map should reuse the static obstacle model and give the same result as a fresh plan
+    """
+    get_planning.clear_planning_maps()
+    mask = _make_mask()
+    h = mask.shape[0]
+    starts = [(10, h - 1 - 60), (100, h - 1 - 15)]
+    goals = [(100, h - 1 - 65), (15, h - 1 - 40)]
+    planning_map = get_planning.get_planning_map(mask, map_seed=0)
+    assert get_planning.get_planning_map(mask.copy(), map_seed=0) is planning_map
+    assert get_planning.get_planning_map(mask, map_seed=1) is not planning_map
+
+    _, nexts_list, _, _ = get_planning.get_planning([starts], [mask], [goals], [len(starts)], 1, map_seeds=[0])
+    grid, obstacles = get_planning.generate_planning_map(mask)
+    expected = bind.plan(grid, obstacles, np.float32(starts), np.float32(goals) + 0.5)
+    assert np.allclose(nexts_list[0], expected)
+    get_planning.clear_planning_maps()
+
+
+def test_parallel_planning():
+    """
+    Planning several environments with a process pool gives the same result as planning them one by one
+    """
+    mask = _make_mask()
+    h = mask.shape[0]
+    starts_list = [[(10, h - 1 - 60), (100, h - 1 - 15)], [(15, h - 1 - 20)], [(100, h - 1 - 65), (10, h - 1 - 15)]]
+    goals_list = [[(100, h - 1 - 65), (15, h - 1 - 40)], [(60, h - 1 - 65)], [(15, h - 1 - 20), (100, h - 1 - 10)]]
+    args = (starts_list, [mask] * 3, goals_list, [len(starts) for starts in starts_list], 3)
+    try:
+        serial = get_planning.get_planning(*args, map_seeds=[0, 0, 1])
+        parallel = get_planning.get_planning(*args, map_seeds=[0, 0, 1], num_workers=2)
+        assert get_planning._planning_pool_size == 2
+    finally:
+        get_planning.close_planning_pool()
+    for serial_results, parallel_results in zip(serial, parallel):
+        assert len(serial_results) == len(parallel_results) == 3
+        for a, b in zip(serial_results, parallel_results):
+            assert np.allclose(np.asarray(a), np.asarray(b))
+
+
+def test_planning_simulation():
+    """
+    Stepping the simulator a few steps at a time should follow the full rollout, and a goal change mid-episode should
+    bring the agent to its new goal
+    """
+    mask = _make_mask()
+    h = mask.shape[0]
+    starts = [(10, h - 1 - 60), (100, h - 1 - 15), (15, h - 1 - 20)]
+    goals = [(100, h - 1 - 65), (15, h - 1 - 40), (60, h - 1 - 65)]
+    results = [None]
+    get_planning.run_planning(starts, goals, mask, len(starts), 0, results)
+    nexts, _, speed, _ = results[0]
+
+    simulation = get_planning.PlanningSimulation(starts, goals, mask, horizon=7)
+    rows = list(simulation)
+    assert len(rows) == len(nexts)
+    assert np.allclose(np.stack([positions for positions, _ in rows]), nexts)
+    assert np.allclose(np.stack([s for _, s in rows]), np.stack(speed))
+
+    simulation = get_planning.PlanningSimulation(starts, goals, mask)
+    for _ in range(50):
+        next(simulation)
+    new_goal = (12, h - 1 - 40)
+    assert simulation.set_goal(0, new_goal)
+    positions = [positions for positions, _ in simulation]
+    assert np.linalg.norm(positions[-1][0] - np.add(new_goal, 0.5)) < 0.2
+
+
+def test_dynamic_obstacle_avoidance():
+    """
+    A dynamic obstacle in the way of an agent is avoided by the local planner
+    """
+    mask = _make_mask()
+    start, goal, obstacle = (10, 14), (100, 14), (50, 14.5)
+    simulation = get_planning.PlanningSimulation([start], [goal], mask)
+    simulation.set_dynamic_obstacles([obstacle], 1.5)
+    positions = np.stack([positions[0] for positions, _ in simulation])
+    assert np.linalg.norm(positions - obstacle, axis=1).min() > 1.5
+    assert np.linalg.norm(positions[-1] - np.add(goal, 0.5)) < 0.2
+
+
+def test_sample_walkable_points():
+    """
+    Sampled spawn points are interior walkable pixels, at least min_dis apart
+    """
+    import math
+    import random
+    from metaurban.policy.orca_planner_utils import sample_walkable_points
+    mask = _make_mask()[:, :, 0]
+    h = mask.shape[0]
+    random.seed(0)
+    points = sample_walkable_points(mask, 20, min_dis=5)
+    assert len(points) == 20
+    for i, (x, y) in enumerate(points):
+        assert np.all(mask[h - 1 - y - 1:h - 1 - y + 2, x - 1:x + 2] == 255)
+        assert all(math.dist((x, y), other) >= 5 for other in points[i + 1:])
+    random.seed(0)
+    assert sample_walkable_points(mask, 20, min_dis=5) == points
+
+
+if __name__ == '__main__':
+    test_in_memory_planning_matches_xml()
+    test_planning_map_cache()
+    test_parallel_planning()
+    test_planning_simulation()
+    test_dynamic_obstacle_avoidance()
+    test_sample_walkable_points()
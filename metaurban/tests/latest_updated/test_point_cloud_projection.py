@@ -0,0 +1,72 @@
+import time
+
+import numpy as np
+from scipy.spatial.transform import Rotation as R
+
+from metaurban.component.sensors.point_cloud_lidar import PointCloudLidar
+
+
+def _reference_lidar_from_depth(depth_img, camera_intrinsics, camera_translation, camera_rotation):
+    """
+    The per-frame projection used before the ray directions were cached
+    """
+    depth_img = depth_img.T[::-1, ::-1]
+    height, width = depth_img.shape
+    u, v = np.meshgrid(np.arange(width), np.arange(height))
+    uv_coords = np.stack([u, v, np.ones_like(u)], axis=-1).reshape(-1, 3)
+    cam_coords = (np.linalg.inv(camera_intrinsics) @ uv_coords.T).T
+    cam_coords *= depth_img.reshape(-1)[..., None]
+    cam_coords = cam_coords[..., [2, 1, 0]]
+    world_coords = (camera_rotation @ cam_coords.T).T + camera_translation
+    return world_coords.reshape(height, width, 3).swapaxes(0, 1)
+
+
+def _make_inputs(height=32, width=64, fov=(60, 40)):
+    rng = np.random.RandomState(0)
+    f_x = width / 2 / np.tan(fov[0] / 2 / 180 * np.pi)
+    f_y = height / 2 / np.tan(fov[1] / 2 / 180 * np.pi)
+    intrinsics = np.asarray([[f_x, 0, (height - 1) / 2], [0, f_y, (width - 1) / 2], [0, 0, 1]])
+    depth = rng.uniform(0.1, 100, size=(height, width)).astype(np.float32)
+    rotation = R.from_euler('ZYX', rng.uniform(-180, 180, size=3), degrees=True).as_matrix()
+    translation = rng.uniform(-50, 50, size=3)
+    return depth, intrinsics, translation, rotation
+
+
+def test_point_cloud_projection():
+    """
+    The cached ray directions give the same points as projecting every pixel per frame, and subsampling picks the
+    same points as subsampling the full point cloud
+    """
+    depth, intrinsics, translation, rotation = _make_inputs()
+    expected = _reference_lidar_from_depth(depth, intrinsics, translation, rotation)
+    points = PointCloudLidar.simulate_lidar_from_depth(depth, intrinsics, translation, rotation)
+    assert points.shape == expected.shape == depth.shape + (3, )
+    assert np.allclose(points, expected, rtol=1e-4, atol=1e-3)
+    assert PointCloudLidar.get_ray_directions(intrinsics, *depth.shape) is \
+        PointCloudLidar.get_ray_directions(intrinsics.copy(), *depth.shape)
+
+    points = PointCloudLidar.simulate_lidar_from_depth(depth, intrinsics, translation, rotation, stride=3)
+    assert np.allclose(points, expected[::3, ::3], rtol=1e-4, atol=1e-3)
+
+    points = PointCloudLidar.simulate_lidar_from_depth(
+        depth, intrinsics, translation, rotation, num_points=100, rng=np.random.RandomState(1)
+    )
+    assert points.shape == (100, 3)
+    pixels = np.sort(np.random.RandomState(1).choice(depth.size, 100, replace=False))
+    assert np.allclose(points, expected.reshape(-1, 3)[pixels], rtol=1e-4, atol=1e-3)
+
+
+def benchmark_point_cloud_projection(height=256, width=512, repeat=50):
+    depth, intrinsics, translation, rotation = _make_inputs(height, width)
+    for name, func in [("per-frame grid", _reference_lidar_from_depth),
+                       ("cached rays", PointCloudLidar.simulate_lidar_from_depth)]:
+        func(depth, intrinsics, translation, rotation)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func(depth, intrinsics, translation, rotation)
+        print("{}: {:.2f} ms".format(name, (time.perf_counter() - start) / repeat * 1e3))
+
+
+if __name__ == '__main__':
+    test_point_cloud_projection()
+    benchmark_point_cloud_projection()
@@ -0,0 +1,35 @@
+import json
+import time
+
+from metaurban.engine.profiler import StepProfiler
+
+
+def test_step_profiler(tmp_path):
+    """
+    The profiler keeps rolling statistics per (phase, name) and dumps them as a Chrome trace
+    """
+    profiler = StepProfiler(window=5)
+    for i in range(8):
+        with profiler.measure("sidewalk_manager", "after_step"):
+            time.sleep(0.002)
+        with profiler.measure("physics", "step"):
+            pass
+    profile = profiler.get_profile()
+    assert set(profile.keys()) == {"after_step/sidewalk_manager", "step/physics"}
+    stat = profile["after_step/sidewalk_manager"]
+    assert stat["count"] == 5
+    assert 2 <= stat["p50"] <= stat["p90"] <= stat["p99"]
+    assert profile["step/physics"]["mean"] < stat["mean"]
+
+    trace = json.load(open(profiler.dump_chrome_trace(str(tmp_path / "trace.json"))))
+    complete_events = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert len(complete_events) == 16
+    assert {e["name"] for e in complete_events} == {"sidewalk_manager", "physics"}
+    profiler.clear()
+    assert profiler.get_profile() == {}
+
+
+if __name__ == '__main__':
+    import pathlib
+    import tempfile
+    test_step_profiler(pathlib.Path(tempfile.mkdtemp()))
@@ -0,0 +1,114 @@
+import math
+import os
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pytest
+
+from metaurban.component.lane.circular_lane import CircularLane
+from metaurban.component.lane.straight_lane import StraightLane
+from metaurban.component.navigation_module.node_network_navigation import NodeNetworkNavigation
+from metaurban.component.road_network.node_road_network import NodeRoadNetwork
+from metaurban.component.traffic_participants.base_traffic_participant import BaseTrafficParticipant
+from metaurban.constants import DEFAULT_AGENT, PGLineType
+from metaurban.engine.base_engine import BaseEngine
+from metaurban.obs.top_down_obs_multi_channel import TopDownMultiChannel, NumpyTopDownMultiChannel
+
+
+class _Participant(BaseTrafficParticipant):
+    """
+    A traffic participant with a pose and a size only, which is all the top-down observations use
+    """
+    position = None
+    heading_theta = 0
+    WIDTH = 1
+    LENGTH = 1
+
+    def __init__(self, position, heading_theta, width, length):
+        self.position, self.heading_theta, self.WIDTH, self.LENGTH = np.array(position), heading_theta, width, length
+
+    def __del__(self):
+        pass
+
+
+def _make_road_network():
+    road_network = NodeRoadNetwork()
+    for i in range(3):
+        lane = StraightLane([0, 3.5 * i], [120, 3.5 * i], 3.5, [PGLineType.BROKEN, PGLineType.SIDE])
+        road_network.add_lane("a", "b", lane)
+    lane = CircularLane([120, 40], 40, -math.pi / 2, math.pi / 2, False, 3.5, [PGLineType.CONTINUOUS, PGLineType.SIDE])
+    road_network.add_lane("b", "c", lane)
+    return road_network
+
+
+def _run(obs_class, norm_pixel, steps=40, resolution=84):
+    """
+    Drive the ego vehicle along the road among other participants, with a minimal engine holding the objects
+    """
+    ego = SimpleNamespace(position=None, heading_theta=0.0)
+    ego.navigation = NodeNetworkNavigation.__new__(NodeNetworkNavigation)
+    ego.navigation.checkpoints = ["a", "b", "c"]
+    objects = {}
+    engine, BaseEngine.singleton = BaseEngine.singleton, SimpleNamespace(
+        agents={DEFAULT_AGENT: ego}, get_objects=lambda: objects
+    )
+    try:
+        obs = obs_class(
+            dict(),
+            False,
+            norm_pixel,
+            frame_stack=3,
+            post_stack=5,
+            frame_skip=5,
+            resolution=(resolution, resolution),
+            max_distance=30
+        )
+        obs.reset(SimpleNamespace(current_map=SimpleNamespace(road_network=_make_road_network())), ego)
+        ret, step_times = [], []
+        for t in range(steps):
+            ego.position = np.array([10 + 2.5 * t, 1.75 + 0.3 * math.sin(t / 5)])
+            ego.heading_theta = 0.4 * math.sin(t / 7)
+            objects.clear()
+            objects["ego"] = ego
+            for i in range(6):
+                position = [20 + 2 * t + 9 * i, 3.5 * (i % 3) + 1.75]
+                objects[i] = _Participant(position, 0.3 * i - 0.6, 1 + 0.3 * i, 2 + i)
+            start = time.perf_counter()
+            ret.append(obs.observe(None))
+            step_times.append(time.perf_counter() - start)
+        obs.destroy()
+        return ret, step_times
+    finally:
+        BaseEngine.singleton = engine
+
+
+@pytest.mark.parametrize("norm_pixel", [True, False])
+def test_numpy_top_down_multi_channel(norm_pixel):
+    """
+    The numpy backend gives the observation of the pygame backend, except for the anti-aliased edges
+    """
+    expected, _ = _run(TopDownMultiChannel, norm_pixel)
+    result, _ = _run(NumpyTopDownMultiChannel, norm_pixel)
+    max_value = 1.0 if norm_pixel else 255
+    for obs, expected_obs in zip(result, expected):
+        assert obs.shape == expected_obs.shape and obs.dtype == expected_obs.dtype
+        diff = np.abs(obs.astype(np.float32) - expected_obs.astype(np.float32)) / max_value
+        # road network, past positions and stacked traffic flow
+        assert diff[..., 0].mean() < 0.01 and diff[..., 0].max() < 0.3
+        assert (diff[..., 1] == 0).all()
+        assert diff[..., 2:].mean() < 0.005 and (diff[..., 2:] > 0.25).mean() < 0.01
+    assert all((obs[..., 2:] > 0).any() for obs in result[1:])
+
+
+def benchmark_numpy_top_down_multi_channel(steps=200):
+    for obs_class in [TopDownMultiChannel, NumpyTopDownMultiChannel]:
+        _, step_times = _run(obs_class, True, steps)
+        print("{}: {:.2f} ms per step".format(obs_class.__name__, np.median(step_times[1:]) * 1e3))
+
+
+if __name__ == '__main__':
+    test_numpy_top_down_multi_channel(True)
+    benchmark_numpy_top_down_multi_channel()
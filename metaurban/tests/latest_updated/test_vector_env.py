@@ -0,0 +1,75 @@
+import gymnasium as gym
+import numpy as np
+
+from metaurban.envs.vector_env import VectorEnv
+
+
+class _CounterEnv:
+    """
+    A minimal environment standing for a MetaUrban environment: the observation counts the steps of the episode, which
+    ends after config["horizon"] steps
+    """
+    def __init__(self, config):
+        self.horizon = config["horizon"]
+        self.observation_space = gym.spaces.Dict(
+            {
+                "image": gym.spaces.Box(0, 255, (8, 6, 3), dtype=np.uint8),
+                "state": gym.spaces.Box(-np.inf, np.inf, (2, ), dtype=np.float32)
+            }
+        )
+        self.action_space = gym.spaces.Box(-1, 1, (2, ), dtype=np.float32)
+        self.seed = None
+        self.step_count = 0
+
+    def _get_obs(self):
+        return {
+            "image": np.full((8, 6, 3), self.step_count, dtype=np.uint8),
+            "state": np.array([self.step_count, self.seed or 0], dtype=np.float32)
+        }
+
+    def reset(self, seed=None):
+        self.seed = seed
+        self.step_count = 0
+        return self._get_obs(), dict(seed=seed)
+
+    def step(self, action):
+        self.step_count += 1
+        return self._get_obs(), float(action[0]), self.step_count >= self.horizon, False, {}
+
+    def close(self):
+        pass
+
+
+def test_vector_env():
+    """
+    Observations written to shared memory by the workers match the ones of each environment, and episodes are reset
+    automatically
+    """
+    horizons = [3, 5]
+    envs = VectorEnv(_CounterEnv, [dict(horizon=horizon) for horizon in horizons])
+    try:
+        assert envs.observation_space["image"].shape == (8, 6, 3)
+        obs, infos = envs.reset(seed=10)
+        assert [info["seed"] for info in infos] == [10, 11]
+        assert np.all(obs["image"] == 0) and obs["state"][:, 1].tolist() == [10, 11]
+        for step in range(1, 8):
+            actions = np.full((2, 2), step, dtype=np.float32)
+            envs.step_async(actions)
+            obs, rewards, terminateds, truncateds, infos = envs.step_wait()
+            assert rewards.tolist() == [step, step] and not np.any(truncateds)
+            for i, horizon in enumerate(horizons):
+                done = step % horizon == 0
+                assert terminateds[i] == done
+                expected = 0 if done else step % horizon
+                assert np.all(obs["image"][i] == expected) and obs["state"][i, 0] == expected
+                if done:
+                    assert infos[i]["final_observation"]["state"][0] == horizon
+        assert envs.call("horizon") == horizons
+        timings = envs.get_worker_timings()
+        assert [timing["count"] for timing in timings] == [7, 7]
+    finally:
+        envs.close()
+
+
+if __name__ == '__main__':
+    test_vector_env()
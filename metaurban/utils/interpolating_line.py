@@ -14,6 +14,9 @@ class InterpolatingLine:
         self.segment_property, self._start_points, self._end_points = self._get_properties(points)
         self._distance_b_a = self._end_points - self._start_points
         self.length = sum([seg["length"] for seg in self.segment_property])
+        # accumulated length at the end of each segment
+        self._accumulated_lengths = np.cumsum([seg["length"] for seg in self.segment_property])
+        self._accumulated_lengths_tolerance = self._accumulated_lengths + 0.1
 
     def position(self, longitudinal: float, lateral: float) -> np.ndarray:
         return self.get_point(longitudinal, lateral)
@@ -51,16 +54,13 @@ class InterpolatingLine:
         min_dists = self.min_lineseg_dist(position, self._start_points, self._end_points, self._distance_b_a)
         target_segment_idx = np.argmin(min_dists)
 
-        long = 0
-        for idx, seg in enumerate(self.segment_property):
-            if idx != target_segment_idx:
-                long += seg["length"]
-            else:
-                delta_x = position[0] - seg["start_point"][0]
-                delta_y = position[1] - seg["start_point"][1]
-                long += delta_x * seg["direction"][0] + delta_y * seg["direction"][1]
-                lateral = delta_x * seg["lateral_direction"][0] + delta_y * seg["lateral_direction"][1]
-                return long, lateral
+        seg = self.segment_property[target_segment_idx]
+        long = float(self._accumulated_lengths[target_segment_idx - 1]) if target_segment_idx > 0 else 0
+        delta_x = position[0] - seg["start_point"][0]
+        delta_y = position[1] - seg["start_point"][1]
+        long += delta_x * seg["direction"][0] + delta_y * seg["direction"][1]
+        lateral = delta_x * seg["lateral_direction"][0] + delta_y * seg["lateral_direction"][1]
+        return long, lateral
 
         # deprecated content
         # Four elements:
@@ -168,11 +168,9 @@ class InterpolatingLine:
         """
         Get point on this line by interpolating
         """
-        accumulate_len = 0
-        for seg in self.segment_property:
-            accumulate_len += seg["length"]
-            if accumulate_len + 0.1 >= longitudinal:
-                break
+        index = self._segment_index(longitudinal)
+        seg = self.segment_property[index]
+        accumulate_len = self._accumulated_lengths[index]
         if lateral is not None:
             return (seg["start_point"] + (longitudinal - accumulate_len + seg["length"]) *
                     seg["direction"]) + lateral * seg["lateral_direction"]
@@ -183,27 +181,24 @@ class InterpolatingLine:
         """
         In rad
         """
-        accumulate_len = 0
-
         assert len(self.segment_property) > 0
 
-        for seg in self.segment_property:
-            accumulate_len += seg["length"]
-            if accumulate_len > longitudinal:
-                return seg["heading"]
-
-        return seg["heading"]
+        # the first segment ending after longitudinal
+        index = np.searchsorted(self._accumulated_lengths, longitudinal, side="right")
+        return self.segment_property[min(index, len(self.segment_property) - 1)]["heading"]
 
     def segment(self, longitudinal: float):
         """
         Return the segment piece on this lane of current position
         """
-        accumulate_len = 0
-        for index, seg in enumerate(self.segment_property):
-            accumulate_len += seg["length"]
-            if accumulate_len + 0.1 >= longitudinal:
-                return self.segment_property[index]
-        return self.segment_property[index]
+        return self.segment_property[self._segment_index(longitudinal)]
+
+    def _segment_index(self, longitudinal):
+        """
+        Index of the first segment whose end is within 0.1m after longitudinal, or of the last segment
+        """
+        index = np.searchsorted(self._accumulated_lengths_tolerance, longitudinal, side="left")
+        return min(index, len(self.segment_property) - 1)
 
     def lateral_direction(self, longitude):
         lane_segment = self.segment(longitude)
@@ -0,0 +1,95 @@
+import math
+
+import numpy as np
+
+from metaurban.constants import CollisionGroup
+
+
+class NeighborIndex:
+    """
+    A snapshot of object positions hashed to a uniform grid. It is built once per step and answers "which objects are
+    around this position" without a physics query. Every object is described by the bounding circle of its collision
+    shapes, so the query returns all objects whose shapes can reach the query circle.
+    """
+    CELL_SIZE = 20
+
+    def __init__(self, objects, positions, radii, cell_size=None):
+        self.objects = list(objects)
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        self.radii = np.asarray(radii, dtype=float).reshape(-1)
+        assert len(self.objects) == len(self.positions) == len(self.radii)
+        self.cell_size = cell_size or self.CELL_SIZE
+        self.max_radius = float(self.radii.max()) if len(self.radii) > 0 else 0.
+
+        # group the object indices by cell: sort them by cell and split where the cell changes
+        cells = np.floor(self.positions / self.cell_size).astype(np.int64)
+        order = np.lexsort((cells[:, 1], cells[:, 0]))
+        cells = cells[order]
+        self._cells = {}
+        if len(order) > 0:
+            starts = np.flatnonzero(np.any(cells[1:] != cells[:-1], axis=1)) + 1
+            for (i, j), indices in zip(cells[np.r_[0, starts]].tolist(), np.split(order, starts)):
+                self._cells[(i, j)] = indices
+
+    @classmethod
+    def from_engine(cls, engine, collision_group=CollisionGroup.LidarBroadDetector):
+        """
+        Snapshot of all objects in the dynamic physics world that collide with the given collision group, e.g. the ones
+        found by Lidar.get_surrounding_objects
+        """
+        physics_world = engine.physics_world.dynamic_world
+        group = int(math.log(collision_group.getWord(), 2))
+        collide_with_group = {}
+        objects, positions, radii = [], [], []
+        for obj in engine.get_objects().values():
+            nodes = getattr(obj, "dynamic_nodes", None)
+            if not nodes or not nodes.attached:
+                continue
+            radius = None
+            for node in nodes:
+                mask = node.getIntoCollideMask().getWord()
+                if mask not in collide_with_group:
+                    collide_with_group[mask] = any(
+                        physics_world.getGroupCollisionFlag(bit, group) for bit in range(32) if mask & (1 << bit)
+                    )
+                if not collide_with_group[mask]:
+                    continue
+                bounds = node.getShapeBounds()
+                if bounds.isEmpty():
+                    continue
+                center = bounds.getCenter()
+                radius = max(radius or 0., bounds.getRadius() + math.hypot(center[0], center[1]))
+            if radius is None:
+                continue
+            objects.append(obj)
+            positions.append(obj.position)
+            radii.append(radius)
+        return cls(objects, positions, radii)
+
+    def query(self, position, radius):
+        """
+        Return the indices of the objects whose bounding circle intersects the circle at position with radius
+        """
+        x, y = position[0], position[1]
+        reach = radius + self.max_radius
+        i_min, i_max = math.floor((x - reach) / self.cell_size), math.floor((x + reach) / self.cell_size)
+        j_min, j_max = math.floor((y - reach) / self.cell_size), math.floor((y + reach) / self.cell_size)
+        cells = self._cells
+        candidates = [
+            cells[(i, j)] for i in range(i_min, i_max + 1) for j in range(j_min, j_max + 1) if (i, j) in cells
+        ]
+        if len(candidates) == 0:
+            return np.zeros((0, ), dtype=np.int64)
+        candidates = np.concatenate(candidates)
+        delta = self.positions[candidates] - (x, y)
+        hit = np.hypot(delta[:, 0], delta[:, 1]) <= radius + self.radii[candidates]
+        return candidates[hit]
+
+    def get_surrounding_objects(self, obj, radius):
+        """
+        The objects around obj, excluding itself
+        """
+        objects = self.objects
+        ret = {objects[index] for index in self.query(obj.position, radius).tolist()}
+        ret.discard(obj)
+        return ret